@@ -0,0 +1,248 @@
+from collections import Counter
+from fractions import Fraction
+from math import inf, isinf, nan
+from venv.AttributeIndex import as_number
+
+"""
+Reference:
+https://en.wikipedia.org/wiki/Materialized_view
+https://en.wikipedia.org/wiki/Incremental_computing
+"""
+
+
+def exact_number(value):
+    """
+    Utility function to read a number to aggregate, keeping whole numbers as ints so sums
+    stay exact however many times values are added and taken away.
+    :param value: The value of an attribute
+    :return: An int or a float, or None if the value isn't a number
+    """
+    number = as_number(value)
+    if number is not None and number.is_integer():
+        return int(number)
+    return number
+
+
+def year_group(movie, min_year: int = 1500):
+    """
+    Utility function to group movies by the year they were released in. Years up to min_year
+    stand for unknown ones, and are left out like in DataAnalysis.plot_year_num_movies.
+    :param movie: The Movie Node
+    :param min_year: Latest year left out
+    :return: The year, or None if it is unknown
+    """
+    year = exact_number(getattr(movie, 'year_released', None))
+    return year if year is not None and year > min_year else None
+
+
+def age_group(actor, bucket_size: int = 10):
+    """
+    Utility function to group actors by age, in buckets of bucket_size years.
+    :param actor: The Actor Node
+    :param bucket_size: Number of years in a bucket
+    :return: The youngest age of the bucket (e.g. 40 for ages 40 to 49), or None if the age is unknown
+    """
+    age = exact_number(getattr(actor, 'age', None))
+    if age is None or age < 0:
+        return None
+    return int(age // bucket_size) * bucket_size
+
+
+def gross_value_per_movie(actor):
+    """
+    Utility function to get the gross value of an actor per movie, as in
+    DataAnalysis.get_average_gross_value_per_movie.
+    :param actor: The Actor Node
+    :return: The gross value over the number of movies plus one, or None if either is unknown
+    """
+    gross_value = exact_number(getattr(actor, 'gross_value', None))
+    movies = getattr(actor, 'movies_starred_in', None)
+    if gross_value is None or not isinstance(movies, (list, tuple)):
+        return None
+    return gross_value / (len(movies) + 1)
+
+
+def _sum_of(exact_sum, infinities: Counter):
+    """
+    Utility function to turn a sum kept exactly back into a number.
+    :param exact_sum: Sum of the finite values, an int or a Fraction
+    :param infinities: Counter (inf or -inf --> number of values that are)
+    :return: An int if the sum is whole, a float otherwise (inf, -inf or nan with infinite values)
+    """
+    if infinities[inf] or infinities[-inf]:
+        return nan if infinities[inf] and infinities[-inf] else (inf if infinities[inf] else -inf)
+    if isinstance(exact_sum, Fraction):
+        return exact_sum.numerator if exact_sum.denominator == 1 else float(exact_sum)
+    return exact_sum
+
+
+class _Group:
+    """
+    Running count, sum, min and max of the values of one group. Values are also counted by
+    value, so when the min or max goes away the next one can be found without the nodes.
+    The sum is kept exactly (as a Fraction once a value isn't whole), so it comes back to
+    the same number however many values were added and taken away.
+    """
+
+    def __init__(self):
+        self.count = 0  # Nodes in the group
+        self.sum = 0  # Exact sum of the finite values
+        self.infinities = Counter()  # inf or -inf --> number of values that are
+        self.values = Counter()  # Value --> number of nodes with it
+        self.num_values = 0  # Nodes in the group with a number to aggregate
+        self.min = None
+        self.max = None
+        self.extremes_stale = False
+
+    def add(self, value):
+        self.count += 1
+        if value is None:
+            return
+        if isinf(value):
+            self.infinities[value] += 1
+        else:
+            self.sum += value if isinstance(value, int) else Fraction(value)
+        self.values[value] += 1
+        self.num_values += 1
+        if not self.extremes_stale:
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def remove(self, value):
+        self.count -= 1
+        if value is None:
+            return
+        if isinf(value):
+            self.infinities[value] -= 1
+        else:
+            self.sum -= value if isinstance(value, int) else Fraction(value)
+        self.num_values -= 1
+        self.values[value] -= 1
+        if not self.values[value]:
+            del self.values[value]
+            if value == self.min or value == self.max:
+                self.extremes_stale = True  # Found again when next asked for
+
+    def extremes(self) -> (float, float):
+        if self.extremes_stale:
+            self.min = min(self.values) if self.values else None
+            self.max = max(self.values) if self.values else None
+            self.extremes_stale = False
+        return self.min, self.max
+
+
+def _summary(groups) -> dict:
+    """
+    Utility function to combine the totals of groups.
+    :param groups: Iterable of _Group
+    :return: Dictionary with the count, sum, avg, min and max of the groups together
+    """
+    num_nodes, exact_sum, infinities, num_values, low, high = 0, 0, Counter(), 0, None, None
+    for group_totals in groups:
+        num_nodes += group_totals.count
+        exact_sum += group_totals.sum
+        infinities.update(group_totals.infinities)
+        num_values += group_totals.num_values
+        group_low, group_high = group_totals.extremes()
+        if group_low is not None:
+            low = group_low if low is None else min(low, group_low)
+            high = group_high if high is None else max(high, group_high)
+    total = _sum_of(exact_sum, infinities)
+    return {'count': num_nodes, 'sum': total, 'avg': total / num_values if num_values else None,
+            'min': low, 'max': high}
+
+
+class GroupedAggregate:
+    """
+    Materialized GROUP BY of a collection: the count of nodes and the sum, average, min and
+    max of a numeric attribute, per group. Kept up to date a node at a time: the group and
+    value every node contributed are remembered, so updating or removing a node takes
+    constant time (finding a new min or max, after the last node with it went away, is
+    deferred to the next read and takes time in the number of distinct values of the group).
+    @author sahil1105
+    """
+
+    def __init__(self, group_of, value_of):
+        """
+        Constructor for an empty GroupedAggregate.
+        :param group_of: Function giving the group of a node, or None to leave the node out
+        :param value_of: Function giving the value of a node to aggregate, or None if it has none
+        """
+        self.group_of = group_of
+        self.value_of = value_of
+        self._groups = {}  # Group --> _Group
+        self._contributions = {}  # Name --> (group, value)
+
+    def __len__(self):
+        return len(self._contributions)
+
+    def build(self, nodes: dict):
+        """
+        Replace the aggregate with the one of the given nodes.
+        :param nodes: Dictionary (name --> GraphNode)
+        :return: self
+        """
+        self._groups = {}
+        self._contributions = {}
+        for name, node in nodes.items():
+            self.update(name, node)
+        return self
+
+    def update(self, name: str, node):
+        """
+        Take a node that was added or changed into account.
+        :param name: Name of the node
+        :param node: The GraphNode
+        :return: self
+        """
+        self.remove(name)
+        group = self.group_of(node)
+        if group is None:
+            return self
+        value = self.value_of(node)
+        self._groups.setdefault(group, _Group()).add(value)
+        self._contributions[name] = (group, value)
+        return self
+
+    def remove(self, name: str):
+        """
+        Take away what a node contributed, e.g. after it was deleted.
+        :param name: Name of the node
+        :return: self
+        """
+        contribution = self._contributions.pop(name, None)
+        if contribution is None:
+            return self
+        group, value = contribution
+        group_totals = self._groups[group]
+        group_totals.remove(value)
+        if group_totals.count == 0:
+            del self._groups[group]
+        return self
+
+    def _groups_between(self, low, high) -> list:
+        """
+        Utility function to get the groups in a range, in order.
+        :return: List of (group, _Group)
+        """
+        return [(group, self._groups[group]) for group in sorted(self._groups)
+                if (low is None or group >= low) and (high is None or group <= high)]
+
+    def rows(self, low=None, high=None) -> list:
+        """
+        Get the aggregates of every group, in order of group.
+        :param low: Smallest group to include, None for no lower bound
+        :param high: Largest group to include, None for no upper bound
+        :return: List of dictionaries with the group, count, sum, avg, min and max (avg, min and
+        max are None for groups with no value to aggregate)
+        """
+        return [dict(_summary([group_totals]), group=group) for group, group_totals in self._groups_between(low, high)]
+
+    def total(self, low=None, high=None) -> dict:
+        """
+        Get the aggregates of the groups in a range together.
+        :param low: Smallest group to include, None for no lower bound
+        :param high: Largest group to include, None for no upper bound
+        :return: Dictionary with the count, sum, avg, min and max
+        """
+        return _summary(group_totals for _, group_totals in self._groups_between(low, high))
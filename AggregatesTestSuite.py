@@ -0,0 +1,105 @@
+import random
+import unittest
+from venv.Graph import Actor, Movie
+from venv.Aggregates import GroupedAggregate, year_group, age_group, gross_value_per_movie, exact_number
+
+
+class TestGroupedAggregate(unittest.TestCase):
+    """
+    Unit Tests for the materialized aggregates used by the API.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Creates aggregates of the gross values of a few movies by year and actors by age.
+        :return: self
+        """
+        self.movies = {'The Jackal': Movie('The Jackal', 1997, 159330280),
+                       'Face/Off': Movie('Face/Off', 1997, 245676146),
+                       'The Verdict': Movie('The Verdict', 1982, 54000000),
+                       'Unknown': Movie('Unknown', 0, 10)}
+        willis = Actor('Bruce Willis', 61, 562709189)
+        willis.movies_starred_in = ['The Jackal', 'Die Hard']
+        warden = Actor('Jack Warden', 85, 1234.5)
+        warden.movies_starred_in = []
+        self.actors = {'Bruce Willis': willis, 'Jack Warden': warden}
+        self.by_year = GroupedAggregate(year_group, lambda movie: exact_number(movie.gross_value)).build(self.movies)
+        self.by_age = GroupedAggregate(age_group, gross_value_per_movie).build(self.actors)
+
+    def test_rows(self):
+        """
+        Tests the aggregates of every group, and of the groups together.
+        :return: self
+        """
+        self.assertEqual(self.by_year.rows(), [
+            {'group': 1982, 'count': 1, 'sum': 54000000, 'avg': 54000000, 'min': 54000000, 'max': 54000000},
+            {'group': 1997, 'count': 2, 'sum': 405006426, 'avg': 202503213, 'min': 159330280, 'max': 245676146}])
+        self.assertEqual(self.by_year.rows(low=1990), self.by_year.rows()[1:])
+        self.assertEqual(self.by_year.total(), {'count': 3, 'sum': 459006426, 'avg': 153002142,
+                                                'min': 54000000, 'max': 245676146})
+        self.assertEqual([row['group'] for row in self.by_age.rows()], [60, 80])
+        self.assertAlmostEqual(self.by_age.rows()[0]['avg'], 562709189 / 3)
+        self.assertEqual(self.by_age.total(high=10)['avg'], None)
+
+    def test_updates(self):
+        """
+        Tests that changing and removing nodes takes back what they contributed, min and max included.
+        :return: self
+        """
+        self.by_year.update('Face/Off', Movie('Face/Off', 1982, 1))
+        self.assertEqual(self.by_year.rows()[1], {'group': 1997, 'count': 1, 'sum': 159330280, 'avg': 159330280,
+                                                  'min': 159330280, 'max': 159330280})
+        self.assertEqual(self.by_year.rows()[0]['min'], 1)
+        self.by_year.remove('The Verdict')
+        self.by_year.remove('Not There')
+        self.assertEqual(self.by_year.rows()[0], {'group': 1982, 'count': 1, 'sum': 1, 'avg': 1, 'min': 1, 'max': 1})
+        self.by_year.remove('Face/Off')
+        self.assertEqual([row['group'] for row in self.by_year.rows()], [1997])
+        self.assertEqual(len(self.by_year), 1)
+
+    def test_matches_rebuild(self):
+        """
+        Tests random updates against aggregates built from scratch.
+        :return: self
+        """
+        random.seed(7)
+        aggregate = GroupedAggregate(year_group, lambda movie: exact_number(movie.gross_value))
+        movies = {}
+        for i in range(2000):
+            name = 'Movie {}'.format(random.randrange(100))
+            if random.random() < 0.3:
+                movies.pop(name, None)
+                aggregate.remove(name)
+            else:
+                movies[name] = Movie(name, random.randrange(1990, 2000), random.choice([random.randrange(100), None]))
+                aggregate.update(name, movies[name])
+            if i % 100 == 0:
+                rebuilt = GroupedAggregate(year_group, lambda movie: exact_number(movie.gross_value)).build(movies)
+                self.assertEqual(aggregate.rows(), rebuilt.rows())
+
+
+    def test_exact_sums(self):
+        """
+        Tests that sums of values that aren't whole don't drift as values are added and taken away.
+        :return: self
+        """
+        random.seed(11)
+        aggregate = GroupedAggregate(year_group, lambda movie: exact_number(movie.gross_value))
+        aggregate.update('Base', Movie('Base', 1990, 0.1))
+        for i in range(1000):
+            aggregate.update('Other', Movie('Other', 1990, random.random() * 1e6))
+        aggregate.remove('Other')
+        self.assertEqual(aggregate.total(), {'count': 1, 'sum': 0.1, 'avg': 0.1, 'min': 0.1, 'max': 0.1})
+        aggregate.update('Other', Movie('Other', 1990, 0.2))
+        self.assertEqual(aggregate.total()['sum'], 0.1 + 0.2)
+        aggregate.update('Other', Movie('Other', 1990, 0.9))
+        self.assertEqual(aggregate.total()['sum'], 1)
+        aggregate.update('Infinite', Movie('Infinite', 1990, float('inf')))
+        self.assertEqual(aggregate.total()['sum'], float('inf'))
+        aggregate.remove('Infinite')
+        self.assertEqual(aggregate.rows()[0]['sum'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
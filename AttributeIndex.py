@@ -0,0 +1,262 @@
+from bisect import bisect_left, bisect_right
+from math import isnan
+
+"""
+Reference:
+https://en.wikipedia.org/wiki/Inverted_index
+https://docs.python.org/3/library/bisect.html
+"""
+
+_NO_NAMES = frozenset()
+
+
+def as_number(value):
+    """
+    Utility function to get the numeric value of an attribute, for range comparisons.
+    :param value: The attribute value
+    :return: The value as a float, or None if it isn't a number
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    value = float(value)
+    return None if isnan(value) else value
+
+
+class AttributeIndex:
+    """
+    Inverted indexes over the attributes of the nodes of a dictionary (name --> GraphNode).
+    Every attribute maps the string form of its values to the names of the nodes holding
+    them, so exact match filters compare like WebAPI.filter_list does without scanning all
+    the nodes. Nodes are ranked in the order they were added, so matches can be returned
+    in the order of the dictionary. Numeric attributes can also be kept sorted, for range
+    queries. The index has to be told about every write, see add and remove.
+    @author sahil1105
+    """
+
+    def __init__(self, attrs, sorted_attrs=()):
+        """
+        Constructor for an empty AttributeIndex.
+        :param attrs: Names of the node attributes to index
+        :param sorted_attrs: Names of the numeric node attributes to also keep sorted
+        """
+        self.attrs = list(attrs)
+        self.sorted_attrs = list(sorted_attrs)
+        self._postings = {attr: {} for attr in self.attrs}  # attr --> (string value --> set of names)
+        self._sorted = {attr: [] for attr in self.sorted_attrs}  # attr --> sorted list of (number, name)
+        self._sorted_numbers = {attr: [] for attr in self.sorted_attrs}  # attr --> the numbers of the list above
+        self._values = {}  # name --> (attr --> string value), as currently indexed
+        self._numbers = {}  # name --> (attr --> number), as currently kept sorted
+        self._rank = {}  # name --> position in the dictionary
+        self._next_rank = 0
+        self._sorted_names = []
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, name):
+        return name in self._values
+
+    def build(self, nodes):
+        """
+        Index all the nodes of a dictionary, dropping anything indexed before.
+        :param nodes: Dictionary (name --> GraphNode)
+        :return: self
+        """
+        self._postings = {attr: {} for attr in self.attrs}
+        self._values, self._numbers, self._rank, self._next_rank = {}, {}, {}, 0
+        entries = {attr: [] for attr in self.sorted_attrs}
+        for name, node in nodes.items():
+            self.add(name, node, keep_sorted=False)
+            for attr, number in self._numbers[name].items():
+                entries[attr].append((number, name))
+        self._sorted = {attr: sorted(attr_entries) for attr, attr_entries in entries.items()}
+        self._sorted_numbers = {attr: [number for number, _ in attr_entries]
+                                for attr, attr_entries in self._sorted.items()}
+        self._sorted_names = sorted(self._values)
+        return self
+
+    def add(self, name: str, node, keep_sorted: bool = True):
+        """
+        Index a node that was added or changed. A changed node keeps its position.
+        :param name: Key of the node in the dictionary
+        :param node: The GraphNode, or its __dict__
+        :param keep_sorted: False to leave the sorted lists alone, when they are rebuilt afterwards
+        :return: self
+        """
+        if name in self._values:
+            self._remove_postings(name)
+        else:
+            self._rank[name] = self._next_rank
+            self._next_rank += 1
+            if keep_sorted:
+                self._sorted_names.insert(bisect_left(self._sorted_names, name), name)
+        node_dict = node if isinstance(node, dict) else node.__dict__
+        values = {}
+        for attr in self.attrs:
+            if attr in node_dict:
+                values[attr] = str(node_dict[attr])
+                self._postings[attr].setdefault(values[attr], set()).add(name)
+        self._values[name] = values
+        numbers = {}
+        for attr in self.sorted_attrs:
+            number = as_number(node_dict.get(attr))
+            if number is not None:
+                numbers[attr] = number
+                if keep_sorted:
+                    position = bisect_left(self._sorted[attr], (number, name))
+                    self._sorted[attr].insert(position, (number, name))
+                    self._sorted_numbers[attr].insert(position, number)
+        self._numbers[name] = numbers
+        return self
+
+    def remove(self, name: str):
+        """
+        Drop a node that was deleted from the dictionary, if it is indexed.
+        :param name: Key of the node in the dictionary
+        :return: self
+        """
+        if name in self._values:
+            self._remove_postings(name)
+            del self._values[name]
+            del self._numbers[name]
+            del self._rank[name]
+            del self._sorted_names[bisect_left(self._sorted_names, name)]
+        return self
+
+    def _remove_postings(self, name):
+        """
+        Utility function to take a node out of the posting sets of the values it is indexed under.
+        :param name: Key of the node
+        :return: Nothing.
+        """
+        for attr, value in self._values[name].items():
+            names = self._postings[attr][value]
+            names.discard(name)
+            if not names:
+                del self._postings[attr][value]
+        for attr, number in self._numbers[name].items():
+            position = bisect_left(self._sorted[attr], (number, name))
+            del self._sorted[attr][position]
+            del self._sorted_numbers[attr][position]
+
+    def lookup(self, attr: str, attr_value) -> frozenset:
+        """
+        Get the names of the nodes whose attribute has the given value, compared as strings.
+        The returned set belongs to the index and must not be changed.
+        :param attr: Name of the node attribute
+        :param attr_value: The value to look for
+        :return: Set of names
+        """
+        return self._postings[attr].get(str(attr_value), _NO_NAMES)
+
+    def count(self, attr: str, attr_value) -> int:
+        """
+        Get the number of nodes whose attribute has the given value.
+        :param attr: Name of the node attribute
+        :param attr_value: The value to look for
+        :return: Number of nodes
+        """
+        return len(self._postings[attr].get(str(attr_value), _NO_NAMES))
+
+    def value_of(self, name: str, attr: str):
+        """
+        Get the string form of an attribute of an indexed node, without touching the node.
+        :param name: Key of the node
+        :param attr: Name of the node attribute
+        :return: The string value, or None if the node or attribute isn't indexed
+        """
+        return self._values.get(name, {}).get(attr)
+
+    def number_of(self, name: str, attr: str):
+        """
+        Get the numeric value of a sorted attribute of an indexed node, without touching the node.
+        :param name: Key of the node
+        :param attr: Name of the node attribute
+        :return: The value as a float, or None if it isn't a number
+        """
+        return self._numbers.get(name, {}).get(attr)
+
+    def _range_bounds(self, attr: str, low, high, include_low: bool, include_high: bool) -> (int, int):
+        """
+        Utility function to find the slice of a sorted attribute holding the values in a range.
+        :return: Start and end positions in the sorted list
+        """
+        numbers = self._sorted_numbers[attr]
+        if low is None:
+            start = 0
+        else:
+            start = bisect_left(numbers, low) if include_low else bisect_right(numbers, low)
+        if high is None:
+            end = len(numbers)
+        else:
+            end = bisect_right(numbers, high) if include_high else bisect_left(numbers, high)
+        return start, max(start, end)
+
+    def range_lookup(self, attr: str, low=None, high=None, include_low: bool = True,
+                     include_high: bool = True) -> list:
+        """
+        Get the names of the nodes whose (numeric) attribute is in a range.
+        :param attr: Name of a sorted node attribute
+        :param low: Lower bound, None for no lower bound
+        :param high: Upper bound, None for no upper bound
+        :param include_low: True if the lower bound itself is in the range
+        :param include_high: True if the upper bound itself is in the range
+        :return: List of names, by increasing value
+        """
+        start, end = self._range_bounds(attr, low, high, include_low, include_high)
+        return [name for _, name in self._sorted[attr][start:end]]
+
+    def range_count(self, attr: str, low=None, high=None, include_low: bool = True,
+                    include_high: bool = True) -> int:
+        """
+        Get the number of nodes whose (numeric) attribute is in a range, in logarithmic time.
+        The parameters are the same as for range_lookup.
+        :return: Number of nodes
+        """
+        start, end = self._range_bounds(attr, low, high, include_low, include_high)
+        return end - start
+
+    def names_after(self, cursor: str = None, limit: int = None) -> list:
+        """
+        Get the names of the indexed nodes in alphabetical order, starting after a given name.
+        :param cursor: Only names after this one are returned, None to start at the beginning
+        :param limit: Max number of names to return, None for all of them
+        :return: List of names
+        """
+        start = 0 if cursor is None else bisect_right(self._sorted_names, cursor)
+        return self._sorted_names[start:None if limit is None else start + limit]
+
+    def find_all(self, conditions: list) -> list:
+        """
+        Find the nodes matching all the given conditions by intersecting their posting sets, smallest first.
+        :param conditions: List of (node attribute name, value) pairs
+        :return: List of names, in dictionary order
+        """
+        if not conditions:
+            return self.in_order(self._values)
+        posting_sets = sorted((self.lookup(attr, attr_value) for attr, attr_value in conditions), key=len)
+        names = set(posting_sets[0])
+        for posting_set in posting_sets[1:]:
+            if not names:
+                break
+            names &= posting_set
+        return self.in_order(names)
+
+    def find_any(self, conditions: list) -> list:
+        """
+        Find the nodes matching any of the given conditions by joining their posting sets.
+        :param conditions: List of (node attribute name, value) pairs
+        :return: List of names, in dictionary order
+        """
+        names = set()
+        for attr, attr_value in conditions:
+            names |= self.lookup(attr, attr_value)
+        return self.in_order(names)
+
+    def in_order(self, names) -> list:
+        """
+        Sort names of indexed nodes into the order they have in the dictionary.
+        :param names: Iterable of names
+        :return: Sorted list of names
+        """
+        return sorted(names, key=self._rank.__getitem__)
@@ -0,0 +1,93 @@
+import unittest
+from venv.Graph import Actor
+from venv.AttributeIndex import AttributeIndex
+
+
+class TestAttributeIndex(unittest.TestCase):
+    """
+    Unit Tests for the inverted attribute indexes of the API.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Indexes a few actors.
+        :return: self
+        """
+        self.actors = {'Bruce Willis': Actor('Bruce Willis', 61, 562709189),
+                       'Jack Warden': Actor('Jack Warden', 85, 1234.5),
+                       'Paul Newman': Actor('Paul Newman', 61, 0)}
+        self.index = AttributeIndex(['name', 'age', 'gross_value', 'movies_starred_in'],
+                                    ['age', 'gross_value']).build(self.actors)
+
+    def test_lookup(self):
+        """
+        Tests that values are compared as strings, like WebAPI.filter_list does.
+        :return: self
+        """
+        self.assertEqual(self.index.lookup('age', '61'), {'Bruce Willis', 'Paul Newman'})
+        self.assertEqual(self.index.lookup('age', 61), {'Bruce Willis', 'Paul Newman'})
+        self.assertEqual(self.index.lookup('gross_value', '1234.5'), {'Jack Warden'})
+        self.assertEqual(self.index.lookup('age', '61.0'), set())
+        self.assertEqual(self.index.lookup('movies_starred_in', '[]'), set(self.actors))
+        self.assertEqual(self.index.count('age', '61'), 2)
+
+    def test_find_all_and_any(self):
+        """
+        Tests that AND/OR queries return the matches in dictionary order.
+        :return: self
+        """
+        self.assertEqual(self.index.find_all([('age', '61'), ('name', 'Paul Newman')]), ['Paul Newman'])
+        self.assertEqual(self.index.find_all([('age', '61'), ('name', 'Jack Warden')]), [])
+        self.assertEqual(self.index.find_all([]), ['Bruce Willis', 'Jack Warden', 'Paul Newman'])
+        self.assertEqual(self.index.find_any([('name', 'Paul Newman'), ('age', '85')]),
+                         ['Jack Warden', 'Paul Newman'])
+
+    def test_writes(self):
+        """
+        Tests that changed nodes are re-indexed in place and deleted ones are dropped.
+        :return: self
+        """
+        self.actors['Bruce Willis'].age = 62
+        self.index.add('Bruce Willis', self.actors['Bruce Willis'])
+        self.assertEqual(self.index.lookup('age', '61'), {'Paul Newman'})
+        self.assertEqual(self.index.find_any([('age', '62'), ('age', '61')]), ['Bruce Willis', 'Paul Newman'])
+        self.index.remove('Paul Newman').remove('Paul Newman')
+        self.assertNotIn('Paul Newman', self.index)
+        self.assertEqual(self.index.count('age', '61'), 0)
+        self.index.add('Paul Newman', Actor('Paul Newman', 61, 0))
+        self.assertEqual(self.index.find_all([]), ['Bruce Willis', 'Jack Warden', 'Paul Newman'])
+        self.assertEqual(len(self.index), 3)
+
+
+    def test_ranges(self):
+        """
+        Tests range lookups and counts, with open and closed bounds, as nodes change.
+        :return: self
+        """
+        self.assertEqual(self.index.range_lookup('age', 61, 85), ['Bruce Willis', 'Paul Newman', 'Jack Warden'])
+        self.assertEqual(self.index.range_lookup('age', 61, 85, include_low=False), ['Jack Warden'])
+        self.assertEqual(self.index.range_lookup('age', high=85, include_high=False), ['Bruce Willis', 'Paul Newman'])
+        self.assertEqual(self.index.range_count('gross_value', low=1000), 2)
+        self.assertEqual(self.index.range_count('age', 90, 80), 0)
+        self.actors['Jack Warden'].age = 'unknown'
+        self.index.add('Jack Warden', self.actors['Jack Warden'])
+        self.index.add('Ben Affleck', Actor('Ben Affleck', 44, 0))
+        self.index.remove('Bruce Willis')
+        self.assertEqual(self.index.range_lookup('age'), ['Ben Affleck', 'Paul Newman'])
+        self.assertIsNone(self.index.number_of('Jack Warden', 'age'))
+        self.assertEqual(self.index.number_of('Ben Affleck', 'age'), 44)
+
+    def test_names_after(self):
+        """
+        Tests that names are paged through in alphabetical order as nodes come and go.
+        :return: self
+        """
+        self.assertEqual(self.index.names_after(limit=2), ['Bruce Willis', 'Jack Warden'])
+        self.assertEqual(self.index.names_after('Jack Warden'), ['Paul Newman'])
+        self.index.add('Ben Affleck', Actor('Ben Affleck', 44, 0)).remove('Jack Warden')
+        self.assertEqual(self.index.names_after(), ['Ben Affleck', 'Bruce Willis', 'Paul Newman'])
+        self.assertEqual(self.index.names_after('Bz', 5), ['Paul Newman'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,248 @@
+from collections import Counter, deque
+from venv.Components import actor_key, movie_key
+
+"""
+Reference:
+https://en.wikipedia.org/wiki/Bipartite_graph
+https://en.wikipedia.org/wiki/Bidirectional_search
+"""
+
+
+def _listed_names(value) -> list:
+    """
+    Utility function to read a movies_starred_in/actors list, which API writes can set to anything.
+    :param value: The value of the attribute
+    :return: The names in it, or [] if it isn't a list of names
+    """
+    if not isinstance(value, (list, tuple)):
+        return []
+    return [name for name in value if isinstance(name, str)]
+
+
+class CastGraph:
+    """
+    Actor-movie graph of the names of the nodes, for traversals. An actor and a movie are
+    connected if either lists the other (in movies_starred_in or actors), so names of nodes
+    that aren't in the dictionaries are in the graph too. Kept up to date node by node with
+    set_actor/set_movie, so it never has to be rebuilt after a write.
+    @author sahil1105
+    """
+
+    def __init__(self):
+        """
+        Constructor for an empty CastGraph.
+        """
+        self._listed_by_actor = {}  # Actor name --> movies it lists
+        self._listed_by_movie = {}  # Movie name --> actors it lists
+        self._movies_of = {}  # Actor name --> Counter (movie name --> number of sides listing the edge)
+        self._cast_of = {}  # Movie name --> Counter (actor name --> number of sides listing the edge)
+
+    def build(self, actors: dict, movies: dict):
+        """
+        Replace the graph with the one of the given nodes.
+        :param actors: Dictionary (Actor name --> Actor Node)
+        :param movies: Dictionary (Movie name --> Movie Node)
+        :return: self
+        """
+        self.__init__()
+        for name, actor in actors.items():
+            self.set_actor(name, getattr(actor, 'movies_starred_in', []))
+        for name, movie in movies.items():
+            self.set_movie(name, getattr(movie, 'actors', []))
+        return self
+
+    def _add_edge(self, actor_name: str, movie_name: str, count: int):
+        """
+        Utility function to add (or with a count of -1, remove) one side's listing of an edge.
+        :return: Nothing.
+        """
+        for adjacency, node, neighbor in ((self._movies_of, actor_name, movie_name),
+                                          (self._cast_of, movie_name, actor_name)):
+            neighbors = adjacency.setdefault(node, Counter())
+            neighbors[neighbor] += count
+            if neighbors[neighbor] <= 0:
+                del neighbors[neighbor]
+                if not neighbors:
+                    del adjacency[node]
+
+    def set_actor(self, name: str, movie_names):
+        """
+        Set the movies an actor lists, after it was added or changed.
+        :param name: Name of the actor
+        :param movie_names: Its movies_starred_in
+        :return: self
+        """
+        new_names = set(_listed_names(movie_names))
+        old_names = self._listed_by_actor.pop(name, set())
+        for movie_name in old_names - new_names:
+            self._add_edge(name, movie_name, -1)
+        for movie_name in new_names - old_names:
+            self._add_edge(name, movie_name, 1)
+        if new_names:
+            self._listed_by_actor[name] = new_names
+        return self
+
+    def set_movie(self, name: str, actor_names):
+        """
+        Set the actors a movie lists, after it was added or changed.
+        :param name: Name of the movie
+        :param actor_names: Its actors
+        :return: self
+        """
+        new_names = set(_listed_names(actor_names))
+        old_names = self._listed_by_movie.pop(name, set())
+        for actor_name in old_names - new_names:
+            self._add_edge(actor_name, name, -1)
+        for actor_name in new_names - old_names:
+            self._add_edge(actor_name, name, 1)
+        if new_names:
+            self._listed_by_movie[name] = new_names
+        return self
+
+    def remove_actor(self, name: str):
+        """
+        Drop what a deleted actor listed. Movies that list it still connect to it.
+        :param name: Name of the actor
+        :return: self
+        """
+        return self.set_actor(name, [])
+
+    def remove_movie(self, name: str):
+        """
+        Drop what a deleted movie listed. Actors that list it still connect to it.
+        :param name: Name of the movie
+        :return: self
+        """
+        return self.set_movie(name, [])
+
+    def movies_of(self, actor_name: str) -> list:
+        """
+        Get the movies connected to an actor.
+        :param actor_name: Name of the actor
+        :return: Sorted list of movie names
+        """
+        return sorted(self._movies_of.get(actor_name, ()))
+
+    def cast_of(self, movie_name: str) -> list:
+        """
+        Get the actors connected to a movie.
+        :param movie_name: Name of the movie
+        :return: Sorted list of actor names
+        """
+        return sorted(self._cast_of.get(movie_name, ()))
+
+    def degree(self, name: str, is_actor: bool = True) -> int:
+        """
+        Get the number of movies of an actor, or of actors of a movie.
+        :param name: Name of the node
+        :param is_actor: True for an actor, False for a movie
+        :return: The degree, 0 if the node isn't in the graph
+        """
+        return len((self._movies_of if is_actor else self._cast_of).get(name, ()))
+
+    def co_stars(self, actor_name: str, limit: int = None) -> list:
+        """
+        Get the actors who share a movie with an actor, the most frequent co-stars first.
+        :param actor_name: Name of the actor
+        :param limit: Max number of co-stars to return, None for all
+        :return: List of (co-star name, number of shared movies), by decreasing count and then by name
+        """
+        counts = Counter()
+        for movie_name in self._movies_of.get(actor_name, ()):
+            counts.update(self._cast_of[movie_name].keys())
+        counts.pop(actor_name, None)
+        co_stars = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        return co_stars if limit is None else co_stars[:limit]
+
+    def _neighbors(self, key: tuple):
+        """
+        Utility function to get the neighbors of a node of the graph.
+        :param key: Key of the node (see actor_key and movie_key)
+        :return: Iterable of neighbor keys
+        """
+        kind, name = key
+        if kind == 'actor':
+            return (movie_key(movie_name) for movie_name in self._movies_of.get(name, ()))
+        return (actor_key(actor_name) for actor_name in self._cast_of.get(name, ()))
+
+    def neighborhood(self, name: str, is_actor: bool = True, depth: int = 2, max_nodes: int = None) -> (dict, bool):
+        """
+        Get the nodes within some number of hops of a node, by breadth first search.
+        :param name: Name of the node to start from
+        :param is_actor: True to start from an actor, False from a movie
+        :param depth: Max number of hops (actor to movie or movie to actor)
+        :param max_nodes: Max number of nodes to visit (the start included), None for no limit
+        :return: Dict ('actors'/'movies' --> Dict (name --> number of hops)), and whether
+        the search stopped at max_nodes before reaching every node within depth
+        """
+        start = actor_key(name) if is_actor else movie_key(name)
+        distances = {start: 0}
+        queue = deque([start])
+        truncated = False
+        while queue and not truncated:
+            key = queue.popleft()
+            if distances[key] == depth:
+                continue
+            for neighbor in self._neighbors(key):
+                if neighbor not in distances:
+                    if max_nodes is not None and len(distances) >= max_nodes:
+                        truncated = True
+                        break
+                    distances[neighbor] = distances[key] + 1
+                    queue.append(neighbor)
+        result = {'actors': {}, 'movies': {}}
+        for (kind, node_name), distance in distances.items():
+            result[kind + 's'][node_name] = distance
+        return result, truncated
+
+    def shortest_path(self, actor_name1: str, actor_name2: str, max_length: int = None) -> list:
+        """
+        Find a shortest chain of actors and the movies they share between two actors, by
+        searching from both ends at once.
+        :param actor_name1: Name of the first actor
+        :param actor_name2: Name of the second actor
+        :param max_length: Max number of movies on the path, None for no limit
+        :return: List of names, alternating actor and movie from actor_name1 to actor_name2,
+        or None if there is no such path
+        """
+        start, goal = actor_key(actor_name1), actor_key(actor_name2)
+        if start == goal:
+            return [actor_name1] if actor_name1 in self._movies_of else None
+        parents = ({start: None}, {goal: None})  # Forward and backward search trees
+        frontiers = ([start], [goal])
+        hops = 0
+        max_hops = None if max_length is None else 2 * max_length
+        while frontiers[0] and frontiers[1] and (max_hops is None or hops < max_hops):
+            side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1  # Grow the smaller frontier
+            next_frontier = []
+            for key in frontiers[side]:
+                for neighbor in self._neighbors(key):
+                    if neighbor in parents[side]:
+                        continue
+                    parents[side][neighbor] = key
+                    if neighbor in parents[1 - side]:
+                        return self._join_paths(neighbor, parents)
+                    next_frontier.append(neighbor)
+            frontiers[side][:] = next_frontier
+            hops += 1
+        return None
+
+    @staticmethod
+    def _join_paths(meeting_key: tuple, parents: tuple) -> list:
+        """
+        Utility function to assemble the path found by the two searches of shortest_path.
+        :param meeting_key: The node where the searches met
+        :param parents: The search trees (Dict (key --> parent key)), forward and backward
+        :return: List of names from the start to the goal
+        """
+        path = []
+        key = meeting_key
+        while key is not None:
+            path.append(key[1])
+            key = parents[0][key]
+        path.reverse()
+        key = parents[1][meeting_key]
+        while key is not None:
+            path.append(key[1])
+            key = parents[1][key]
+        return path
@@ -0,0 +1,114 @@
+import random
+import unittest
+from venv.Graph import Actor, Movie
+from venv.CastGraph import CastGraph
+
+
+class TestCastGraph(unittest.TestCase):
+    """
+    Unit Tests for the graph of names used for traversals by the API.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Creates a graph out of a few actors and movies, listed from either side.
+        :return: self
+        """
+        willis = Actor('Bruce Willis', 61, 562709189)
+        willis.movies_starred_in = ['The Jackal', 'Die Hard']
+        warden = Actor('Jack Warden', 85, 1234.5)
+        warden.movies_starred_in = ['The Verdict']
+        jackal = Movie('The Jackal', 1997, 159330280)
+        jackal.actors = ['Bruce Willis', 'Richard Gere']
+        verdict = Movie('The Verdict', 1982, 54000000)
+        verdict.actors = ['Paul Newman', 'Richard Gere']  # Not really, but it links the two casts
+        self.graph = CastGraph().build({'Bruce Willis': willis, 'Jack Warden': warden},
+                                       {'The Jackal': jackal, 'The Verdict': verdict})
+
+    def test_edges_from_both_sides(self):
+        """
+        Tests that an edge listed by either node is in the graph.
+        :return: self
+        """
+        self.assertEqual(self.graph.movies_of('Bruce Willis'), ['Die Hard', 'The Jackal'])
+        self.assertEqual(self.graph.cast_of('The Verdict'), ['Jack Warden', 'Paul Newman', 'Richard Gere'])
+        self.assertEqual(self.graph.degree('Richard Gere'), 2)
+        self.assertEqual(self.graph.degree('Nobody'), 0)
+
+    def test_co_stars(self):
+        """
+        Tests co-stars and their counts of shared movies.
+        :return: self
+        """
+        self.assertEqual(self.graph.co_stars('Richard Gere'),
+                         [('Bruce Willis', 1), ('Jack Warden', 1), ('Paul Newman', 1)])
+        self.assertEqual(self.graph.co_stars('Richard Gere', limit=1), [('Bruce Willis', 1)])
+        self.assertEqual(self.graph.co_stars('Nobody'), [])
+
+    def test_updates(self):
+        """
+        Tests that changing and removing nodes only drops the edges nobody lists anymore.
+        :return: self
+        """
+        self.graph.set_actor('Bruce Willis', ['Die Hard', 'Armageddon'])
+        self.assertEqual(self.graph.movies_of('Bruce Willis'), ['Armageddon', 'Die Hard', 'The Jackal'])
+        self.graph.remove_movie('The Jackal')
+        self.assertEqual(self.graph.movies_of('Bruce Willis'), ['Armageddon', 'Die Hard'])
+        self.assertEqual(self.graph.movies_of('Richard Gere'), ['The Verdict'])
+        self.graph.remove_actor('Jack Warden')
+        self.assertEqual(self.graph.cast_of('The Verdict'), ['Paul Newman', 'Richard Gere'])
+        self.graph.set_actor('Jack Warden', 'not a list')
+        self.assertEqual(self.graph.degree('Jack Warden'), 0)
+
+    def test_neighborhood(self):
+        """
+        Tests the nodes within k hops, and the limit on their number.
+        :return: self
+        """
+        result, truncated = self.graph.neighborhood('Bruce Willis', depth=2)
+        self.assertFalse(truncated)
+        self.assertEqual(result['movies'], {'Die Hard': 1, 'The Jackal': 1})
+        self.assertEqual(result['actors'], {'Bruce Willis': 0, 'Richard Gere': 2})
+        result, truncated = self.graph.neighborhood('The Verdict', is_actor=False, depth=1)
+        self.assertEqual(set(result['actors']), {'Jack Warden', 'Paul Newman', 'Richard Gere'})
+        result, truncated = self.graph.neighborhood('Bruce Willis', depth=4, max_nodes=3)
+        self.assertTrue(truncated)
+        self.assertEqual(len(result['actors']) + len(result['movies']), 3)
+
+    def test_shortest_path(self):
+        """
+        Tests the chain of actors and movies between two actors, and the limit on its length.
+        :return: self
+        """
+        self.assertEqual(self.graph.shortest_path('Bruce Willis', 'Jack Warden'),
+                         ['Bruce Willis', 'The Jackal', 'Richard Gere', 'The Verdict', 'Jack Warden'])
+        self.assertIsNone(self.graph.shortest_path('Bruce Willis', 'Jack Warden', max_length=1))
+        self.assertEqual(len(self.graph.shortest_path('Bruce Willis', 'Jack Warden', max_length=2)), 5)
+        self.assertEqual(self.graph.shortest_path('Bruce Willis', 'Bruce Willis'), ['Bruce Willis'])
+        self.assertIsNone(self.graph.shortest_path('Bruce Willis', 'Nobody'))
+
+    def test_shortest_path_length(self):
+        """
+        Tests that the paths are as short as those of a plain breadth first search, on a random graph.
+        :return: self
+        """
+        rng = random.Random(7)
+        graph = CastGraph()
+        for i in range(60):
+            graph.set_actor('actor {}'.format(i), ['movie {}'.format(rng.randrange(80)) for _ in range(2)])
+        for i in range(30):
+            start, goal = 'actor {}'.format(rng.randrange(60)), 'actor {}'.format(rng.randrange(60))
+            path = graph.shortest_path(start, goal)
+            distances = graph.neighborhood(start, depth=1000)[0]['actors']
+            if goal not in distances:
+                self.assertIsNone(path)
+                continue
+            self.assertEqual(len(path) - 1, distances[goal])
+            self.assertEqual((path[0], path[-1]), (start, goal))
+            for actor_name, movie_name in zip(path[::2], path[1::2]):
+                self.assertIn(movie_name, graph.movies_of(actor_name))
+
+
+if __name__ == '__main__':
+    unittest.main()
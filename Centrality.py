@@ -0,0 +1,145 @@
+import logging
+import numpy as np
+import scipy.sparse as sp
+
+"""
+Reference:
+https://en.wikipedia.org/wiki/PageRank
+https://en.wikipedia.org/wiki/Eigenvector_centrality
+"""
+
+DAMPING = 0.85
+TOLERANCE = 1e-8
+MAX_ITERATIONS = 100
+
+
+def build_adjacency_matrix(actors: dict, movies: dict, weighted: bool = True):
+    """
+    Utility function to build the sparse adjacency matrix of the actor-movie graph.
+    Requires that the graph between the MOVIES and ACTORS has been made. Nodes are
+    numbered actors first, followed by the movies, in the order of the dictionaries.
+    :param actors: Dictionary (Actor name --> Actor Node)
+    :param movies: Dictionary (Movie name --> Movie Node)
+    :param weighted: True to use the edge weights, False to give every edge a weight of 1
+    :return: scipy.sparse.csr_matrix where entry (i, j) is the weight of the edge from node i to node j
+    """
+    actor_index = {name: i for i, name in enumerate(actors)}
+    movie_index = {name: len(actors) + i for i, name in enumerate(movies)}
+    rows, cols, weights = [], [], []
+    for i, node in enumerate(list(actors.values()) + list(movies.values())):
+        other_index = movie_index if i < len(actors) else actor_index
+        for other_node, edge_weight in zip(node.edges, node.edge_weights):
+            if other_node.name in other_index:
+                rows.append(i)
+                cols.append(other_index[other_node.name])
+                weights.append(edge_weight if weighted else 1.0)
+    num_nodes = len(actors) + len(movies)
+    weights = np.nan_to_num(np.asarray(weights, dtype=np.float64))
+    return sp.csr_matrix((weights, (rows, cols)), shape=(num_nodes, num_nodes))
+
+
+def _split_scores(scores, actors, movies) -> (dict, dict):
+    """
+    Utility function to turn a score vector back into dictionaries.
+    :param scores: numpy array with a score per node, actors first
+    :return: Dict (Actor name --> score), Dict (Movie name --> score)
+    """
+    scores = scores.tolist()
+    return dict(zip(actors, scores[:len(actors)])), dict(zip(movies, scores[len(actors):]))
+
+
+def _initial_scores(actors, movies, previous_scores):
+    """
+    Utility function to get the starting vector of a power iteration. Starts from the
+    previous scores where there are any, so re-runs after small changes converge quickly.
+    :param previous_scores: (Dict (Actor name --> score), Dict (Movie name --> score)) or None
+    :return: numpy array with a positive score per node, summing to 1
+    """
+    num_nodes = len(actors) + len(movies)
+    if previous_scores is None:
+        return np.full(num_nodes, 1.0 / num_nodes)
+    previous_actor_scores, previous_movie_scores = previous_scores
+    scores = np.array([previous_actor_scores.get(name, np.nan) for name in actors] +
+                      [previous_movie_scores.get(name, np.nan) for name in movies], dtype=np.float64)
+    # Nodes added since the previous run start off with the average score
+    known = ~np.isnan(scores)
+    scores[~known] = scores[known].mean() if known.any() else 1.0
+    scores = np.maximum(scores, 0)
+    total = scores.sum()
+    return scores / total if total > 0 else np.full(num_nodes, 1.0 / num_nodes)
+
+
+def pagerank(actors: dict, movies: dict, weighted: bool = True, damping: float = DAMPING,
+             tolerance: float = TOLERANCE, max_iterations: int = MAX_ITERATIONS,
+             previous_scores: tuple = None) -> (dict, dict, int):
+    """
+    Compute the PageRank of every actor and movie by sparse power iteration. A node passes
+    its score on to its neighbours in proportion to the edge weights, and nodes without
+    edges spread theirs evenly over the whole graph.
+    Requires that the graph between the MOVIES and ACTORS has been made.
+    :param actors: Dictionary (Actor name --> Actor Node)
+    :param movies: Dictionary (Movie name --> Movie Node)
+    :param weighted: True to weigh the edges by edge_weights, False to treat them all the same
+    :param damping: Probability of following an edge rather than jumping to a random node
+    :param tolerance: Iteration stops once the scores change by less than this in total (L1 norm)
+    :param max_iterations: Max number of iterations
+    :param previous_scores: (actor scores, movie scores) of an earlier run to start from
+    :return: Dict (Actor name --> score), Dict (Movie name --> score), number of iterations run
+    """
+    num_nodes = len(actors) + len(movies)
+    if num_nodes == 0:
+        return {}, {}, 0
+    adjacency = build_adjacency_matrix(actors, movies, weighted)
+    out_weights = np.asarray(adjacency.sum(axis=1)).ravel()
+    dangling = out_weights == 0
+    inverse_out_weights = np.zeros(num_nodes)
+    inverse_out_weights[~dangling] = 1.0 / out_weights[~dangling]
+    transition = (sp.diags(inverse_out_weights) @ adjacency).T.tocsr()  # Column stochastic, bar dangling nodes
+
+    scores = _initial_scores(actors, movies, previous_scores)
+    for iteration in range(1, max_iterations + 1):
+        new_scores = damping * (transition @ scores + scores[dangling].sum() / num_nodes) + (1 - damping) / num_nodes
+        change = np.abs(new_scores - scores).sum()
+        scores = new_scores
+        if change < tolerance:
+            return (*_split_scores(scores, actors, movies), iteration)
+    logging.warning("pagerank did not converge in {} iterations.".format(max_iterations))
+    return (*_split_scores(scores, actors, movies), max_iterations)
+
+
+def eigenvector_centrality(actors: dict, movies: dict, weighted: bool = True, tolerance: float = TOLERANCE,
+                           max_iterations: int = MAX_ITERATIONS, previous_scores: tuple = None) -> (dict, dict, int):
+    """
+    Compute the eigenvector centrality of every actor and movie by sparse power iteration.
+    Since the graph is bipartite, iterates with A + I (same eigenvectors as A) so the
+    iteration doesn't flip back and forth between the actors and the movies.
+    Requires that the graph between the MOVIES and ACTORS has been made.
+    :param actors: Dictionary (Actor name --> Actor Node)
+    :param movies: Dictionary (Movie name --> Movie Node)
+    :param weighted: True to weigh the edges by edge_weights, False to treat them all the same
+    :param tolerance: Iteration stops once the scores change by less than this in total (L1 norm)
+    :param max_iterations: Max number of iterations
+    :param previous_scores: (actor scores, movie scores) of an earlier run to start from
+    :return: Dict (Actor name --> score), Dict (Movie name --> score), number of iterations run.
+    Scores are scaled to have an euclidean norm of 1.
+    """
+    num_nodes = len(actors) + len(movies)
+    if num_nodes == 0:
+        return {}, {}, 0
+    adjacency = build_adjacency_matrix(actors, movies, weighted)
+    if weighted and adjacency.nnz:
+        adjacency = adjacency / abs(adjacency).max()  # Keep the iteration away from overflow on huge grosses
+    adjacency_t = adjacency.T.tocsr()
+
+    scores = _initial_scores(actors, movies, previous_scores)
+    scores = scores / np.linalg.norm(scores)
+    for iteration in range(1, max_iterations + 1):
+        new_scores = adjacency_t @ scores + scores
+        norm = np.linalg.norm(new_scores)
+        new_scores = new_scores / norm if norm > 0 else new_scores
+        change = np.abs(new_scores - scores).sum()
+        scores = new_scores
+        if change < num_nodes * tolerance:
+            return (*_split_scores(scores, actors, movies), iteration)
+    logging.warning("eigenvector_centrality did not converge in {} iterations.".format(max_iterations))
+    return (*_split_scores(scores, actors, movies), max_iterations)
@@ -0,0 +1,84 @@
+import random
+import unittest
+import networkx as nx
+from venv.Graph import Actor, Movie, make_graph
+from venv.Centrality import build_adjacency_matrix, pagerank, eigenvector_centrality
+
+
+class TestCentrality(unittest.TestCase):
+    """
+    Unit Tests for the PageRank and eigenvector centrality of actors and movies.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Sets up a random graph, and the same graph in networkx to compare against.
+        :return: self
+        """
+        rng = random.Random(242)
+        movies = {}
+        for i in range(15):
+            movies['Movie {}'.format(i)] = Movie('Movie {}'.format(i), 1990 + i, float(rng.randint(1, 10**6)))
+            movies['Movie {}'.format(i)].actors = rng.sample(['Actor {}'.format(j) for j in range(30)], 4)
+        actors = {'Actor {}'.format(j): Actor('Actor {}'.format(j), 40) for j in range(30)}
+        self.actors, self.movies = make_graph(actors, movies)
+        self.graph = nx.DiGraph()
+        self.graph.add_nodes_from(('actor', name) for name in self.actors)
+        self.graph.add_nodes_from(('movie', name) for name in self.movies)
+        for kind, nodes, other_kind in [('actor', self.actors, 'movie'), ('movie', self.movies, 'actor')]:
+            for name, node in nodes.items():
+                for other_node, edge_weight in zip(node.edges, node.edge_weights):
+                    self.graph.add_edge((kind, name), (other_kind, other_node.name), weight=edge_weight)
+
+    def assertScoresEqual(self, actor_scores, movie_scores, expected):
+        """
+        Checks the scores against networkx's scores.
+        :return: self
+        """
+        for name, score in actor_scores.items():
+            self.assertAlmostEqual(score, expected[('actor', name)], places=6)
+        for name, score in movie_scores.items():
+            self.assertAlmostEqual(score, expected[('movie', name)], places=6)
+
+    def test_adjacency_matrix(self):
+        """
+        Tests that the adjacency matrix holds every edge with its weight.
+        :return: self
+        """
+        adjacency = build_adjacency_matrix(self.actors, self.movies)
+        self.assertEqual(adjacency.shape, (45, 45))
+        self.assertEqual(adjacency.nnz, self.graph.number_of_edges())
+        unweighted = build_adjacency_matrix(self.actors, self.movies, weighted=False)
+        self.assertEqual(unweighted.sum(), self.graph.number_of_edges())
+
+    def test_pagerank(self):
+        """
+        Tests PageRank against networkx, and that warm starts converge faster.
+        :return: self
+        """
+        actor_scores, movie_scores, iterations = pagerank(self.actors, self.movies, tolerance=1e-12, max_iterations=500)
+        self.assertAlmostEqual(sum(actor_scores.values()) + sum(movie_scores.values()), 1.0)
+        self.assertScoresEqual(actor_scores, movie_scores, nx.pagerank(self.graph, tol=1e-14, max_iter=500))
+        _, _, warm_iterations = pagerank(self.actors, self.movies, tolerance=1e-12, max_iterations=500,
+                                         previous_scores=(actor_scores, movie_scores))
+        self.assertLess(warm_iterations, iterations)
+
+    def test_eigenvector_centrality(self):
+        """
+        Tests eigenvector centrality against networkx.
+        :return: self
+        """
+        actor_scores, movie_scores, _ = eigenvector_centrality(self.actors, self.movies, weighted=False,
+                                                               tolerance=1e-12, max_iterations=1000)
+        self.assertScoresEqual(actor_scores, movie_scores,
+                               nx.eigenvector_centrality(self.graph, tol=1e-12, max_iter=1000, weight=None))
+        # Weighted scores stay normalized despite the size of the gross values
+        actor_scores, movie_scores, _ = eigenvector_centrality(self.actors, self.movies, max_iterations=1000)
+        self.assertAlmostEqual(sum(score ** 2 for score in actor_scores.values()) +
+                               sum(score ** 2 for score in movie_scores.values()), 1.0)
+        self.assertEqual(eigenvector_centrality({}, {}), ({}, {}, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
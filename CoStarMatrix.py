@@ -0,0 +1,110 @@
+import numpy as np
+import scipy.sparse as sp
+
+
+class CoStarMatrix:
+    """
+    Sparse matrix representation of who starred with whom. Holds the actor x movie
+    incidence matrix (built from the edges of the graph) and the movie x cast member
+    matrix (built from the cast lists of the movies), so that co-star queries can be
+    answered with sparse matrix products instead of per-actor set unions.
+    @author sahil1105
+    """
+
+    def __init__(self, actors: dict):
+        """
+        Constructor for the CoStarMatrix. Requires that the graph between the MOVIES and
+        ACTORS has been made, since the movies of an actor are read from its edges.
+        :param actors: Dictionary (Actor name --> Actor Node)
+        """
+        self.actor_names = list(actors.keys())
+        self.movie_names = []
+        self.cast_names = list(self.actor_names)  # Actor nodes come first in the cast index
+        actor_index = {name: i for i, name in enumerate(self.actor_names)}
+        movie_index = {}
+        cast_index = dict(actor_index)
+
+        incidence_rows, incidence_cols = [], []
+        cast_rows, cast_cols = [], []
+        for row, actor_node in enumerate(actors.values()):
+            for movie_node in actor_node.edges:
+                if movie_node.name not in movie_index:
+                    # First time we see this movie, so index it along with its cast
+                    movie_index[movie_node.name] = len(self.movie_names)
+                    self.movie_names.append(movie_node.name)
+                    for cast_member in movie_node.actors:
+                        if cast_member not in cast_index:
+                            cast_index[cast_member] = len(self.cast_names)
+                            self.cast_names.append(cast_member)
+                        cast_rows.append(movie_index[movie_node.name])
+                        cast_cols.append(cast_index[cast_member])
+                incidence_rows.append(row)
+                incidence_cols.append(movie_index[movie_node.name])
+
+        self.actor_index = actor_index
+        self.movie_index = movie_index
+        self.incidence = self._make_binary_matrix(incidence_rows, incidence_cols,
+                                                  (len(self.actor_names), len(self.movie_names)))
+        self.cast = self._make_binary_matrix(cast_rows, cast_cols,
+                                             (len(self.movie_names), len(self.cast_names)))
+
+    @staticmethod
+    def _make_binary_matrix(rows, cols, shape):
+        """
+        Utility function to build a 0/1 CSR matrix out of coordinate lists. Duplicate
+        coordinates are collapsed into a single 1.
+        :param rows: Row index of every entry
+        :param cols: Column index of every entry
+        :param shape: Shape of the matrix
+        :return: scipy.sparse.csr_matrix with 1 wherever an entry was given
+        """
+        data = np.ones(len(rows), dtype=np.int32)
+        matrix = sp.csr_matrix((data, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))),
+                               shape=shape)
+        matrix.data[:] = 1  # csr_matrix sums duplicates, clamp them back to 1
+        return matrix
+
+    def co_star_projection(self):
+        """
+        Get the co-star projection A.A^T of the actor x movie incidence matrix A.
+        Entry (i, j) is the number of movies actors i and j have both starred in,
+        and the diagonal holds the number of movies of each actor.
+        :return: scipy.sparse.csr_matrix (num actors x num actors)
+        """
+        return (self.incidence @ self.incidence.T).tocsr()
+
+    def distinct_co_star_counts(self):
+        """
+        Get the number of distinct people each actor has shared a cast list with.
+        The cast lists of all the actor's movies are counted, including cast members
+        without an Actor node (and the actor itself, if listed).
+        :return: numpy array of counts, in the same order as actor_names
+        """
+        # Every entry of A.C is a positive count, so the number of stored entries per row
+        # is exactly the number of distinct cast members reachable through a movie.
+        return np.diff((self.incidence @ self.cast).tocsr().indptr)
+
+    def co_appearance_weights(self, actor_name: str) -> dict:
+        """
+        Get the number of movies the given actor shares with each of its co-stars
+        that have an Actor node.
+        :param actor_name: Name of the actor
+        :return: Dict (Co-star name --> number of shared movies), empty if the actor is unknown
+        """
+        if actor_name not in self.actor_index:
+            return {}
+        row = self.incidence[self.actor_index[actor_name]]
+        weights = (row @ self.incidence.T).tocsr()
+        return {self.actor_names[j]: int(w) for j, w in zip(weights.indices, weights.data)
+                if self.actor_names[j] != actor_name}
+
+    def top_hub_actors(self, n: int = 10) -> list:
+        """
+        Get the 'n' actors with the most distinct co-stars. Ties keep the order of the
+        actors dictionary the matrix was built from.
+        :param n: Number of top hub ACTORS to find
+        :return: List of the names of the top n hub actors
+        """
+        counts = self.distinct_co_star_counts()
+        order = np.argsort(-counts, kind='stable')[:min(len(self.actor_names), n)]
+        return [self.actor_names[i] for i in order]
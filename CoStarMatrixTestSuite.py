@@ -0,0 +1,70 @@
+import unittest
+from venv.Graph import Actor, Movie, make_graph
+from venv.CoStarMatrix import CoStarMatrix
+
+
+class TestCoStarMatrix(unittest.TestCase):
+    """
+    Unit Tests for the sparse co-star matrix.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Sets up a small graph for the test cases.
+        :return: self
+        """
+        movies = [Movie('Brubaker', 1980, 37121708.0), Movie('Glory', 1989, 26800000.0),
+                  Movie('Marie', 1985, 2507995.0)]
+        movies[0].actors = ['Robert Redford', 'Yaphet Kotto', 'Morgan Freeman']
+        movies[1].actors = ['Matthew Broderick', 'Denzel Washington', 'Morgan Freeman']
+        movies[2].actors = ['Sissy Spacek', 'Jeff Daniels', 'Morgan Freeman']
+        actors = [Actor('Morgan Freeman', 80), Actor('Robert Redford', 81), Actor('Denzel Washington', 63),
+                  Actor('Sissy Spacek', 68), Actor('Jeff Daniels', 63)]
+        actors[0].movies_starred_in = ['Brubaker', 'Glory', 'Marie']
+        actors[1].movies_starred_in = ['Brubaker']
+        actors[2].movies_starred_in = ['Glory']
+        actors[4].movies_starred_in = ['Marie']
+        self.actors, self.movies = make_graph({node.name: node for node in actors},
+                                              {node.name: node for node in movies})
+        self.matrix = CoStarMatrix(self.actors)
+
+    def test_distinct_co_star_counts(self):
+        """
+        Tests that the counts match a set union over the cast lists of each actor's movies.
+        :return: self
+        """
+        counts = self.matrix.distinct_co_star_counts()
+        for i, actor_node in enumerate(self.actors.values()):
+            connections = set([])
+            for movie_node in actor_node.edges:
+                connections = connections.union(set(movie_node.actors))
+            self.assertEqual(counts[i], len(connections))
+
+    def test_co_star_projection(self):
+        """
+        Tests that the projection counts shared movies.
+        :return: self
+        """
+        projection = self.matrix.co_star_projection()
+        freeman = self.matrix.actor_index['Morgan Freeman']
+        redford = self.matrix.actor_index['Robert Redford']
+        self.assertEqual(projection[freeman, freeman], 3)
+        self.assertEqual(projection[freeman, redford], 1)
+        self.assertEqual(projection[redford, freeman], 1)
+        self.assertEqual(self.matrix.co_appearance_weights('Morgan Freeman'),
+                         {'Robert Redford': 1, 'Denzel Washington': 1, 'Sissy Spacek': 1, 'Jeff Daniels': 1})
+        self.assertEqual(self.matrix.co_appearance_weights('Jason Statham'), {})
+
+    def test_top_hub_actors(self):
+        """
+        Tests the ordering of the hub actors, including that ties keep the dictionary order.
+        :return: self
+        """
+        self.assertEqual(self.matrix.top_hub_actors(3), ['Morgan Freeman', 'Robert Redford', 'Denzel Washington'])
+        self.assertEqual(len(self.matrix.top_hub_actors(20)), 5)
+        self.assertEqual(CoStarMatrix({}).top_hub_actors(10), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,204 @@
+"""
+Reference:
+https://en.wikipedia.org/wiki/Disjoint-set_data_structure
+"""
+
+
+def actor_key(name: str) -> tuple:
+    """
+    Utility function to get the key of an actor in a ComponentTracker. Actors and
+    movies are kept apart since an actor and a movie can share a name.
+    :param name: Name of the actor
+    :return: Key of the actor
+    """
+    return 'actor', name
+
+
+def movie_key(name: str) -> tuple:
+    """
+    Utility function to get the key of a movie in a ComponentTracker.
+    :param name: Name of the movie
+    :return: Key of the movie
+    """
+    return 'movie', name
+
+
+class ComponentTracker:
+    """
+    Union-find structure keeping track of the connected components of the actor-movie
+    graph as nodes and edges are added. Lookups and merges take (amortized) near constant
+    time thanks to union by size and path halving. Components only ever merge, so
+    removing edges or nodes is not supported; rebuild the tracker for that.
+    @author sahil1105
+    """
+
+    def __init__(self):
+        """
+        Constructor for an empty ComponentTracker.
+        """
+        self._parent = {}
+        self._size = {}  # Only kept up to date for the roots
+        self.num_components = 0
+        self._giant_root = None
+
+    def __len__(self):
+        return len(self._parent)
+
+    def __contains__(self, key):
+        return key in self._parent
+
+    def add_node(self, key):
+        """
+        Add a node as a component of its own, if it isn't already tracked.
+        :param key: Key of the node (see actor_key and movie_key)
+        :return: self
+        """
+        if key not in self._parent:
+            self._parent[key] = key
+            self._size[key] = 1
+            self.num_components += 1
+            if self._giant_root is None:
+                self._giant_root = key
+        return self
+
+    def find(self, key):
+        """
+        Find the representative of the component a node is in.
+        :param key: Key of the node
+        :return: Key of the representative node, or None if the node isn't tracked
+        """
+        parent = self._parent
+        if key not in parent:
+            return None
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]  # Path halving
+            key = parent[key]
+        return key
+
+    def union(self, key1, key2):
+        """
+        Record an edge between two nodes, merging their components. Untracked nodes are added first.
+        :param key1: Key of the first node
+        :param key2: Key of the second node
+        :return: Key of the representative of the merged component
+        """
+        self.add_node(key1)
+        self.add_node(key2)
+        root1, root2 = self.find(key1), self.find(key2)
+        if root1 == root2:
+            return root1
+        if self._size[root1] < self._size[root2]:
+            root1, root2 = root2, root1
+        self._parent[root2] = root1
+        self._size[root1] += self._size.pop(root2)
+        self.num_components -= 1
+        if self._giant_root == root2 or self._size[root1] > self._size[self._giant_root]:
+            self._giant_root = root1
+        return root1
+
+    def connected(self, key1, key2) -> bool:
+        """
+        Check whether two nodes are in the same component.
+        :return: True if both nodes are tracked and connected, False otherwise
+        """
+        root1 = self.find(key1)
+        return root1 is not None and root1 == self.find(key2)
+
+    def component_size(self, key) -> int:
+        """
+        Get the size of the component a node is in.
+        :param key: Key of the node
+        :return: Number of nodes in its component, 0 if the node isn't tracked
+        """
+        root = self.find(key)
+        return 0 if root is None else self._size[root]
+
+    def component_sizes(self) -> list:
+        """
+        Get the sizes of all the components.
+        :return: List of component sizes, largest first
+        """
+        return sorted(self._size.values(), reverse=True)
+
+    def size_stats(self) -> dict:
+        """
+        Get summary statistics about the components.
+        :return: Dictionary with the number of nodes and components, the size of the largest
+        component, the mean component size and the number of isolated nodes
+        """
+        sizes = self._size.values()
+        return {'num_nodes': len(self._parent),
+                'num_components': self.num_components,
+                'largest': self._size[self._giant_root] if self._giant_root is not None else 0,
+                'mean': len(self._parent) / self.num_components if self.num_components else 0,
+                'isolated': sum(1 for size in sizes if size == 1)}
+
+    def giant_component_ratio(self) -> float:
+        """
+        Get the fraction of all tracked nodes that are in the largest component.
+        :return: Ratio between 0 and 1, 0 if nothing is tracked
+        """
+        if not self._parent:
+            return 0
+        return self._size[self._giant_root] / len(self._parent)
+
+    def in_giant_component(self, key) -> bool:
+        """
+        Check whether a node is in the largest component.
+        :param key: Key of the node
+        :return: True if it is, False otherwise
+        """
+        return self._giant_root is not None and self.find(key) == self.find(self._giant_root)
+
+    def add_actor(self, actor_name: str):
+        """
+        Add an actor node as a component of its own, if it isn't already tracked.
+        :param actor_name: Name of the actor
+        :return: self
+        """
+        return self.add_node(actor_key(actor_name))
+
+    def add_movie(self, movie_name: str):
+        """
+        Add a movie node as a component of its own, if it isn't already tracked.
+        :param movie_name: Name of the movie
+        :return: self
+        """
+        return self.add_node(movie_key(movie_name))
+
+    def add_edge(self, actor_name: str, movie_name: str):
+        """
+        Record an edge between an actor and a movie.
+        :param actor_name: Name of the actor
+        :param movie_name: Name of the movie
+        :return: Key of the representative of the merged component
+        """
+        return self.union(actor_key(actor_name), movie_key(movie_name))
+
+    def track_graph(self, actors: dict, movies: dict):
+        """
+        Add all the given nodes and the edges between them.
+        :param actors: Dictionary (Actor name --> Actor Node)
+        :param movies: Dictionary (Movie name --> Movie Node)
+        :return: self
+        """
+        for movie_name in movies:
+            self.add_movie(movie_name)
+        for actor_name, actor_node in actors.items():
+            self.add_actor(actor_name)
+            for movie_node in actor_node.edges:
+                self.add_edge(actor_name, movie_node.name)
+        return self
+
+    def giant_component(self, actors: dict, movies: dict) -> (dict, dict):
+        """
+        Keep only the actors and movies in the largest component, e.g. to run analytics on it alone.
+        :param actors: Dictionary (Actor name --> Actor Node)
+        :param movies: Dictionary (Movie name --> Movie Node)
+        :return: Dict (Actor name --> Actor Node), Dict (Movie name --> Movie Node) of the giant component
+        """
+        if self._giant_root is None:
+            return {}, {}
+        giant_root = self.find(self._giant_root)
+        return ({name: node for name, node in actors.items() if self.find(actor_key(name)) == giant_root},
+                {name: node for name, node in movies.items() if self.find(movie_key(name)) == giant_root})
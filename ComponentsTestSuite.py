@@ -0,0 +1,72 @@
+import unittest
+from venv.Graph import Actor, Movie, make_graph
+from venv.Components import ComponentTracker, actor_key, movie_key
+
+
+class TestComponents(unittest.TestCase):
+    """
+    Unit Tests for the union-find based component tracker.
+    @author sahil1105
+    """
+
+    @staticmethod
+    def make_nodes():
+        """
+        Makes a graph with a component of 5 nodes, one of 2 nodes and an isolated actor.
+        :return: Dict (Actor Name --> Actor Node), Dict (Movie Name --> Movie Node)
+        """
+        brubaker = Movie('Brubaker', 1980, 1.0)
+        brubaker.actors = ['Robert Redford', 'Morgan Freeman']
+        glory = Movie('Glory', 1989, 2.0)
+        glory.actors = ['Morgan Freeman', 'Denzel Washington']
+        marie = Movie('Marie', 1985, 3.0)
+        marie.actors = ['Sissy Spacek']
+        actors = {name: Actor(name, 50) for name in ['Robert Redford', 'Morgan Freeman', 'Denzel Washington',
+                                                     'Sissy Spacek', 'Jeff Daniels']}
+        return actors, {'Brubaker': brubaker, 'Glory': glory, 'Marie': marie}
+
+    def setUp(self):
+        """
+        Sets up the graph and tracks its components.
+        :return: self
+        """
+        self.tracker = ComponentTracker()
+        self.actors, self.movies = make_graph(*self.make_nodes(), component_tracker=self.tracker)
+
+    def test_components(self):
+        """
+        Tests component lookups and statistics after make_graph.
+        :return: self
+        """
+        self.assertEqual(len(self.tracker), 8)
+        self.assertEqual(self.tracker.num_components, 3)
+        self.assertTrue(self.tracker.connected(actor_key('Robert Redford'), actor_key('Denzel Washington')))
+        self.assertFalse(self.tracker.connected(actor_key('Robert Redford'), movie_key('Marie')))
+        self.assertFalse(self.tracker.connected(actor_key('Robert Redford'), actor_key('Jason Statham')))
+        self.assertEqual(self.tracker.component_size(movie_key('Marie')), 2)
+        self.assertEqual(self.tracker.component_size(actor_key('Jason Statham')), 0)
+        self.assertEqual(self.tracker.component_sizes(), [5, 2, 1])
+        self.assertEqual(self.tracker.size_stats(), {'num_nodes': 8, 'num_components': 3, 'largest': 5,
+                                                     'mean': 8 / 3, 'isolated': 1})
+        self.assertAlmostEqual(self.tracker.giant_component_ratio(), 5 / 8)
+        actors, movies = self.tracker.giant_component(self.actors, self.movies)
+        self.assertEqual(set(actors), {'Robert Redford', 'Morgan Freeman', 'Denzel Washington'})
+        self.assertEqual(set(movies), {'Brubaker', 'Glory'})
+
+    def test_incremental_inserts(self):
+        """
+        Tests that adding edges later on merges components, and that the parallel build tracks them too.
+        :return: self
+        """
+        self.tracker.add_edge('Sissy Spacek', 'Glory')
+        self.tracker.add_edge('Jeff Daniels', 'Marie')
+        self.assertEqual(self.tracker.num_components, 1)
+        self.assertEqual(self.tracker.giant_component_ratio(), 1)
+        self.assertTrue(self.tracker.in_giant_component(actor_key('Jeff Daniels')))
+        tracker = ComponentTracker()
+        make_graph(*self.make_nodes(), num_workers=2, component_tracker=tracker)
+        self.assertEqual(tracker.component_sizes(), [5, 2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import gzip
+import zlib
+
+"""
+Reference:
+https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Accept-Encoding
+https://www.rfc-editor.org/rfc/rfc9110#name-content-codings
+"""
+
+# Content codings the API can send, the preferred one first
+ENCODINGS = ['gzip', 'deflate']
+# zlib compression level: 6 is the usual balance of speed and size
+COMPRESSION_LEVEL = 6
+
+
+def negotiate_encoding(request):
+    """
+    Utility function to pick the content coding to send a response in.
+    :param request: The flask request, whose Accept-Encoding header is honoured (q=0 included)
+    :return: 'gzip', 'deflate', or None to send the body as is
+    """
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def compress(body: bytes, encoding: str, level: int = COMPRESSION_LEVEL) -> bytes:
+    """
+    Utility function to compress a response body.
+    :param body: The body
+    :param encoding: 'gzip' or 'deflate' (which is the zlib format in HTTP)
+    :param level: Compression level, 1 (fastest) to 9 (smallest)
+    :return: The compressed body
+    """
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=level, mtime=0)  # No timestamp, so equal bodies compress equally
+    if encoding == 'deflate':
+        return zlib.compress(body, level)
+    raise ValueError("Unknown content coding: {}".format(encoding))
+
+
+def compress_response(response, request, min_size: int):
+    """
+    Compress a response in place if it is large enough and the client accepts a coding we send.
+    Responses that are streamed or already encoded are left alone.
+    :param response: The flask response
+    :param request: The flask request
+    :param min_size: Smallest body, in bytes, worth compressing
+    :return: The response
+    """
+    if response.is_streamed or response.direct_passthrough or 'Content-Encoding' in response.headers or \
+            response.status_code not in (200, 201, 400):
+        return response
+    body = response.get_data()
+    if len(body) < min_size:
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(request)
+    if encoding is not None:
+        response.set_data(compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+    return response
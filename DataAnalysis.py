@@ -1,8 +1,9 @@
 from venv.Graph import Actor, Movie, make_graph
-import json
 import matplotlib.pyplot as plt
 import sys
 from venv.helper import create_graph, get_node_attrs, get_movies_of_actors
+from venv.CoStarMatrix import CoStarMatrix
+from venv.JsonStream import iter_json_entries
 import networkx as nx
 
 
@@ -32,6 +33,39 @@ def get_movie_node_from_json_object(json_object):
     return new_movie
 
 
+def iter_nodes_from_json(filename: str = 'data.json', max_num_actors: int = sys.maxsize,
+                         max_num_movies: int = sys.maxsize, json_class: str = None):
+    """
+    Utility generator to lazily extract the Movies and Actors from the given JSON file.
+    The file is parsed incrementally and reading stops as soon as both limits are hit,
+    so only the part of the file holding the requested nodes is ever read. Entries of the
+    class that isn't asked for are skipped without being decoded.
+    :param filename: name of the json file
+    :param max_num_actors: max number of ACTORS to yield, default: no limit
+    :param max_num_movies: max number of MOVIES to yield, default: no limit
+    :param json_class: "Actor" or "Movie" to only yield nodes of that class, default: both
+    :return: Generator of Actor and Movie GraphNodes, in the order they appear in the file
+    """
+    if json_class == "Actor":
+        max_num_movies = 0
+    elif json_class == "Movie":
+        max_num_actors = 0
+    num_actors_added = 0
+    num_movies_added = 0
+    if max_num_actors <= 0 and max_num_movies <= 0:
+        return
+
+    for name, json_object, _, _ in iter_json_entries(filename, json_class=json_class):
+        if json_object['json_class'] == "Actor" and num_actors_added < max_num_actors:
+            num_actors_added += 1
+            yield get_actor_node_from_json_object(json_object)
+        elif json_object['json_class'] == "Movie" and num_movies_added < max_num_movies:
+            num_movies_added += 1
+            yield get_movie_node_from_json_object(json_object)
+        if num_actors_added >= max_num_actors and num_movies_added >= max_num_movies:
+            return
+
+
 def extract_from_json(filename: str = 'data.json',
                       max_num_actors: int = sys.maxsize, max_num_movies: int = sys.maxsize) -> (dict, dict):
     """
@@ -42,24 +76,13 @@ def extract_from_json(filename: str = 'data.json',
     :param max_num_movies: max number of MOVIES to return, default: no limit
     :return: Dict (Actor Name --> Actor Node), Dict (Movie Name --> Movie Node)
     """
-    actors = []
-    movies = []
-    num_actors_added = 0
-    num_movies_added = 0
-
-    with open(filename, 'r') as file:
-        json_data = json.load(file)
-        for json_dict in json_data:
-            for name, json_object in json_dict.items():
-                if json_object['json_class'] == "Actor" and num_actors_added < max_num_actors:
-                    actors.append(get_actor_node_from_json_object(json_object))
-                    num_actors_added += 1
-                elif json_object['json_class'] == "Movie" and num_movies_added < max_num_movies:
-                    movies.append(get_movie_node_from_json_object(json_object))
-                    num_movies_added += 1
-
-    actors = {node.name: node for node in actors}
-    movies = {node.name: node for node in movies}
+    actors = {}
+    movies = {}
+    for node in iter_nodes_from_json(filename, max_num_actors, max_num_movies):
+        if isinstance(node, Actor):
+            actors[node.name] = node
+        else:
+            movies[node.name] = node
     return actors, movies
 
 
@@ -67,18 +90,13 @@ def get_hub_actors(actors: dict, n: int = 10) -> list:
     """
     Utility function to get the 'n' ACTORS with most connection to other ACTORS.
     Requires that graph between the MOVIES and ACTORS has been made.
-    Does a basic level-2 search of the graph from each actor node.
+    Counts the distinct cast members of each actor's movies using the sparse
+    actor x movie incidence matrix (see CoStarMatrix).
     :param actors: Dictionary (Actor name --> Actor Node)
     :param n: Number of top hub ACTORS to find
     :return: Top n hub actors
     """
-    actor_connections_dict = {}
-    for actor_node in actors.values():
-        connections = set([])
-        for movie_node in actor_node.edges:
-            connections = connections.union(set(movie_node.actors))
-        actor_connections_dict[actor_node.name] = len(connections)
-    return sorted(actor_connections_dict, key=actor_connections_dict.get, reverse=True)[:min(len(actors.keys()), n)]
+    return CoStarMatrix(actors).top_hub_actors(n)
 
 
 def plot_hub_actors(hub_actors, plot=True):
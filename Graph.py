@@ -1,3 +1,6 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+
 
 class GraphNode:
     """
@@ -248,19 +251,31 @@ def calc_edge_weights(movie_node, actor_node=None):
     return edge_weights
 
 
-def make_graph(actors, movies, edge_weight_func=calc_edge_weights):
+def make_graph(actors, movies, edge_weight_func=calc_edge_weights, num_workers=1, component_tracker=None):
     """
     Construct a graph out of the given ACTORS and MOVIES.
     :param actors: A dictionary (name of actor --> Actor Node for the actor)
     :param movies: A dictionary (name of the movie --> Movie Node for the movie)
+    :param edge_weight_func: Function giving the weights of the edges of a Movie Node
+    :param num_workers: Number of processes to build the graph with, see make_graph_parallel
+    :param component_tracker: Optional Components.ComponentTracker to record the nodes and edges in
     :return: Modified dictionaries ACTORS and MOVIES where there are edges between the ACTORS
     and MOVIES wherever possible along with appropriate weights.
     """
+    if num_workers != 1:
+        return make_graph_parallel(actors, movies, edge_weight_func, num_workers, component_tracker)
+
+    if component_tracker is not None:
+        for actor_name in actors:
+            component_tracker.add_actor(actor_name)
+        for movie_name in movies:
+            component_tracker.add_movie(movie_name)
+
     # Draw edges from ACTORS to MOVIES (and the other way round) if one of its MOVIES has a node.
-    make_edges_from_actors_to_movies(actors, movies)
+    make_edges_from_actors_to_movies(actors, movies, component_tracker)
 
     # Draw edges from MOVIES to ACTORS (and the other way around) if one its ACTORS has a node.
-    make_edges_from_movies_to_actors(actors, movies)
+    make_edges_from_movies_to_actors(actors, movies, component_tracker)
 
     # Assign appropriate weights to the edges.
     assign_weights_to_edges(movies, edge_weight_func)
@@ -268,6 +283,120 @@ def make_graph(actors, movies, edge_weight_func=calc_edge_weights):
     return actors, movies
 
 
+# Actor Name --> (age, gross value) of every actor, set in each worker process of make_graph_parallel
+_WORKER_ACTORS = {}
+
+
+def _init_graph_worker(actor_details):
+    """
+    Initializer for the worker processes of make_graph_parallel.
+    :param actor_details: Dictionary (name of actor --> (age, gross value))
+    :return: Nothing.
+    """
+    global _WORKER_ACTORS
+    _WORKER_ACTORS = actor_details
+
+
+def _build_movie_shard(shard, edge_weight_func):
+    """
+    Worker function of make_graph_parallel. Works out the cast list, edges and edge weights
+    a shard of MOVIES ends up with in make_graph. The weights are computed on a copy of the
+    Movie Node whose edges point at Actor Nodes holding only the name, age and gross value.
+    :param shard: List of (name, year released, gross value, cast list, names of the ACTORS
+    listing the movie in the order of the actors dictionary) for every movie of the shard
+    :param edge_weight_func: Function giving the weights of the edges of a Movie Node
+    :return: List of (cast members to append, names of the ACTORS on the edges, edge weights)
+    """
+    results = []
+    for name, year_released, gross_value, cast, listed_by in shard:
+        # make_edges_from_actors_to_movies: add an edge to (and cast entry for) each listing actor
+        in_cast = set(cast)
+        new_cast = []
+        for actor_name in listed_by:
+            if actor_name not in in_cast:
+                in_cast.add(actor_name)
+                new_cast.append(actor_name)
+        # make_edges_from_movies_to_actors: add an edge to every cast member with a node
+        edge_names = list(listed_by)
+        has_edge = set(listed_by)
+        for actor_name in cast + new_cast:
+            if actor_name in _WORKER_ACTORS and actor_name not in has_edge:
+                has_edge.add(actor_name)
+                edge_names.append(actor_name)
+        # assign_weights_to_edges
+        movie_node = Movie(name, year_released, gross_value)
+        movie_node.actors = cast + new_cast
+        movie_node.edges = [Actor(actor_name, *_WORKER_ACTORS[actor_name]) for actor_name in edge_names]
+        movie_node.edge_weights = [gross_value] * len(edge_names)
+        results.append((new_cast, edge_names, list(edge_weight_func(movie_node))))
+    return results
+
+
+def make_graph_parallel(actors, movies, edge_weight_func=calc_edge_weights, num_workers=None,
+                        component_tracker=None):
+    """
+    Construct the same graph as make_graph, sharding the MOVIES across a pool of processes.
+    Each worker works out the edges and weights of its movies and the results are merged
+    back in the order of the dictionaries, so the output is identical to make_graph's.
+    The edge_weight_func must be picklable (a module level function) and only gets to see
+    the name, age and gross value of the Actor Nodes on the edges. Falls back to make_graph
+    if any of the nodes already has edges.
+    :param actors: A dictionary (name of actor --> Actor Node for the actor)
+    :param movies: A dictionary (name of the movie --> Movie Node for the movie)
+    :param edge_weight_func: Function giving the weights of the edges of a Movie Node
+    :param num_workers: Number of worker processes, default: number of CPUs
+    :param component_tracker: Optional Components.ComponentTracker to record the nodes and edges in
+    :return: Modified dictionaries ACTORS and MOVIES where there are edges between the ACTORS
+    and MOVIES wherever possible along with appropriate weights.
+    """
+    if any(node.edges for node in actors.values()) or any(node.edges for node in movies.values()):
+        return make_graph(actors, movies, edge_weight_func, component_tracker=component_tracker)
+    num_workers = num_workers or os.cpu_count() or 1
+
+    # ACTORS listing each movie, in the order make_edges_from_actors_to_movies visits them
+    listed_by = {}
+    for actor_name, actor_node in actors.items():
+        for movie_name in actor_node.movies_starred_in:
+            if movie_name in movies:
+                movie_listed_by = listed_by.setdefault(movie_name, [])
+                if not movie_listed_by or movie_listed_by[-1] != actor_name:
+                    movie_listed_by.append(actor_name)
+
+    records = [(movie_name, movie_node.year_released, movie_node.gross_value, list(movie_node.actors),
+                listed_by.get(movie_name, [])) for movie_name, movie_node in movies.items()]
+    shard_size = max(1, -(-len(records) // (num_workers * 4)))
+    shards = [records[i:i + shard_size] for i in range(0, len(records), shard_size)]
+    actor_details = {actor_name: (actor_node.age, actor_node.gross_value) for actor_name, actor_node in actors.items()}
+    with ProcessPoolExecutor(num_workers, initializer=_init_graph_worker, initargs=(actor_details,)) as executor:
+        results = [result for shard_results in executor.map(_build_movie_shard, shards,
+                                                            [edge_weight_func] * len(shards))
+                   for result in shard_results]
+
+    # Edges of the ACTORS to their own MOVIES come first, in the order of their portfolio
+    actor_edges = {}
+    for actor_name, actor_node in actors.items():
+        actor_edges[actor_name] = {}
+        for movie_name in actor_node.movies_starred_in:
+            if movie_name in movies:
+                actor_edges[actor_name][movie_name] = None
+    # Then the edges to MOVIES listing them, in the order of the movies dictionary
+    for (movie_name, movie_node), (new_cast, edge_names, edge_weights) in zip(movies.items(), results):
+        movie_node.actors.extend(new_cast)
+        movie_node.edges = [actors[actor_name] for actor_name in edge_names]
+        movie_node.edge_weights = edge_weights
+        for actor_name, edge_weight in zip(edge_names, edge_weights):
+            if movie_name not in actor_edges[actor_name]:
+                actors[actor_name].movies_starred_in.append(movie_name)  # Can't be in the portfolio yet
+            actor_edges[actor_name][movie_name] = edge_weight
+    for actor_name, actor_node in actors.items():
+        actor_node.edges = [movies[movie_name] for movie_name in actor_edges[actor_name]]
+        actor_node.edge_weights = list(actor_edges[actor_name].values())
+
+    if component_tracker is not None:
+        component_tracker.track_graph(actors, movies)
+    return actors, movies
+
+
 def assign_weights_to_edges(movies, edge_weight_func=calc_edge_weights):
     """
     Utility function to assign weights to all the edges between the Movie Nodes
@@ -282,12 +411,13 @@ def assign_weights_to_edges(movies, edge_weight_func=calc_edge_weights):
             actor_node.add_edge(movie_node, edge_weights[i])
 
 
-def make_edges_from_movies_to_actors(actors, movies):
+def make_edges_from_movies_to_actors(actors, movies, component_tracker=None):
     """
     Utility function to draw edges between MOVIES and ACTORS that have starred in them,
     if one doesn't already exist.
     :param actors: Dictionary (name of actor --> Actor node)
     :param movies: Dictionary (name of the movie --> Movie Node for the movie)
+    :param component_tracker: Optional Components.ComponentTracker to record the edges in
     :return: Nothing.
     """
     for movie_name, movie_node in movies.items():
@@ -300,14 +430,17 @@ def make_edges_from_movies_to_actors(actors, movies):
                     actors[actor_name].add_movie(movie_name)
                 # Add the edge in the Actor Node as well
                 actors[actor_name].add_edge(movie_node, movie_node.gross_value)
+                if component_tracker is not None:
+                    component_tracker.add_edge(actor_name, movie_name)
 
 
-def make_edges_from_actors_to_movies(actors, movies):
+def make_edges_from_actors_to_movies(actors, movies, component_tracker=None):
     """
     Utility function to draw edges between ACTORS and the MOVIES they have starred in,
     if one doesn't already exist.
     :param actors: Dictionary (name of actor --> Actor node)
     :param movies: Dictionary (name of the movie --> Movie Node for the movie)
+    :param component_tracker: Optional Components.ComponentTracker to record the edges in
     :return: Nothing.
     """
     for actor_name, actor_node in actors.items():
@@ -320,6 +453,8 @@ def make_edges_from_actors_to_movies(actors, movies):
                     movies[movie_name].add_actor(actor_name)
                 # Add the edge in the Movie Node as well
                 movies[movie_name].add_edge(actor_node, movies[movie_name].gross_value)
+                if component_tracker is not None:
+                    component_tracker.add_edge(actor_name, movie_name)
 
 
 # QUERIES
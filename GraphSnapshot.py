@@ -0,0 +1,357 @@
+import json
+import mmap
+import os
+import struct
+import numpy as np
+from venv.Graph import Actor, Movie
+
+"""
+Binary snapshot format for the Actor/Movie graph.
+
+Layout (little-endian):
+    header:   magic (8s), version (I), flags (I), num_actors (Q), num_movies (Q), num_strings (Q)
+    sections: NUM_SECTIONS x (offset (Q), length in bytes (Q))
+    data:     every section, 8-byte aligned, in the order of SECTIONS
+
+Nodes are numbered actors first (0 .. num_actors-1) followed by the movies. Keys (the names
+the nodes are stored under in the dictionaries), names and the movies_starred_in/actors lists
+are stored as ids into a shared string table, and both the lists and the edges are stored in
+CSR form (an indptr array per node plus a flat array). Ages/years and gross values are stored
+as 8 bytes and a type (int, float, None, or JSON for anything else, as a string id), so they
+are restored with the type they had.
+Every array can be viewed directly from a memory map of the file, so loading a snapshot
+does not copy or parse anything until nodes are actually materialized.
+"""
+
+MAGIC = b'HWGSNAP\x00'
+VERSION = 2
+# Types of the values stored in node_numbers/node_gross, kept in number_types/gross_types
+TYPE_NONE = 0
+TYPE_INT = 1  # The value itself
+TYPE_FLOAT = 2  # The bits of the float
+TYPE_JSON = 3  # Id of the JSON of the value in the string table (e.g. for strings or very large ints)
+
+HEADER_FORMAT = '<8sIIQQQ'
+SECTION_FORMAT = '<QQ'
+SECTIONS = [('string_offsets', np.int64),   # num_strings + 1 offsets into string_data
+            ('string_data', np.uint8),      # utf-8 encoded strings, back to back
+            ('node_keys', np.int32),        # string id of the key of every node
+            ('node_names', np.int32),       # string id of the name of every node
+            ('node_numbers', np.int64),     # age of actors, year of release of movies
+            ('number_types', np.uint8),
+            ('node_gross', np.int64),       # gross value of every node
+            ('gross_types', np.uint8),
+            ('list_indptr', np.int64),      # CSR over movies_starred_in (actors) / actors (movies)
+            ('list_ids', np.int32),
+            ('edge_indptr', np.int64),      # CSR over the edges of every node
+            ('edge_targets', np.int32),
+            ('edge_weights', np.float64)]
+NUM_SECTIONS = len(SECTIONS)
+DATA_START = struct.calcsize(HEADER_FORMAT) + NUM_SECTIONS * struct.calcsize(SECTION_FORMAT)
+
+
+INT64_MIN, INT64_MAX = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+
+
+def _to_snapshot_value(value, string_id) -> (int, int):
+    """
+    Utility function to convert an age/year or a gross value to what is stored in the snapshot.
+    :param value: The value on the node
+    :param string_id: Function adding a string to the string table and returning its id
+    :return: The type of the value and its 8 bytes, as an int
+    """
+    if value is None:
+        return TYPE_NONE, 0
+    if isinstance(value, int) and not isinstance(value, bool) and INT64_MIN <= value <= INT64_MAX:
+        return TYPE_INT, value
+    if isinstance(value, float):
+        return TYPE_FLOAT, struct.unpack('<q', struct.pack('<d', value))[0]
+    try:
+        return TYPE_JSON, string_id(json.dumps(value))
+    except (TypeError, ValueError):
+        return TYPE_NONE, 0  # Can't be represented
+
+
+def _from_snapshot_value(value_type: int, value: int, names):
+    """
+    Utility function to convert a value stored by _to_snapshot_value back.
+    :param value_type: The type of the value
+    :param value: Its 8 bytes, as an int
+    :param names: The string table
+    :return: The value
+    """
+    if value_type == TYPE_INT:
+        return value
+    if value_type == TYPE_FLOAT:
+        return struct.unpack('<d', struct.pack('<q', value))[0]
+    if value_type == TYPE_JSON:
+        return json.loads(names[value])
+    return None
+
+
+def save_snapshot(actors: dict, movies: dict, filename: str = 'graph.snap') -> str:
+    """
+    Utility function to store the given ACTORS and MOVIES (and the edges between them,
+    if the graph has been made) in a binary snapshot file. The file is written next to
+    its final location and then renamed, so readers never see a half-written snapshot.
+    Values that can't be written as JSON are stored as missing.
+    :param actors: Dictionary (Actor name --> Actor Node)
+    :param movies: Dictionary (Movie name --> Movie Node)
+    :param filename: File to store the snapshot in
+    :return: Name of the file the snapshot was stored in
+    """
+    strings = {}
+
+    def string_id(string):
+        if string not in strings:
+            strings[string] = len(strings)
+        return strings[string]
+
+    keys = list(actors) + list(movies)
+    nodes = list(actors.values()) + list(movies.values())
+    # Edges are found by node, or else by name, for edges to an older copy of a node
+    actor_index = {node.name: i for i, node in reversed(list(enumerate(nodes[:len(actors)])))}
+    movie_index = {node.name: len(actors) + i for i, node in reversed(list(enumerate(nodes[len(actors):])))}
+    node_index = {id(node): i for i, node in enumerate(nodes)}
+
+    node_keys = np.empty(len(nodes), dtype=np.int32)
+    node_names = np.empty(len(nodes), dtype=np.int32)
+    node_numbers = np.empty(len(nodes), dtype=np.int64)
+    number_types = np.empty(len(nodes), dtype=np.uint8)
+    node_gross = np.empty(len(nodes), dtype=np.int64)
+    gross_types = np.empty(len(nodes), dtype=np.uint8)
+    list_indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    edge_indptr = np.zeros(len(nodes) + 1, dtype=np.int64)
+    list_ids, edge_targets, edge_weights = [], [], []
+
+    for i, node in enumerate(nodes):
+        is_actor = i < len(actors)
+        node_keys[i] = string_id(keys[i])
+        node_names[i] = string_id(node.name)
+        number_types[i], node_numbers[i] = _to_snapshot_value(node.age if is_actor else node.year_released,
+                                                              string_id)
+        gross_types[i], node_gross[i] = _to_snapshot_value(node.gross_value, string_id)
+        for name in (node.movies_starred_in if is_actor else node.actors):
+            list_ids.append(string_id(name))
+        list_indptr[i + 1] = len(list_ids)
+        for other_node, edge_weight in zip(node.edges, node.edge_weights):
+            # Actors only have edges to movies and vice versa. Edges to nodes outside
+            # of the given dictionaries can't be represented.
+            other_index = movie_index if is_actor else actor_index
+            target = node_index.get(id(other_node), other_index.get(other_node.name))
+            if target is not None:
+                edge_targets.append(target)
+                edge_weights.append(float(edge_weight) if isinstance(edge_weight, (int, float)) else np.nan)
+        edge_indptr[i + 1] = len(edge_targets)
+
+    encoded_strings = [string.encode('utf-8') for string in strings]
+    string_offsets = np.zeros(len(encoded_strings) + 1, dtype=np.int64)
+    string_offsets[1:] = np.cumsum([len(string) for string in encoded_strings], dtype=np.int64)
+
+    arrays = {'string_offsets': string_offsets,
+              'string_data': np.frombuffer(b''.join(encoded_strings), dtype=np.uint8),
+              'node_keys': node_keys,
+              'node_names': node_names,
+              'node_numbers': node_numbers,
+              'number_types': number_types,
+              'node_gross': node_gross,
+              'gross_types': gross_types,
+              'list_indptr': list_indptr,
+              'list_ids': np.asarray(list_ids, dtype=np.int32),
+              'edge_indptr': edge_indptr,
+              'edge_targets': np.asarray(edge_targets, dtype=np.int32),
+              'edge_weights': np.asarray(edge_weights, dtype=np.float64)}
+
+    temp_filename = filename + '.tmp'
+    with open(temp_filename, 'wb') as file:
+        file.write(b'\x00' * DATA_START)  # Header is written once the offsets are known
+        section_table = []
+        for section_name, dtype in SECTIONS:
+            file.write(b'\x00' * (-file.tell() % 8))  # Keep every section 8-byte aligned
+            data = np.ascontiguousarray(arrays[section_name], dtype=dtype).tobytes()
+            section_table.append((file.tell(), len(data)))
+            file.write(data)
+        file.seek(0)
+        file.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, 0, len(actors), len(movies), len(encoded_strings)))
+        for offset, length in section_table:
+            file.write(struct.pack(SECTION_FORMAT, offset, length))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_filename, filename)
+    return filename
+
+
+class GraphSnapshot:
+    """
+    Read-only view of a binary graph snapshot. The file is memory-mapped and every
+    table is exposed as a numpy array backed directly by the mapping, so opening a
+    snapshot is near-instant and several processes share the same physical pages.
+    Actor and Movie nodes are only built when asked for.
+    @author sahil1105
+    """
+
+    def __init__(self, filename: str = 'graph.snap'):
+        """
+        Constructor for a GraphSnapshot. Maps the file and validates its header.
+        :param filename: Snapshot file to open
+        """
+        self.filename = filename
+        with open(filename, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, num_actors, num_movies, num_strings = struct.unpack_from(HEADER_FORMAT, self._mmap, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError("{} is not a graph snapshot.".format(filename))
+        if version != VERSION:
+            self.close()
+            raise ValueError("Unsupported graph snapshot version {} in {}.".format(version, filename))
+        self.num_actors = num_actors
+        self.num_movies = num_movies
+        self.num_strings = num_strings
+
+        section_offset = struct.calcsize(HEADER_FORMAT)
+        for section_name, dtype in SECTIONS:
+            offset, length = struct.unpack_from(SECTION_FORMAT, self._mmap, section_offset)
+            section_offset += struct.calcsize(SECTION_FORMAT)
+            setattr(self, section_name, np.frombuffer(self._mmap, dtype=dtype,
+                                                      count=length // np.dtype(dtype).itemsize, offset=offset))
+            if section_name == 'string_data':
+                self._string_data_start = offset
+        self._name_index = None
+
+    def close(self):
+        """
+        Unmaps the snapshot. The arrays of this snapshot must not be used afterwards.
+        :return: Nothing.
+        """
+        for section_name, _ in SECTIONS:
+            if hasattr(self, section_name):
+                delattr(self, section_name)  # Release the views, else the mapping can't be closed
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def get_string(self, string_id: int) -> str:
+        """
+        Get a string out of the string table.
+        :param string_id: Id of the string
+        :return: The decoded string
+        """
+        start = self._string_data_start + int(self.string_offsets[string_id])
+        end = self._string_data_start + int(self.string_offsets[string_id + 1])
+        return self._mmap[start:end].decode('utf-8')
+
+    def get_node_name(self, node_index: int) -> str:
+        """
+        Get the name of the node at the given index.
+        :param node_index: Index of the node (actors first, then movies)
+        :return: Name of the node
+        """
+        return self.get_string(self.node_names[node_index])
+
+    def get_node_key(self, node_index: int) -> str:
+        """
+        Get the key (the name it is stored under in the dictionaries) of the node at the given index.
+        :param node_index: Index of the node (actors first, then movies)
+        :return: Key of the node
+        """
+        return self.get_string(self.node_keys[node_index])
+
+    def find_node(self, name: str, is_actor: bool = True) -> int:
+        """
+        Find the index of the actor or movie stored under the given key. The key index is built
+        the first time this is called.
+        :param name: Key of the node
+        :param is_actor: True to look for an actor, False to look for a movie
+        :return: Index of the node, or -1 if there is no such node
+        """
+        if self._name_index is None:
+            names = self._all_strings()
+            self._name_index = ({names[s]: i for i, s in enumerate(self.node_keys[:self.num_actors])},
+                                {names[s]: self.num_actors + i
+                                 for i, s in enumerate(self.node_keys[self.num_actors:])})
+        return self._name_index[0 if is_actor else 1].get(name, -1)
+
+    def _all_strings(self) -> list:
+        """
+        Utility function to decode the whole string table.
+        :return: List of strings, indexed by string id
+        """
+        data = self.string_data.tobytes()
+        offsets = self.string_offsets.tolist()
+        return [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(self.num_strings)]
+
+    def _make_node(self, node_index: int, names: list):
+        """
+        Utility function to build the Actor or Movie node at the given index, without edges.
+        :param node_index: Index of the node
+        :param names: Decoded string table
+        :return: Actor or Movie node
+        """
+        number = _from_snapshot_value(int(self.number_types[node_index]), int(self.node_numbers[node_index]), names)
+        gross_value = _from_snapshot_value(int(self.gross_types[node_index]), int(self.node_gross[node_index]), names)
+        names_list = [names[s] for s in self.list_ids[self.list_indptr[node_index]:self.list_indptr[node_index + 1]]]
+        if node_index < self.num_actors:
+            node = Actor(names[self.node_names[node_index]], number, gross_value)
+            node.movies_starred_in = names_list
+        else:
+            node = Movie(names[self.node_names[node_index]], number, gross_value)
+            node.actors = names_list
+        return node
+
+    def get_node(self, node_index: int):
+        """
+        Build the Actor or Movie node at the given index. Edges are not attached since
+        the nodes on the other side are not materialized, use to_dicts for the full graph.
+        :param node_index: Index of the node (actors first, then movies)
+        :return: Actor or Movie node
+        """
+        return self._make_node(node_index, _LazyStringTable(self))
+
+    def to_dicts(self, with_edges: bool = True) -> (dict, dict):
+        """
+        Convert the snapshot back to the ACTORS and MOVIES dictionaries.
+        :param with_edges: True to also restore the edges and edge weights between the nodes
+        :return: Dict (Actor Name --> Actor Node), Dict (Movie Name --> Movie Node)
+        """
+        names = self._all_strings()
+        nodes = [self._make_node(i, names) for i in range(self.num_actors + self.num_movies)]
+        if with_edges:
+            edge_indptr = self.edge_indptr.tolist()
+            edge_targets = self.edge_targets.tolist()
+            edge_weights = self.edge_weights.tolist()
+            for i, node in enumerate(nodes):
+                start, end = edge_indptr[i], edge_indptr[i + 1]
+                node.edges = [nodes[target] for target in edge_targets[start:end]]
+                node.edge_weights = edge_weights[start:end]
+        keys = [names[s] for s in self.node_keys.tolist()]
+        actors = dict(zip(keys[:self.num_actors], nodes[:self.num_actors]))
+        movies = dict(zip(keys[self.num_actors:], nodes[self.num_actors:]))
+        return actors, movies
+
+
+class _LazyStringTable:
+    """
+    Indexable stand-in for the decoded string table that decodes strings on access.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def __getitem__(self, string_id):
+        return self.snapshot.get_string(string_id)
+
+
+def load_snapshot(filename: str = 'graph.snap', with_edges: bool = True) -> (dict, dict):
+    """
+    Utility function to rebuild the ACTORS and MOVIES dictionaries from a snapshot file.
+    :param filename: Snapshot file to load
+    :param with_edges: True to also restore the edges between the nodes
+    :return: Dict (Actor Name --> Actor Node), Dict (Movie Name --> Movie Node)
+    """
+    with GraphSnapshot(filename) as snapshot:
+        return snapshot.to_dicts(with_edges)
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+from venv.Graph import Actor, Movie, make_graph
+from venv.GraphSnapshot import GraphSnapshot, save_snapshot, load_snapshot
+
+
+class TestGraphSnapshot(unittest.TestCase):
+    """
+    Unit Tests for the binary graph snapshot format.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Sets up a small graph and a file to store it in.
+        :return: self
+        """
+        brubaker = Movie('Brubaker', 1980, 37121708.0)
+        brubaker.actors = ['Robert Redford', 'Morgan Freeman', 'Yaphet Kotto']
+        amelie = Movie('Amélie', 2001, None)
+        amelie.actors = ['Audrey Tautou']
+        freeman = Actor('Morgan Freeman', 80, 1234.5)
+        freeman.movies_starred_in = ['Brubaker', 'Glory']
+        redford = Actor('Robert Redford', None)
+        redford.movies_starred_in = ['Brubaker']
+        self.actors, self.movies = make_graph({'Morgan Freeman': freeman, 'Robert Redford': redford},
+                                              {'Brubaker': brubaker, 'Amélie': amelie})
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'graph.snap')
+
+    def tearDown(self):
+        """
+        Removes the snapshot file.
+        :return: self
+        """
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """
+        Tests that a graph is restored with the same attributes, lists, edges and weights.
+        :return: self
+        """
+        save_snapshot(self.actors, self.movies, self.filename)
+        actors, movies = load_snapshot(self.filename)
+        self.assertEqual(list(actors), list(self.actors))
+        self.assertEqual(list(movies), list(self.movies))
+        for original_dict, loaded_dict in [(self.actors, actors), (self.movies, movies)]:
+            for name, node in original_dict.items():
+                loaded_node = loaded_dict[name]
+                self.assertEqual(type(loaded_node), type(node))
+                self.assertEqual(loaded_node.gross_value, node.gross_value)
+                self.assertEqual([other.name for other in loaded_node.edges], [other.name for other in node.edges])
+                self.assertEqual(loaded_node.edge_weights, node.edge_weights)
+        self.assertEqual(actors['Morgan Freeman'].movies_starred_in, ['Brubaker', 'Glory'])
+        self.assertEqual(actors['Robert Redford'].age, None)
+        self.assertEqual(movies['Amélie'].year_released, 2001)
+        self.assertEqual(movies['Brubaker'].actors, ['Robert Redford', 'Morgan Freeman', 'Yaphet Kotto'])
+        # Edges should point at the restored nodes themselves
+        self.assertIs(actors['Morgan Freeman'].edges[0], movies['Brubaker'])
+
+    def test_round_trip_keeps_values(self):
+        """
+        Tests that keys and values of every type come back unchanged, e.g. of nodes made by the API.
+        :return: self
+        """
+        actors = {'Int Gross': Actor('Int Gross', 61, 562709189), 'Float Age': Actor('Float Age', 40.5, 1234.5),
+                  'Posted A': Actor('', 33, ''), 'Posted B': Actor('', None, 2 ** 70)}
+        movies = {'Posted C': Movie('', 2001.0, None), 'Odd Year': Movie('Odd Year', 'unknown', 10)}
+        save_snapshot(actors, movies, self.filename)
+
+        def values(nodes):
+            return {key: [(type(value), value) for value in (node.name, getattr(node, 'age', None),
+                                                             getattr(node, 'year_released', None), node.gross_value)]
+                    for key, node in nodes.items()}
+        loaded_actors, loaded_movies = load_snapshot(self.filename)
+        self.assertEqual(values(loaded_actors), values(actors))
+        self.assertEqual(values(loaded_movies), values(movies))
+
+    def test_lazy_access(self):
+        """
+        Tests that single nodes can be read out of the mapped snapshot.
+        :return: self
+        """
+        save_snapshot(self.actors, self.movies, self.filename)
+        with GraphSnapshot(self.filename) as snapshot:
+            self.assertEqual(snapshot.num_actors, 2)
+            self.assertEqual(snapshot.num_movies, 2)
+            index = snapshot.find_node('Amélie', is_actor=False)
+            self.assertEqual(snapshot.get_node_name(index), 'Amélie')
+            self.assertEqual(snapshot.get_node(index).actors, ['Audrey Tautou'])
+            self.assertEqual(snapshot.find_node('Amélie'), -1)
+
+    def test_invalid_file(self):
+        """
+        Tests that files that aren't snapshots are rejected.
+        :return: self
+        """
+        with open(self.filename, 'wb') as file:
+            file.write(b'[{}]' * 100)
+        self.assertRaises(ValueError, GraphSnapshot, self.filename)
+
+
+if __name__ == '__main__':
+    unittest.main()
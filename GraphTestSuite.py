@@ -1,3 +1,4 @@
+import random
 import unittest
 import WebScraper
 import Graph
@@ -157,6 +158,54 @@ class TestGraphMethods(unittest.TestCase):
         self.assertEqual(set(Graph.get_actors_in_a_year(self.movies, 1994)), set([]))
 
 
+class TestParallelGraph(unittest.TestCase):
+    """
+    Unit Test Class to test that the parallel graph construction matches make_graph.
+    @author sahil1105
+    """
+
+    @staticmethod
+    def make_nodes(seed):
+        """
+        Makes a random set of ACTORS and MOVIES, whose lists also refer to nodes that don't exist.
+        :param seed: Seed for the random generator
+        :return: Dict (Actor Name --> Actor Node), Dict (Movie Name --> Movie Node)
+        """
+        rng = random.Random(seed)
+        actor_names = ['Actor {}'.format(i) for i in range(80)]
+        movie_names = ['Movie {}'.format(i) for i in range(40)]
+        actors, movies = {}, {}
+        for name in actor_names[:60]:
+            actors[name] = Graph.Actor(name, rng.randint(20, 90))
+            actors[name].movies_starred_in = rng.sample(movie_names, rng.randint(0, 6))
+        for name in movie_names[:30]:
+            movies[name] = Graph.Movie(name, rng.randint(1950, 2018), float(rng.randint(0, 10**8)))
+            movies[name].actors = rng.sample(actor_names, rng.randint(0, 8))
+        return actors, movies
+
+    def test_make_graph_parallel(self):
+        """
+        Tests that the parallel build gives exactly the same lists, edges and weights as make_graph.
+        :return: self
+        """
+        for seed in range(3):
+            serial_actors, serial_movies = Graph.make_graph(*self.make_nodes(seed))
+            actors, movies = Graph.make_graph(*self.make_nodes(seed), num_workers=2)
+            for serial_dict, parallel_dict in [(serial_actors, actors), (serial_movies, movies)]:
+                self.assertEqual(list(serial_dict), list(parallel_dict))
+                for name, serial_node in serial_dict.items():
+                    node = parallel_dict[name]
+                    self.assertEqual([edge.name for edge in node.edges], [edge.name for edge in serial_node.edges])
+                    self.assertEqual(node.edge_weights, serial_node.edge_weights)
+                    self.assertEqual(getattr(node, 'actors', None), getattr(serial_node, 'actors', None))
+                    self.assertEqual(getattr(node, 'movies_starred_in', None),
+                                     getattr(serial_node, 'movies_starred_in', None))
+            # Edges must point at the nodes of the dictionaries
+            for actor_node in actors.values():
+                for movie_node in actor_node.edges:
+                    self.assertIs(movie_node, movies[movie_node.name])
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,133 @@
+import json
+import math
+import threading
+
+try:
+    import orjson  # Optional, several times faster than the json module
+except ImportError:
+    orjson = None
+
+"""
+Reference:
+https://github.com/ijl/orjson
+"""
+
+
+def _floats_agree(obj) -> bool:
+    """
+    Utility function to check whether orjson writes the floats of an object like the json module:
+    it writes NaN and Infinity as null, and leaves the + out of exponents (1e16 for 1e+16), which
+    Python only uses for numbers under 1e-4 or from 1e16 on.
+    :param obj: The object to serialize
+    :return: True if every float is written the same way, False otherwise
+    """
+    if isinstance(obj, float):
+        return math.isfinite(obj) and (obj == 0 or 1e-4 <= abs(obj) < 1e16)
+    if isinstance(obj, dict):
+        obj = obj.values()
+    elif not isinstance(obj, (list, tuple)):
+        return True
+    for value in obj:
+        if type(value) is not str and not _floats_agree(value):
+            return False
+    return True
+
+
+def dumps(obj) -> bytes:
+    """
+    Utility function to serialize an object to compact JSON, byte for byte like jsonify
+    (sorted keys, non-ASCII characters escaped, NaN and Infinity kept), so a resource gets the
+    same body and ETag whichever way it is served. orjson is used if it is installed, unless
+    the object is one it would write differently.
+    :param obj: The object to serialize
+    :return: The JSON as bytes
+    """
+    if orjson is not None and _floats_agree(obj):
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except TypeError:
+            data = None  # e.g. an int that doesn't fit in 64 bits
+        if data is not None and data.isascii() and b'\x7f' not in data:
+            return data
+    return json.dumps(obj, sort_keys=True, separators=(',', ':')).encode('ascii')
+
+
+def join_fragments(fragments) -> bytes:
+    """
+    Utility function to assemble serialized objects into a JSON array without re-encoding them.
+    :param fragments: Iterable of JSON bytes
+    :return: The JSON array as bytes, followed by a newline like jsonify
+    """
+    return b'[' + b','.join(fragments) + b']\n'
+
+
+class FragmentCache:
+    """
+    Cache of the serialized JSON of the nodes of the API, keyed by collection and name, so
+    list responses are assembled out of ready-made fragments instead of encoding every node
+    again. Every projection of a node (see get) is cached separately. A fragment must be
+    invalidated whenever its node changes (WebAPI.record_batch takes care of that for the
+    changes made through the API).
+    @author sahil1105
+    """
+
+    def __init__(self, encoder=dumps):
+        """
+        Constructor for an empty FragmentCache.
+        :param encoder: Function serializing a node __dict__ to JSON bytes
+        """
+        self.encoder = encoder
+        self._fragments = {}  # (collection, name) --> Dict (fields --> JSON bytes)
+        self.generation = 0  # Bumped by every invalidation
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._fragments)
+
+    def get(self, collection: str, name, node_dict: dict, generation: int = None, fields: tuple = None) -> bytes:
+        """
+        Get the serialized JSON of a node, encoding and caching it if needed.
+        :param collection: 'actors' or 'movies'
+        :param name: Key of the node in its collection, or None to encode without caching
+        :param node_dict: The __dict__ of the node, used if it isn't cached yet
+        :param generation: The generation of the cache when node_dict was read, if that was a while
+        ago; the fragment isn't cached if anything was invalidated since. The current one by default.
+        :param fields: Attributes to keep, in a canonical order (e.g. sorted) so projections are shared;
+        None for all of them
+        :return: The JSON bytes
+        """
+        key = (collection, name)
+        projections = self._fragments.get(key)
+        fragment = projections.get(fields) if projections is not None else None
+        if fragment is not None and (generation is None or generation == self.generation):
+            return fragment
+        if generation is None:
+            generation = self.generation
+        if fields is not None:
+            node_dict = {attr: value for attr, value in node_dict.items() if attr in fields}
+        fragment = self.encoder(node_dict)
+        if name is not None:
+            with self._lock:
+                if generation == self.generation:  # Don't cache what a concurrent write has made stale
+                    self._fragments.setdefault(key, {})[fields] = fragment
+        return fragment
+
+    def invalidate(self, collection: str, name):
+        """
+        Drop the fragments of a node that changed or was deleted, of every projection.
+        :param collection: 'actors' or 'movies'
+        :param name: Key of the node in its collection
+        :return: Nothing.
+        """
+        with self._lock:
+            self.generation += 1
+            self._fragments.pop((collection, name), None)
+
+    def clear(self):
+        """
+        Drop all the fragments.
+        :return: Nothing.
+        """
+        with self._lock:
+            self.generation += 1
+            self._fragments.clear()
@@ -0,0 +1,100 @@
+import json
+import unittest
+from flask import Flask, jsonify
+from venv.Graph import Actor
+from venv.JsonFragments import FragmentCache, join_fragments, dumps
+
+
+class TestJsonFragments(unittest.TestCase):
+    """
+    Unit Tests for the cache of serialized nodes of the API.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Creates a cache with an encoder counting its calls.
+        :return: self
+        """
+        self.encoded = []
+
+        def encoder(node_dict):
+            self.encoded.append(node_dict['name'])
+            return dumps(node_dict)
+
+        self.cache = FragmentCache(encoder)
+        self.willis = Actor('Bruce Willis', 61, 562709189)
+
+    def test_fragments_are_reused(self):
+        """
+        Tests that a node is encoded once until it is invalidated.
+        :return: self
+        """
+        fragment = self.cache.get('actors', 'Bruce Willis', self.willis.__dict__)
+        self.assertEqual(json.loads(fragment), self.willis.__dict__)
+        self.assertIs(self.cache.get('actors', 'Bruce Willis', self.willis.__dict__), fragment)
+        self.willis.age = 62
+        self.cache.invalidate('actors', 'Bruce Willis')
+        self.assertEqual(json.loads(self.cache.get('actors', 'Bruce Willis', self.willis.__dict__))['age'], 62)
+        self.assertEqual(self.encoded, ['Bruce Willis', 'Bruce Willis'])
+
+    def test_uncached_and_joined(self):
+        """
+        Tests that unnamed nodes aren't cached and that fragments join into a valid JSON array.
+        :return: self
+        """
+        warden = Actor('Jack Warden', 85, 1234.5)
+        fragments = [self.cache.get('actors', None, warden.__dict__),
+                     self.cache.get('actors', 'Bruce Willis', self.willis.__dict__)]
+        self.assertEqual(len(self.cache), 1)
+        self.assertEqual(json.loads(join_fragments(fragments)), [warden.__dict__, self.willis.__dict__])
+        self.assertEqual(join_fragments([]), b'[]\n')
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+    def test_stale_generation(self):
+        """
+        Tests that a node read before an invalidation is encoded as read, and not cached.
+        :return: self
+        """
+        generation = self.cache.generation
+        old_dict = dict(self.willis.__dict__)
+        self.willis.age = 63
+        self.cache.invalidate('actors', 'Bruce Willis')
+        self.cache.get('actors', 'Bruce Willis', self.willis.__dict__)
+        self.assertEqual(json.loads(self.cache.get('actors', 'Bruce Willis', old_dict, generation))['age'],
+                         old_dict['age'])
+        self.assertEqual(json.loads(self.cache.get('actors', 'Bruce Willis', self.willis.__dict__))['age'], 63)
+
+    def test_projections(self):
+        """
+        Tests that projections of a node are cached separately and invalidated together.
+        :return: self
+        """
+        fields = ('age', 'name')
+        self.assertEqual(json.loads(self.cache.get('actors', 'Bruce Willis', self.willis.__dict__, fields=fields)),
+                         {'name': 'Bruce Willis', 'age': 61})
+        self.cache.get('actors', 'Bruce Willis', self.willis.__dict__, fields=fields)
+        self.cache.get('actors', 'Bruce Willis', self.willis.__dict__)
+        self.assertEqual(self.encoded, ['Bruce Willis', 'Bruce Willis'])
+        self.willis.age = 62
+        self.cache.invalidate('actors', 'Bruce Willis')
+        self.assertEqual(json.loads(self.cache.get('actors', 'Bruce Willis', self.willis.__dict__, fields=fields)),
+                         {'name': 'Bruce Willis', 'age': 62})
+
+
+    def test_matches_jsonify(self):
+        """
+        Tests that objects are serialized to the same bytes as with jsonify, whether orjson is used or not.
+        :return: self
+        """
+        app = Flask(__name__)
+        objects = [self.willis.__dict__, {'b': [1, 2.5], 'a': {'d': None, 'c': True}}, 'Zoë Kravitz', '\x1f\x7f"/',
+                   float('nan'), float('-inf'), 1e16, 1e-05, 0.0001, -0.0, 2 ** 70, [1234.5, 1.7976931348623157e308]]
+        with app.app_context():
+            for obj in objects:
+                self.assertEqual(dumps(obj), jsonify(obj).get_data().rstrip(b'\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
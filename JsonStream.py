@@ -0,0 +1,214 @@
+import codecs
+import json
+import re
+
+"""
+Incremental reader for JSON files laid out like data.json: a list of objects, each of
+which maps names to JSON objects (a single top level object is accepted as well).
+Only one entry is decoded at a time, so a caller that stops iterating early never
+reads the rest of the file.
+"""
+
+CHUNK_SIZE = 1 << 16
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+# A whole string, a run of anything but strings and brackets, or a bracket
+_SKIP_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[^"\[\]{}]+|[\[\]{}]', re.DOTALL)
+
+
+class _JsonReader:
+    """
+    Buffered, position-tracking reader over a binary JSON file. Keeps track of the
+    byte offset of the current position so entries can be located in the file later on.
+    """
+
+    def __init__(self, file, chunk_size: int = CHUNK_SIZE, track_offsets: bool = False):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.track_offsets = track_offsets
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.byte_pos = 0  # Byte offset of self.pos in the file, if offsets are tracked
+        self.eof = False
+        self.keep_from = None  # Position in the buffer to keep when reading more, see peek_key
+
+    def fill(self, min_size: int = 0) -> bool:
+        """
+        Read more of the file into the buffer, dropping the part that has already been consumed.
+        :param min_size: Minimum number of bytes to read
+        :return: True if anything was read, False at the end of the file
+        """
+        if self.eof:
+            return False
+        drop = self.pos if self.keep_from is None else self.keep_from
+        self.buffer = self.buffer[drop:]
+        self.pos -= drop
+        if self.keep_from is not None:
+            self.keep_from = 0
+        data = self.file.read(max(self.chunk_size, min_size))
+        self.buffer += self.decoder.decode(data, final=not data)
+        self.eof = not data
+        return True
+
+    def advance(self, new_pos: int):
+        """
+        Move the current position forward within the buffer.
+        :param new_pos: New position in the buffer
+        :return: Nothing.
+        """
+        if self.track_offsets:
+            self.byte_pos += len(self.buffer[self.pos:new_pos].encode('utf-8'))
+        self.pos = new_pos
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and return the next character without consuming it.
+        :return: The next character, or '' at the end of the file
+        """
+        while True:
+            self.advance(_WHITESPACE.match(self.buffer, self.pos).end())
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char: str):
+        """
+        Consume the given character, skipping whitespace before it.
+        :param char: The character that must come next
+        :return: Nothing.
+        """
+        if self.peek() != char:
+            raise ValueError("Expected '{}' at byte {} of {}".format(char, self.byte_pos, self.file.name))
+        self.advance(self.pos + 1)
+
+    def decode_value(self):
+        """
+        Decode the next JSON value, reading more of the file as needed.
+        :return: The decoded value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+                # A number running into the end of the buffer may be cut short
+                if end < len(self.buffer) or self.eof:
+                    self.advance(end)
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill(len(self.buffer) - self.pos)  # Double the buffer until the value fits
+
+    def skip_value(self):
+        """
+        Move past the next JSON value without decoding it: only the strings and brackets of
+        lists and objects are scanned for, to find where they end.
+        :return: Nothing.
+        """
+        if self.peek() not in '[{':
+            self.decode_value()  # A single number, string, etc.
+            return
+        depth = 0
+        while True:
+            match = _SKIP_TOKEN.match(self.buffer, self.pos)
+            if match is None:  # A string running into the end of the buffer, or the end of the buffer
+                if not self.fill(len(self.buffer) - self.pos):
+                    raise ValueError("Unterminated value at byte {} of {}".format(self.byte_pos, self.file.name))
+                continue
+            token = match.group()
+            self.advance(match.end())
+            if token == '[' or token == '{':
+                depth += 1
+            elif token == ']' or token == '}':
+                depth -= 1
+                if depth == 0:
+                    return
+
+    def peek_key(self, key: str):
+        """
+        Decode the value of a key of the JSON object at the current position, skipping the
+        values before it, without consuming anything.
+        :param key: The key
+        :return: The decoded value, or None if the key isn't in the object or there is no object
+        """
+        if self.peek() != '{':
+            return None
+        self.keep_from, byte_pos = self.pos, self.byte_pos
+        try:
+            self.advance(self.pos + 1)
+            if self.peek() == '}':
+                return None
+            while True:
+                name = self.decode_value()
+                self.expect(':')
+                if name == key:
+                    return self.decode_value()
+                self.skip_value()
+                if self.peek() != ',':
+                    return None
+                self.advance(self.pos + 1)
+        finally:
+            self.pos, self.byte_pos, self.keep_from = self.keep_from, byte_pos, None
+
+
+def _iter_object_entries(reader, json_class: str = None):
+    """
+    Utility generator over the entries of the JSON object at the current position.
+    :param reader: _JsonReader positioned at the start of an object
+    :param json_class: Only yield the entries with this "json_class", skipping the others undecoded
+    :return: Generator of (key, value, start byte, end byte)
+    """
+    reader.expect('{')
+    if reader.peek() == '}':
+        reader.advance(reader.pos + 1)
+        return
+    while True:
+        key = reader.decode_value()
+        reader.expect(':')
+        reader.peek()
+        start = reader.byte_pos
+        if json_class is None or reader.peek_key('json_class') == json_class:
+            value = reader.decode_value()
+            yield key, value, start, reader.byte_pos
+        else:
+            reader.skip_value()
+        if reader.peek() == ',':
+            reader.advance(reader.pos + 1)
+        else:
+            reader.expect('}')
+            return
+
+
+def iter_json_entries(filename: str, chunk_size: int = CHUNK_SIZE, track_offsets: bool = False,
+                      json_class: str = None):
+    """
+    Utility generator to lazily go through the (name, JSON object) entries of a file laid out
+    like data.json. Non-object elements of the top level list are skipped.
+    :param filename: name of the json file
+    :param chunk_size: Number of bytes to read from the file at a time
+    :param track_offsets: True to report the byte range of every value in the file
+    :param json_class: "Actor" or "Movie" to only yield the entries of that class (the others are
+    skipped without being decoded), default: all
+    :return: Generator of (key, value, start byte, end byte). The byte range is only
+    meaningful if track_offsets is True.
+    """
+    with open(filename, 'rb') as file:
+        reader = _JsonReader(file, chunk_size, track_offsets)
+        if reader.peek() == '{':
+            yield from _iter_object_entries(reader, json_class)
+            return
+        reader.expect('[')
+        if reader.peek() == ']':
+            return
+        while True:
+            if reader.peek() == '{':
+                yield from _iter_object_entries(reader, json_class)
+            else:
+                reader.skip_value()
+            if reader.peek() == ',':
+                reader.advance(reader.pos + 1)
+            else:
+                reader.expect(']')
+                return
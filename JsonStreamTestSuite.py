@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+import unittest
+from venv.Graph import Actor, Movie
+from venv.JsonStream import iter_json_entries
+from venv.DataAnalysis import iter_nodes_from_json, extract_from_json
+
+
+class TestJsonStream(unittest.TestCase):
+    """
+    Unit Tests for the incremental JSON loader.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Writes a small file laid out like data.json.
+        :return: self
+        """
+        self.data = [{'Bruce Willis': {'json_class': 'Actor', 'name': 'Bruce Willis', 'age': 61,
+                                       'total_gross': 562709189, 'movies': ['The Jackal']},
+                      'Zoë Kravitz': {'json_class': 'Actor', 'name': 'Zoë Kravitz', 'age': 29,
+                                      'total_gross': 0, 'movies': []},
+                      'Jack Warden': {'json_class': 'Actor', 'name': 'Jack Warden', 'age': 85,
+                                      'total_gross': 1234.5, 'movies': ['The Verdict']}},
+                     {'The Verdict': {'json_class': 'Movie', 'name': 'The Verdict', 'year': 1982,
+                                      'box_office': 54000000, 'actors': ['Jack Warden']},
+                      'The Jackal': {'json_class': 'Movie', 'name': 'The Jackal', 'year': 1997,
+                                     'box_office': 159330280, 'actors': ['Bruce Willis']}}]
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'data.json')
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            json.dump(self.data, file, ensure_ascii=False, indent=2)
+
+    def tearDown(self):
+        """
+        Removes the data file.
+        :return: self
+        """
+        self.directory.cleanup()
+
+    def test_iter_json_entries(self):
+        """
+        Tests that every entry is read, even with tiny reads, and that byte ranges point at the values.
+        :return: self
+        """
+        expected = [(name, json_object) for json_dict in self.data for name, json_object in json_dict.items()]
+        for chunk_size in [1, 7, 4096]:
+            entries = list(iter_json_entries(self.filename, chunk_size, track_offsets=True))
+            self.assertEqual([(key, value) for key, value, _, _ in entries], expected)
+            with open(self.filename, 'rb') as file:
+                contents = file.read()
+            for key, value, start, end in entries:
+                self.assertEqual(json.loads(contents[start:end].decode('utf-8')), value)
+
+    def test_limits(self):
+        """
+        Tests that the limits and class filter are applied, and that reading stops once they are hit.
+        :return: self
+        """
+        actors, movies = extract_from_json(self.filename, 2, 1)
+        self.assertEqual(list(actors), ['Bruce Willis', 'Zoë Kravitz'])
+        self.assertEqual(list(movies), ['The Verdict'])
+        self.assertEqual(type(movies['The Verdict']), Movie)
+        nodes = list(iter_nodes_from_json(self.filename, json_class='Movie'))
+        self.assertEqual([node.name for node in nodes], ['The Verdict', 'The Jackal'])
+        # Corrupt everything after the first two actors, which must then never be read
+        with open(self.filename, 'rb') as file:
+            contents = file.read()
+        with open(self.filename, 'wb') as file:
+            file.write(contents[:contents.index(b'"Jack Warden"')] + b'!!! not json')
+        nodes = list(iter_nodes_from_json(self.filename, 2, json_class='Actor'))
+        self.assertEqual([node.name for node in nodes], ['Bruce Willis', 'Zoë Kravitz'])
+        self.assertEqual(type(nodes[0]), Actor)
+        self.assertEqual(nodes[0].movies_starred_in, ['The Jackal'])
+
+    def test_class_filter_skips_decoding(self):
+        """
+        Tests that entries of the other class are skipped without being decoded, strings with
+        brackets and quotes in them included.
+        :return: self
+        """
+        with open(self.filename, 'w', encoding='utf-8') as file:
+            file.write('[{"Odd Actor": {"name": "a \\\\\\" ]} [{", "movies": [not_json, {"x": "]"}], '
+                       '"json_class": "Actor"},\n "The Verdict": {"json_class": "Movie", "name": "The Verdict", '
+                       '"year": 1982, "box_office": 1, "actors": ["]["]}}, [not_json]]')
+        for chunk_size in [1, 7, 4096]:
+            entries = list(iter_json_entries(self.filename, chunk_size, track_offsets=True, json_class='Movie'))
+            self.assertEqual([(key, value['actors']) for key, value, _, _ in entries], [('The Verdict', [']['])])
+            with open(self.filename, 'rb') as file:
+                self.assertEqual(json.loads(file.read()[entries[0][2]:entries[0][3]].decode('utf-8')), entries[0][1])
+            self.assertRaises(ValueError, list, iter_json_entries(self.filename, chunk_size))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,244 @@
+import json
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import ItemsView, MutableMapping, ValuesView
+from venv.DataAnalysis import get_actor_node_from_json_object, get_movie_node_from_json_object
+from venv.JsonStream import iter_json_entries
+
+DEFAULT_MAX_CACHED = 1024
+
+
+class LazyNodeStore(MutableMapping):
+    """
+    Dictionary (name --> GraphNode) that only keeps the position of every node in the
+    JSON file in memory. Nodes are read from the file and built the first time they are
+    accessed, and at most 'max_cached' of them are kept around (least recently used ones
+    are dropped first). Nodes assigned through the store (store[name] = node) are kept in
+    memory too, up to 'max_assigned' of them; the least recently used ones are then pickled
+    to a temporary spill file and read back from it when needed. A node that is changed
+    in place must be assigned back to the store for the change to survive it being dropped.
+    Going through items() or values() reads the file in one pass without caching anything,
+    so the whole store can be indexed while only one node is in memory at a time.
+    @author sahil1105
+    """
+
+    def __init__(self, filename: str, node_from_json_object, max_cached: int = DEFAULT_MAX_CACHED,
+                 max_assigned: int = DEFAULT_MAX_CACHED):
+        """
+        Constructor for a LazyNodeStore. The store starts out empty, positions of nodes
+        in the file are added with add_location.
+        :param filename: The JSON file the nodes are stored in
+        :param node_from_json_object: Function building a GraphNode out of its json object
+        :param max_cached: Max number of nodes read from the file to keep in memory
+        :param max_assigned: Max number of assigned nodes to keep in memory before spilling them
+        """
+        self.filename = filename
+        self.node_from_json_object = node_from_json_object
+        self.max_cached = max_cached
+        self.max_assigned = max_assigned
+        self._index = {}  # name --> (start byte, end byte) in the file, or None if not from the file
+        self._assigned = OrderedDict()  # name --> node, for nodes assigned through the store, least recently used first
+        self._spilled = {}  # name --> (start byte, end byte) in the spill file, for assigned nodes spilled
+        self._cache = OrderedDict()  # name --> node, least recently used first
+        self._file = open(filename, 'rb')
+        self._spill_file = None  # Created when the first node is spilled
+        self._lock = threading.Lock()
+
+    def add_location(self, name: str, start: int, end: int):
+        """
+        Register where the json object of a node is in the file.
+        :param name: Name of the node
+        :param start: Byte offset of the start of the json object
+        :param end: Byte offset right after the end of the json object
+        :return: Nothing.
+        """
+        self._index[name] = (start, end)
+
+    def _read_node(self, name: str, location: tuple):
+        """
+        Utility function to read a node from the file and cache it.
+        :param name: Name of the node
+        :param location: (start byte, end byte) of the node's json object
+        :return: The GraphNode
+        """
+        start, end = location
+        with self._lock:
+            self._file.seek(start)
+            data = self._file.read(end - start)
+        node = self.node_from_json_object(json.loads(data.decode('utf-8')))
+        with self._lock:
+            self._cache_node(name, node)
+        return node
+
+    def _cache_node(self, name: str, node):
+        """
+        Utility function to keep a node read back in the cache. Must be called with the lock held.
+        :return: Nothing.
+        """
+        self._cache[name] = node
+        if len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+
+    def _spill(self):
+        """
+        Utility function to write the least recently used assigned node to the spill file and drop
+        it from memory. Must be called with the lock held.
+        :return: Nothing.
+        """
+        name, node = self._assigned.popitem(last=False)
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(prefix='lazy-spill-')
+        data = pickle.dumps(node, pickle.HIGHEST_PROTOCOL)
+        self._spill_file.seek(0, 2)
+        start = self._spill_file.tell()
+        self._spill_file.write(data)
+        self._spilled[name] = (start, start + len(data))
+
+    def _read_spilled(self, name: str):
+        """
+        Utility function to read an assigned node back from the spill file and cache it. Must be
+        called with the lock held.
+        :param name: Name of the node
+        :return: The GraphNode
+        """
+        start, end = self._spilled[name]
+        self._spill_file.seek(start)
+        node = pickle.loads(self._spill_file.read(end - start))
+        self._cache_node(name, node)
+        return node
+
+    def __getitem__(self, name):
+        with self._lock:
+            if name in self._assigned:
+                self._assigned.move_to_end(name)
+                return self._assigned[name]
+            if name in self._cache:
+                self._cache.move_to_end(name)
+                return self._cache[name]
+            if name in self._spilled:
+                return self._read_spilled(name)
+        location = self._index.get(name)
+        if location is None:
+            raise KeyError(name)
+        return self._read_node(name, location)
+
+    def __setitem__(self, name, node):
+        if name not in self._index:
+            self._index[name] = None
+        with self._lock:
+            self._spilled.pop(name, None)
+            self._cache.pop(name, None)
+            self._assigned[name] = node
+            self._assigned.move_to_end(name)
+            if len(self._assigned) > self.max_assigned:
+                self._spill()
+
+    def __delitem__(self, name):
+        del self._index[name]
+        with self._lock:
+            self._assigned.pop(name, None)
+            self._spilled.pop(name, None)
+            self._cache.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def items(self):
+        return _StreamedItems(self)
+
+    def values(self):
+        return _StreamedValues(self)
+
+    def stream_items(self):
+        """
+        Go through the nodes in order, reading the ones that aren't in memory from the file
+        one after the other. Nodes read for this are not cached.
+        :return: Generator of (name, GraphNode)
+        """
+        with open(self.filename, 'rb') as file:  # Own handle, so lookups can go on meanwhile
+            for name, location in list(self._index.items()):
+                with self._lock:
+                    node = self._assigned.get(name, self._cache.get(name))
+                    if node is None and name in self._spilled:
+                        start, end = self._spilled[name]
+                        self._spill_file.seek(start)
+                        node = pickle.loads(self._spill_file.read(end - start))
+                if node is None and location is not None:
+                    file.seek(location[0])
+                    node = self.node_from_json_object(json.loads(file.read(location[1] - location[0]).decode('utf-8')))
+                if node is not None:
+                    yield name, node
+
+    def num_materialized(self) -> int:
+        """
+        Get the number of nodes currently held in memory.
+        :return: Number of cached and assigned nodes
+        """
+        return len(self._cache) + len(self._assigned)
+
+    def close(self):
+        """
+        Closes the underlying file and the spill file. Nodes that are only in them can't be read afterwards.
+        :return: Nothing.
+        """
+        self._file.close()
+        if self._spill_file is not None:
+            self._spill_file.close()
+
+
+class _StreamedItems(ItemsView):
+    """
+    Items of a LazyNodeStore, iterated with stream_items.
+    """
+
+    def __iter__(self):
+        return self._mapping.stream_items()
+
+
+class _StreamedValues(ValuesView):
+    """
+    Values of a LazyNodeStore, iterated with stream_items.
+    """
+
+    def __iter__(self):
+        return (node for _, node in self._mapping.stream_items())
+
+
+def extract_lazily_from_json(filename: str = 'data.json', max_num_actors: int = sys.maxsize,
+                             max_num_movies: int = sys.maxsize,
+                             max_cached: int = DEFAULT_MAX_CACHED) -> (LazyNodeStore, LazyNodeStore):
+    """
+    Utility function to index the Movies and Actors in the given JSON file without building them.
+    Drop-in replacement for DataAnalysis.extract_from_json for datasets that don't fit in memory.
+    :param filename: name of the json file
+    :param max_num_actors: max number of ACTORS to index, default: no limit
+    :param max_num_movies: max number of MOVIES to index, default: no limit
+    :param max_cached: Max number of nodes of each kind to keep in memory
+    :return: LazyNodeStore (Actor Name --> Actor Node), LazyNodeStore (Movie Name --> Movie Node)
+    """
+    actors = LazyNodeStore(filename, get_actor_node_from_json_object, max_cached)
+    movies = LazyNodeStore(filename, get_movie_node_from_json_object, max_cached)
+    if max_num_actors <= 0 and max_num_movies <= 0:
+        return actors, movies
+
+    num_actors_added = 0
+    num_movies_added = 0
+    for _, json_object, start, end in iter_json_entries(filename, track_offsets=True):
+        if json_object['json_class'] == "Actor" and num_actors_added < max_num_actors:
+            actors.add_location(json_object['name'], start, end)
+            num_actors_added += 1
+        elif json_object['json_class'] == "Movie" and num_movies_added < max_num_movies:
+            movies.add_location(json_object['name'], start, end)
+            num_movies_added += 1
+        if num_actors_added >= max_num_actors and num_movies_added >= max_num_movies:
+            break
+    return actors, movies
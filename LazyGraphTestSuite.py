@@ -0,0 +1,99 @@
+import json
+import os
+import tempfile
+import unittest
+from venv.Graph import Actor, Movie
+from venv.LazyGraph import extract_lazily_from_json
+
+
+class TestLazyGraph(unittest.TestCase):
+    """
+    Unit Tests for the lazily materialized node stores.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Writes a small file laid out like data.json and indexes it.
+        :return: self
+        """
+        actors = {'Actor {}'.format(i): {'json_class': 'Actor', 'name': 'Actor {}'.format(i), 'age': 20 + i,
+                                         'total_gross': i * 1000, 'movies': ['Movie {}'.format(i)]}
+                  for i in range(10)}
+        movies = {'Movie {}'.format(i): {'json_class': 'Movie', 'name': 'Movie {}'.format(i), 'year': 1990 + i,
+                                         'box_office': i * 1000, 'actors': ['Actor {}'.format(i)]}
+                  for i in range(5)}
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'data.json')
+        with open(self.filename, 'w') as file:
+            json.dump([actors, movies], file)
+        self.actors, self.movies = extract_lazily_from_json(self.filename, 8, max_cached=3)
+
+    def tearDown(self):
+        """
+        Closes the stores and removes the data file.
+        :return: self
+        """
+        self.actors.close()
+        self.movies.close()
+        self.directory.cleanup()
+
+    def test_lazy_access(self):
+        """
+        Tests that nodes are only built on access and that the cache stays bounded.
+        :return: self
+        """
+        self.assertEqual(len(self.actors), 8)
+        self.assertEqual(len(self.movies), 5)
+        self.assertEqual(self.actors.num_materialized(), 0)
+        self.assertIn('Actor 7', self.actors)
+        self.assertNotIn('Actor 8', self.actors)
+        actor = self.actors['Actor 3']
+        self.assertEqual(type(actor), Actor)
+        self.assertEqual((actor.age, actor.gross_value, actor.movies_starred_in), (23, 3000, ['Movie 3']))
+        self.assertIs(self.actors['Actor 3'], actor)  # Served from the cache
+        self.assertEqual(type(self.movies['Movie 4']), Movie)
+        # A pass over the whole store reads the file in order without caching anything
+        self.assertEqual([node.age for node in self.actors.values()], list(range(20, 28)))
+        self.assertEqual(dict(self.actors.items())['Actor 5'].age, 25)
+        self.assertEqual(self.actors.num_materialized(), 1)
+        for name in list(self.actors):
+            self.actors[name]
+        self.assertEqual(self.actors.num_materialized(), 3)
+        self.assertRaises(KeyError, lambda: self.actors['Actor 9'])
+
+    def test_writes(self):
+        """
+        Tests that assigned nodes survive eviction and that deleted nodes are gone.
+        :return: self
+        """
+        actor = self.actors['Actor 1']
+        actor.age = 99
+        self.actors['Actor 1'] = actor
+        self.actors['Mila Kunis'] = Actor('Mila Kunis', 31)
+        for name in list(self.actors):
+            self.actors[name]
+        self.assertEqual(self.actors['Actor 1'].age, 99)
+        self.assertEqual(list(self.actors)[-1], 'Mila Kunis')
+        del self.actors['Actor 2']
+        self.assertNotIn('Actor 2', self.actors)
+        self.assertEqual(len(self.actors), 8)
+
+    def test_spill(self):
+        """
+        Tests that assigned nodes past max_assigned are spilled to disk and read back.
+        :return: self
+        """
+        self.actors.max_assigned = 2
+        for i in range(6):
+            self.actors['New Actor {}'.format(i)] = Actor('New Actor {}'.format(i), 30 + i)
+        self.assertLessEqual(self.actors.num_materialized(), 2)
+        self.assertEqual([self.actors['New Actor {}'.format(i)].age for i in range(6)], list(range(30, 36)))
+        self.assertLessEqual(self.actors.num_materialized(), 5)
+        self.assertEqual([node.age for node in self.actors.values()][-6:], list(range(30, 36)))
+        del self.actors['New Actor 0']
+        self.assertRaises(KeyError, lambda: self.actors['New Actor 0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
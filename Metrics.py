@@ -0,0 +1,208 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+"""
+Reference:
+https://prometheus.io/docs/instrumenting/exposition_formats/#text-based-format
+https://prometheus.io/docs/practices/histograms/
+"""
+
+# Upper bounds of the buckets of latency histograms, in seconds
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+# Upper bounds of the buckets of size histograms, e.g. of numbers of results
+SIZE_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, 1000000)
+
+
+def _format_labels(labels: tuple) -> str:
+    """
+    Utility function to write the labels of a sample, escaped as the text format requires.
+    :param labels: Tuple of (label, value), sorted
+    :return: e.g. '{route="/actors/",method="GET"}', or '' without labels
+    """
+    if not labels:
+        return ''
+    escaped = ('{}="{}"'.format(label, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+               for label, value in labels)
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value) -> str:
+    """
+    Utility function to write the value of a sample.
+    :param value: The number
+    :return: The number as text, '+Inf' for infinity
+    """
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    """
+    Counts of observed values by bucket, with their sum, like a Prometheus histogram.
+    @author sahil1105
+    """
+
+    def __init__(self, buckets: tuple):
+        """
+        Constructor for an empty Histogram.
+        :param buckets: Increasing upper bounds of the buckets; a last one for everything larger is added
+        """
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        """
+        Record a value.
+        :param value: The value
+        :return: Nothing.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list:
+        """
+        Get the number of values up to every bucket bound, the last bound being infinity.
+        :return: List of (upper bound, count)
+        """
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class Metrics:
+    """
+    Registry of counters and histograms, by name and labels, rendered in the Prometheus text
+    format. Recording a value takes a lock and a dictionary lookup, so it can be done on every
+    request. Values that are kept elsewhere (e.g. the hits of a cache) are read when rendering,
+    by collectors.
+    @author sahil1105
+    """
+
+    def __init__(self):
+        """
+        Constructor for an empty Metrics registry.
+        """
+        self._descriptions = {}  # Name --> (type, help, buckets)
+        self._counters = {}  # Name --> Dict (labels --> value)
+        self._histograms = {}  # Name --> Dict (labels --> Histogram)
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def describe(self, name: str, metric_type: str, help_text: str, buckets: tuple = LATENCY_BUCKETS):
+        """
+        Declare a metric. Metrics have to be declared before values are recorded for them.
+        :param name: Name of the metric, ending in _total for counters
+        :param metric_type: 'counter', 'gauge' or 'histogram'
+        :param help_text: Description of the metric
+        :param buckets: Bucket bounds, for histograms
+        :return: self
+        """
+        self._descriptions[name] = (metric_type, help_text, buckets)
+        if metric_type == 'histogram':
+            self._histograms.setdefault(name, {})
+        else:
+            self._counters.setdefault(name, {})
+        return self
+
+    def inc(self, name: str, amount=1, **labels):
+        """
+        Add to a counter.
+        :param name: Name of the counter
+        :param amount: Amount to add
+        :param labels: Labels of the counter, e.g. route='/actors/'
+        :return: Nothing.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            values = self._counters[name]
+            values[key] = values.get(key, 0) + amount
+
+    def observe(self, name: str, value, **labels):
+        """
+        Record a value in a histogram.
+        :param name: Name of the histogram
+        :param value: The value
+        :param labels: Labels of the histogram
+        :return: Nothing.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            histograms = self._histograms[name]
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = Histogram(self._descriptions[name][2])
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """
+        Context manager recording the seconds spent in it in a histogram.
+        :param name: Name of the histogram
+        :param labels: Labels of the histogram
+        :return: Nothing.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def add_collector(self, collector):
+        """
+        Add a function giving values to report when rendering.
+        :param collector: Function returning a list of (name, labels dict, value), for described counters and gauges
+        :return: self
+        """
+        self._collectors.append(collector)
+        return self
+
+    def get(self, name: str, **labels):
+        """
+        Get the value of a counter, or the Histogram of a histogram.
+        :param name: Name of the metric
+        :param labels: Its labels
+        :return: The value (0 if nothing was recorded), or the Histogram (None if nothing was recorded)
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            if name in self._histograms:
+                return self._histograms[name].get(key)
+            return self._counters[name].get(key, 0)
+
+    def render(self) -> str:
+        """
+        Write every metric in the Prometheus text format.
+        :return: The text
+        """
+        with self._lock:
+            counters = {name: dict(values) for name, values in self._counters.items()}
+            histograms = {name: {labels: (histogram.cumulative_counts(), histogram.sum, histogram.count)
+                                 for labels, histogram in values.items()}
+                          for name, values in self._histograms.items()}
+        for collector in self._collectors:
+            for name, labels, value in collector():
+                counters[name][tuple(sorted(labels.items()))] = value
+        lines = []
+        for name, (metric_type, help_text, _) in sorted(self._descriptions.items()):
+            lines.append('# HELP {} {}'.format(name, help_text))
+            lines.append('# TYPE {} {}'.format(name, metric_type))
+            if metric_type != 'histogram':
+                for labels, value in sorted(counters[name].items()):
+                    lines.append('{}{} {}'.format(name, _format_labels(labels), _format_value(value)))
+                continue
+            for labels, (buckets, total, count) in sorted(histograms[name].items()):
+                for bound, bucket_count in buckets:
+                    lines.append('{}_bucket{} {}'.format(name, _format_labels(labels + (('le', _format_value(bound)),)),
+                                                         bucket_count))
+                lines.append('{}_sum{} {}'.format(name, _format_labels(labels), _format_value(total)))
+                lines.append('{}_count{} {}'.format(name, _format_labels(labels), count))
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,63 @@
+import unittest
+from venv.Metrics import Metrics, Histogram
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    Unit Tests for the metrics registry and its Prometheus text output.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Creates a registry with a counter, a histogram and a gauge read by a collector.
+        :return: self
+        """
+        self.metrics = Metrics()
+        self.metrics.describe('requests_total', 'counter', "Requests.")
+        self.metrics.describe('latency_seconds', 'histogram', "Latency.", (0.1, 1.0))
+        self.metrics.describe('entries', 'gauge', "Entries.")
+        self.metrics.add_collector(lambda: [('entries', {}, 7)])
+
+    def test_histogram(self):
+        """
+        Tests that values are counted in the first bucket whose bound they don't exceed.
+        :return: self
+        """
+        histogram = Histogram((1, 10))
+        for value in (0, 1, 5, 10, 11):
+            histogram.observe(value)
+        self.assertEqual(histogram.cumulative_counts(), [(1, 2), (10, 4), (float('inf'), 5)])
+        self.assertEqual((histogram.sum, histogram.count), (27, 5))
+
+    def test_counters(self):
+        """
+        Tests that counters add up by labels, whatever their order.
+        :return: self
+        """
+        self.metrics.inc('requests_total', route='/a', method='GET')
+        self.metrics.inc('requests_total', 2, method='GET', route='/a')
+        self.assertEqual(self.metrics.get('requests_total', route='/a', method='GET'), 3)
+        self.assertEqual(self.metrics.get('requests_total', route='/b', method='GET'), 0)
+
+    def test_render(self):
+        """
+        Tests the text format of every kind of metric.
+        :return: self
+        """
+        self.metrics.inc('requests_total', route='/say "hi"')
+        with self.metrics.timer('latency_seconds', route='/a'):
+            pass
+        self.metrics.observe('latency_seconds', 2.5, route='/a')
+        lines = self.metrics.render().splitlines()
+        self.assertIn('# TYPE requests_total counter', lines)
+        self.assertIn('requests_total{route="/say \\"hi\\""} 1', lines)
+        self.assertIn('latency_seconds_bucket{route="/a",le="0.1"} 1', lines)
+        self.assertIn('latency_seconds_bucket{route="/a",le="+Inf"} 2', lines)
+        self.assertIn('latency_seconds_count{route="/a"} 2', lines)
+        self.assertIn('entries 7', lines)
+        self.assertEqual(self.metrics.get('latency_seconds', route='/a').count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
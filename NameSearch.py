@@ -0,0 +1,209 @@
+import heapq
+from bisect import bisect_left, insort
+from collections import Counter
+
+"""
+Reference:
+https://en.wikipedia.org/wiki/Trigram_search
+https://www.postgresql.org/docs/current/pgtrgm.html
+"""
+
+
+def normalize_name(text: str) -> str:
+    """
+    Utility function to bring a name or a query to the form names are searched in:
+    lower case, with underscores as spaces and single spaces between words.
+    :param text: The name or query
+    :return: The normalized text
+    """
+    return ' '.join(text.replace('_', ' ').casefold().split())
+
+
+def trigrams(text: str) -> set:
+    """
+    Utility function to get the trigrams (substrings of 3 characters) of a normalized name.
+    Words are padded so their beginnings and ends count too.
+    :param text: The normalized name
+    :return: Set of trigrams
+    """
+    padded = '  ' + text + ' '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """
+    Index of the names of a collection for autocomplete. Prefix search uses a sorted list of
+    every suffix of a name that starts a word ('bruce willis', 'willis'), found by binary search,
+    so 'wil' finds Bruce Willis. Fuzzy search, for queries with typos, ranks names by the share
+    of trigrams they have in common with the query.
+
+    Names added or removed after the index was built are kept aside, in a small sorted list of
+    their own and a set of the names removed from the big one, and merged into the big list once
+    there are about as many as the square root of its size, so a change doesn't cost moving the
+    whole list.
+    @author sahil1105
+    """
+
+    def __init__(self):
+        """
+        Constructor for an empty NameIndex.
+        """
+        self._entries = []  # Sorted list of (word-start suffix of a normalized name, name)
+        self._added = []  # Sorted list of the entries of the names added since the last merge
+        self._removed = set()  # Names removed since the last merge, whose entries are still in _entries
+        self._trigrams = {}  # Name --> set of trigrams of its normalized form
+        self._postings = {}  # Trigram --> set of names
+
+    def __len__(self):
+        return len(self._trigrams)
+
+    def __contains__(self, name):
+        return name in self._trigrams
+
+    def build(self, names):
+        """
+        Replace the index with one of the given names.
+        :param names: Iterable of names
+        :return: self
+        """
+        self.__init__()
+        for name in names:
+            normalized = normalize_name(name)
+            self._entries.extend((suffix, name) for suffix in self._word_suffixes(normalized))
+            self._add_trigrams(name, normalized)
+        self._entries.sort()
+        return self
+
+    @staticmethod
+    def _word_suffixes(normalized: str) -> list:
+        """
+        Utility function to get the suffixes of a normalized name that start a word.
+        :param normalized: The normalized name
+        :return: List of suffixes, the whole name first
+        """
+        suffixes = [normalized]
+        for i, char in enumerate(normalized):
+            if char == ' ':
+                suffixes.append(normalized[i + 1:])
+        return suffixes
+
+    def _add_trigrams(self, name: str, normalized: str):
+        """
+        Utility function to add a name to the trigram index.
+        :return: Nothing.
+        """
+        name_trigrams = trigrams(normalized)
+        self._trigrams[name] = name_trigrams
+        for trigram in name_trigrams:
+            self._postings.setdefault(trigram, set()).add(name)
+
+    def add(self, name: str):
+        """
+        Add a name to the index, if it isn't in it already.
+        :param name: The name
+        :return: self
+        """
+        if name in self._trigrams:
+            return self
+        normalized = normalize_name(name)
+        if name in self._removed:
+            self._removed.discard(name)  # Its entries are still there
+        else:
+            for suffix in self._word_suffixes(normalized):
+                insort(self._added, (suffix, name))
+            self._merge_if_due()
+        self._add_trigrams(name, normalized)
+        return self
+
+    def remove(self, name: str):
+        """
+        Remove a name from the index, if it is in it.
+        :param name: The name
+        :return: self
+        """
+        name_trigrams = self._trigrams.pop(name, None)
+        if name_trigrams is None:
+            return self
+        suffixes = self._word_suffixes(normalize_name(name))
+        i = bisect_left(self._added, (suffixes[0], name))
+        if i < len(self._added) and self._added[i] == (suffixes[0], name):
+            for suffix in suffixes:
+                del self._added[bisect_left(self._added, (suffix, name))]
+        else:
+            self._removed.add(name)
+            self._merge_if_due()
+        for trigram in name_trigrams:
+            names = self._postings[trigram]
+            names.discard(name)
+            if not names:
+                del self._postings[trigram]
+        return self
+
+    def _merge_if_due(self):
+        """
+        Utility function to merge the names added and removed since the last merge into the big
+        sorted list, once there are enough of them.
+        :return: Nothing.
+        """
+        if len(self._added) + len(self._removed) <= max(64, int(len(self._entries) ** 0.5)):
+            return
+        kept = [entry for entry in self._entries if entry[1] not in self._removed] if self._removed else self._entries
+        self._entries = list(heapq.merge(kept, self._added))
+        self._added = []
+        self._removed = set()
+
+    def _matches(self, prefix: str):
+        """
+        Utility function to go through the names with a word starting with a normalized prefix.
+        A name is found once, by the first of its suffixes that match.
+        :param prefix: The normalized prefix
+        :return: Generator of names
+        """
+        for entries, removed in [(self._entries, self._removed), (self._added, ())]:
+            i = bisect_left(entries, (prefix,))
+            while i < len(entries) and entries[i][0].startswith(prefix):
+                suffix, name = entries[i]
+                i += 1
+                if name in removed:
+                    continue
+                if next(other for other in self._word_suffixes(normalize_name(name))
+                        if other.startswith(prefix)) == suffix:
+                    yield name
+
+    def prefix_search(self, prefix: str, limit: int = 10, score=None) -> list:
+        """
+        Find the names with a word starting with a prefix (the first words of the prefix must match whole).
+        Every match is ranked, keeping only the best limit of them in memory.
+        :param prefix: The prefix, e.g. what has been typed so far
+        :param limit: Max number of names to return
+        :param score: Function giving the rank (a number) of a name, highest first; alphabetical order if None
+        :return: List of names
+        """
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+        if score is None:
+            return heapq.nsmallest(limit, self._matches(prefix))
+        return heapq.nsmallest(limit, self._matches(prefix), key=lambda name: (-score(name), name))
+
+    def fuzzy_search(self, query: str, limit: int = 10, score=None, min_similarity: float = 0.3) -> list:
+        """
+        Find the names most similar to a query, tolerating typos. The similarity of a name is
+        the number of trigrams it shares with the query over the number of trigrams of the two together.
+        :param query: The query
+        :param limit: Max number of names to return
+        :param score: Function giving the rank of a name among equally similar ones; None for alphabetical
+        :param min_similarity: Least similarity a name needs, between 0 and 1
+        :return: List of names, the most similar first
+        """
+        query_trigrams = trigrams(normalize_name(query))
+        shared = Counter()
+        for trigram in query_trigrams:
+            shared.update(self._postings.get(trigram, ()))
+        candidates = []
+        for name, num_shared in shared.items():
+            similarity = num_shared / (len(query_trigrams) + len(self._trigrams[name]) - num_shared)
+            if similarity >= min_similarity:
+                candidates.append((round(similarity, 6), score(name) if score is not None else 0, name))
+        best = heapq.nsmallest(limit, candidates, key=lambda entry: (-entry[0], -entry[1], entry[2]))
+        return [name for _, _, name in best]
@@ -0,0 +1,104 @@
+import unittest
+from venv.NameSearch import NameIndex, normalize_name
+
+
+class TestNameSearch(unittest.TestCase):
+    """
+    Unit Tests for the prefix and fuzzy name search index.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Creates an index of a few names, and scores to rank them by.
+        :return: self
+        """
+        self.scores = {'Bruce Willis': 562709189, 'Bruce Lee': 1000, 'Jack Warden': 1234.5,
+                       'Rainn Wilson': 50, 'Jack Black': 7000}
+        self.index = NameIndex().build(self.scores)
+
+    def test_normalize_name(self):
+        """
+        Tests that queries are normalized like names.
+        :return: self
+        """
+        self.assertEqual(normalize_name('  Bruce_WILLIS '), 'bruce willis')
+
+    def test_prefix_search(self):
+        """
+        Tests matching prefixes of whole names and of their words.
+        :return: self
+        """
+        self.assertEqual(self.index.prefix_search('bru'), ['Bruce Lee', 'Bruce Willis'])
+        self.assertEqual(self.index.prefix_search('Bruce_W'), ['Bruce Willis'])
+        self.assertEqual(self.index.prefix_search('wil'), ['Bruce Willis', 'Rainn Wilson'])
+        self.assertEqual(self.index.prefix_search('willis b'), [])
+        self.assertEqual(self.index.prefix_search(''), [])
+
+    def test_ranking(self):
+        """
+        Tests that the top matches by score are returned, highest first.
+        :return: self
+        """
+        self.assertEqual(self.index.prefix_search('b', limit=2, score=self.scores.get),
+                         ['Bruce Willis', 'Jack Black'])
+        self.assertEqual(self.index.prefix_search('j', score=self.scores.get), ['Jack Black', 'Jack Warden'])
+
+    def test_fuzzy_search(self):
+        """
+        Tests that names are found despite typos, the most similar first.
+        :return: self
+        """
+        self.assertEqual(self.index.fuzzy_search('brce wilis')[0], 'Bruce Willis')
+        self.assertEqual(self.index.fuzzy_search('jack wardn', limit=1), ['Jack Warden'])
+        self.assertEqual(self.index.fuzzy_search('zzzz'), [])
+
+    def test_updates(self):
+        """
+        Tests that added and removed names are found and no longer found.
+        :return: self
+        """
+        self.index.add('Bruce Campbell').add('Bruce Campbell')
+        self.assertEqual(self.index.prefix_search('bruce c'), ['Bruce Campbell'])
+        self.assertEqual(len(self.index), 6)
+        self.index.remove('Bruce Willis').remove('Nobody')
+        self.assertEqual(self.index.prefix_search('wil'), ['Rainn Wilson'])
+        self.assertNotIn('Bruce Willis', self.index.fuzzy_search('bruce willis'))
+        self.assertNotIn('Bruce Willis', self.index)
+
+    def test_ranks_every_match(self):
+        """
+        Tests that the best matches by score are found however many names match, and that names with
+        several matching words are returned once.
+        :return: self
+        """
+        scores = {'Name {:05}'.format(i): i for i in range(12000)}
+        scores['Nina Nash'] = 20000
+        index = NameIndex().build(scores)
+        self.assertEqual(index.prefix_search('n', limit=3, score=scores.get), ['Nina Nash', 'Name 11999', 'Name 11998'])
+        self.assertEqual(index.prefix_search('n', limit=2), ['Name 00000', 'Name 00001'])
+
+    def test_many_updates(self):
+        """
+        Tests that names added and removed, before and after they are merged, are searched like a new index.
+        :return: self
+        """
+        names = set(self.scores)
+        for i in range(500):
+            name = 'Bruce {}'.format(i % 150)
+            if i % 3 == 2:
+                self.index.remove(name)
+                names.discard(name)
+            else:
+                self.index.add(name)
+                names.add(name)
+            if i % 50 == 0:
+                self.assertEqual(self.index.prefix_search('bruce', limit=1000),
+                                 NameIndex().build(names).prefix_search('bruce', limit=1000))
+        self.assertEqual(self.index.prefix_search('bruce', limit=1000),
+                         sorted(name for name in names if name.startswith('Bruce')))
+        self.assertEqual(len(self.index), len(names))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import gc
+import logging
+import os
+import signal
+import socket
+from werkzeug.serving import make_server
+
+"""
+Reference:
+https://docs.python.org/3/library/gc.html#gc.freeze
+https://instagram-engineering.com/copy-on-write-friendly-python-garbage-collection-ad6ed5233ddf
+"""
+
+
+class _StopServing(Exception):
+    """
+    Raised in the parent process by the SIGINT/SIGTERM handler to shut the workers down.
+    """
+
+
+def _run_worker(app, host: str, port: int, listen_fd: int, quiet: bool):
+    """
+    Utility function serving requests in a forked worker until it is terminated. Never returns.
+    :param app: The WSGI application
+    :param host: Host the socket is bound to
+    :param port: Port the socket is bound to
+    :param listen_fd: File descriptor of the shared listening socket
+    :param quiet: True to not log every request
+    :return: Nothing.
+    """
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    if quiet:
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server(host, port, app, fd=listen_fd)
+    try:
+        server.serve_forever()
+    finally:
+        os._exit(0)
+
+
+def serve_prefork(app, host: str = '127.0.0.1', port: int = 5000, num_workers: int = None, quiet: bool = True,
+                  on_ready=None):
+    """
+    Serve an application from several worker processes sharing one listening socket. Whatever
+    the application has loaded before this is called is shared with the workers copy-on-write.
+    The objects are moved out of reach of the garbage collector first (gc.freeze), so the
+    collections in the workers don't write to, and thereby copy, the pages they are on.
+    Workers that die are replaced. Returns once the server gets SIGINT or SIGTERM.
+    :param app: The WSGI application, with its data loaded
+    :param host: Host to listen on
+    :param port: Port to listen on, 0 to pick a free one
+    :param num_workers: Number of worker processes, the number of CPUs by default
+    :param quiet: True to not log every request
+    :param on_ready: Function called with the port once the workers are started
+    :return: Nothing.
+    """
+    num_workers = num_workers or os.cpu_count() or 1
+    listen_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listen_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listen_socket.bind((host, port))
+    listen_socket.listen(1024)
+    port = listen_socket.getsockname()[1]
+
+    gc.collect()
+    gc.freeze()
+
+    def start_worker():
+        pid = os.fork()
+        if pid == 0:
+            _run_worker(app, host, port, listen_socket.fileno(), quiet)
+        return pid
+
+    def stop(signum, frame):
+        raise _StopServing()
+
+    previous_handlers = {signum: signal.signal(signum, stop) for signum in (signal.SIGINT, signal.SIGTERM)}
+    workers = {start_worker() for _ in range(num_workers)}
+    logging.info("Serving on {}:{} with {} workers.".format(host, port, num_workers))
+    try:
+        if on_ready is not None:
+            on_ready(port)
+        while True:
+            try:
+                pid, _ = os.wait()
+            except ChildProcessError:
+                break
+            if pid in workers:
+                workers.discard(pid)
+                logging.warning("Worker {} died, starting a new one.".format(pid))
+                workers.add(start_worker())
+    except _StopServing:
+        pass
+    finally:
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        for pid in workers:
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        listen_socket.close()
+        gc.unfreeze()
+        for signum, handler in previous_handlers.items():
+            signal.signal(signum, handler)
@@ -0,0 +1,97 @@
+import http.client
+import multiprocessing
+import os
+import signal
+import unittest
+from flask import Flask
+from venv.PreforkServer import serve_prefork
+
+
+def make_app():
+    """
+    Utility function to create an app that answers with the id of the process serving it.
+    :return: The flask app
+    """
+    app = Flask(__name__)
+    data = {'loaded_by': os.getpid()}
+
+    @app.route('/')
+    def whoami():
+        return '{} {}'.format(os.getpid(), data['loaded_by'])
+
+    return app
+
+
+def serve(port_queue):
+    """
+    Utility function serving the test app from 2 workers, reporting the port.
+    :return: Nothing.
+    """
+    serve_prefork(make_app(), port=0, num_workers=2, on_ready=port_queue.put)
+
+
+class TestPreforkServer(unittest.TestCase):
+    """
+    Unit Tests for serving from several worker processes.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Starts a server in a separate process.
+        :return: self
+        """
+        context = multiprocessing.get_context('fork')
+        port_queue = context.Queue()
+        self.server = context.Process(target=serve, args=(port_queue,))
+        self.server.start()
+        self.port = port_queue.get(timeout=30)
+
+    def tearDown(self):
+        """
+        Stops the server.
+        :return: self
+        """
+        if self.server.is_alive():
+            os.kill(self.server.pid, signal.SIGTERM)
+        self.server.join(timeout=30)
+
+    def get(self) -> (int, int):
+        """
+        Utility function to make a request to the server.
+        :return: Id of the worker that served it, id of the process that loaded the app
+        """
+        connection = http.client.HTTPConnection('127.0.0.1', self.port, timeout=30)
+        try:
+            connection.request('GET', '/')
+            worker, loader = connection.getresponse().read().split()
+        finally:
+            connection.close()
+        return int(worker), int(loader)
+
+    def test_workers_share_loaded_app(self):
+        """
+        Tests that requests are served by forked workers, from the data loaded before forking.
+        :return: self
+        """
+        for _ in range(10):
+            worker, loader = self.get()
+            self.assertEqual(loader, self.server.pid)
+            self.assertNotEqual(worker, self.server.pid)
+
+    def test_dead_workers_are_replaced(self):
+        """
+        Tests that the server keeps serving after a worker dies, and shuts down cleanly.
+        :return: self
+        """
+        worker, _ = self.get()
+        os.kill(worker, signal.SIGKILL)
+        for _ in range(5):
+            self.assertNotEqual(self.get()[0], worker)
+        os.kill(self.server.pid, signal.SIGTERM)
+        self.server.join(timeout=30)
+        self.assertEqual(self.server.exitcode, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,230 @@
+from venv.AttributeIndex import as_number
+
+"""
+Reference:
+https://www.sqlite.org/queryplanner.html
+https://en.wikipedia.org/wiki/Selectivity_(databases)
+"""
+
+INDEX_LOOKUP = 'index lookup'
+INDEX_INTERSECT = 'intersect with index'
+FILTER_CANDIDATES = 'filter candidates'
+
+
+class EqualsPredicate:
+    """
+    Condition that an attribute of a node equals a value, compared as strings like
+    WebAPI.filter_list does.
+    @author sahil1105
+    """
+
+    operation = '='
+
+    def __init__(self, attr: str, attr_value):
+        """
+        Constructor for an EqualsPredicate.
+        :param attr: Name of the node attribute
+        :param attr_value: The value to look for
+        """
+        self.attr = attr
+        self.value = str(attr_value)
+
+    def estimate(self, index) -> int:
+        """
+        Get the number of nodes matching the predicate, from the statistics of the index.
+        :param index: AttributeIndex of the nodes
+        :return: Number of matching nodes
+        """
+        return index.count(self.attr, self.value)
+
+    def lookup(self, index):
+        """
+        Get the names of the nodes matching the predicate.
+        :param index: AttributeIndex of the nodes
+        :return: Set of names, which must not be changed
+        """
+        return index.lookup(self.attr, self.value)
+
+    def matches(self, index, name: str) -> bool:
+        """
+        Check whether a single node matches the predicate.
+        :param index: AttributeIndex of the nodes
+        :param name: Name of the node
+        :return: True if it matches, False otherwise
+        """
+        return index.value_of(name, self.attr) == self.value
+
+    def matches_value(self, attr_value) -> bool:
+        """
+        Check whether an attribute value matches the predicate, for nodes that aren't indexed.
+        :param attr_value: Value of the attribute of a node
+        :return: True if it matches, False otherwise
+        """
+        return str(attr_value) == self.value
+
+    def describe(self) -> str:
+        """
+        Get a readable form of the predicate for plans.
+        :return: e.g. "age = '50'"
+        """
+        return "{} {} {!r}".format(self.attr, self.operation, self.value)
+
+
+class RangePredicate:
+    """
+    Condition that a numeric attribute of a node lies in a range. Nodes whose attribute
+    isn't a number never match.
+    @author sahil1105
+    """
+
+    def __init__(self, attr: str, low=None, high=None, include_low: bool = True, include_high: bool = True):
+        """
+        Constructor for a RangePredicate.
+        :param attr: Name of the node attribute, which must be kept sorted by the index
+        :param low: Lower bound, None for no lower bound
+        :param high: Upper bound, None for no upper bound
+        :param include_low: True if the lower bound itself is in the range
+        :param include_high: True if the upper bound itself is in the range
+        """
+        self.attr = attr
+        self.low, self.high = low, high
+        self.include_low, self.include_high = include_low, include_high
+
+    def estimate(self, index) -> int:
+        """
+        Get the number of nodes matching the predicate, by binary search in the sorted index.
+        :param index: AttributeIndex of the nodes
+        :return: Number of matching nodes
+        """
+        return index.range_count(self.attr, self.low, self.high, self.include_low, self.include_high)
+
+    def lookup(self, index):
+        """
+        Get the names of the nodes matching the predicate.
+        :param index: AttributeIndex of the nodes
+        :return: Set of names
+        """
+        return set(index.range_lookup(self.attr, self.low, self.high, self.include_low, self.include_high))
+
+    def _in_range(self, number) -> bool:
+        """
+        Utility function to check whether a number lies in the range.
+        :param number: The number, or None
+        :return: True if it is a number in the range, False otherwise
+        """
+        if number is None:
+            return False
+        if self.low is not None and (number < self.low or (number == self.low and not self.include_low)):
+            return False
+        if self.high is not None and (number > self.high or (number == self.high and not self.include_high)):
+            return False
+        return True
+
+    def matches(self, index, name: str) -> bool:
+        """
+        Check whether a single node matches the predicate.
+        :param index: AttributeIndex of the nodes
+        :param name: Name of the node
+        :return: True if it matches, False otherwise
+        """
+        return self._in_range(index.number_of(name, self.attr))
+
+    def matches_value(self, attr_value) -> bool:
+        """
+        Check whether an attribute value matches the predicate, for nodes that aren't indexed.
+        :param attr_value: Value of the attribute of a node
+        :return: True if it matches, False otherwise
+        """
+        return self._in_range(as_number(attr_value))
+
+    def describe(self) -> str:
+        """
+        Get a readable form of the predicate for plans.
+        :return: e.g. "40.0 <= age < 50.0"
+        """
+        description = self.attr
+        if self.low is not None:
+            description = "{} {} {}".format(self.low, '<=' if self.include_low else '<', description)
+        if self.high is not None:
+            description = "{} {} {}".format(description, '<=' if self.include_high else '<', self.high)
+        return description
+
+
+class QueryPlan:
+    """
+    Order in which the predicates of an AND query are evaluated, and how. The first
+    (most selective) predicate is looked up in the index; every following one either
+    intersects the candidates with its own matches, or, when it matches more nodes than
+    there are candidates left, checks the remaining candidates one by one.
+    @author sahil1105
+    """
+
+    def __init__(self, steps: list):
+        """
+        Constructor for a QueryPlan.
+        :param steps: List of (predicate, estimated matches, access method) in evaluation order
+        """
+        self.steps = steps
+        self.actual_rows = []
+
+    def execute(self, index) -> list:
+        """
+        Run the plan, recording the number of candidates left after every step.
+        :param index: AttributeIndex of the nodes
+        :return: List of the names of the matching nodes, in dictionary order
+        """
+        self.actual_rows = []
+        if not self.steps:
+            return index.find_all([])
+        candidates = set()
+        for predicate, estimate, access in self.steps:
+            if access == INDEX_LOOKUP:
+                candidates = set(predicate.lookup(index))
+            elif access == INDEX_INTERSECT:
+                candidates &= predicate.lookup(index)
+            else:
+                candidates = {name for name in candidates if predicate.matches(index, name)}
+            self.actual_rows.append(len(candidates))
+            if not candidates:
+                break
+        return index.in_order(candidates)
+
+    def explain(self) -> list:
+        """
+        Describe the plan, with the numbers of rows of the last execution if it was run.
+        :return: List of dictionaries, one per step
+        """
+        explanation = []
+        for i, (predicate, estimate, access) in enumerate(self.steps):
+            step = {'step': i + 1, 'predicate': predicate.describe(), 'access': access, 'estimated_rows': estimate}
+            if i < len(self.actual_rows):
+                step['rows'] = self.actual_rows[i]
+            elif self.actual_rows:
+                step['skipped'] = True  # Nothing was left to filter
+            explanation.append(step)
+        return explanation
+
+
+def plan_query(index, predicates: list) -> QueryPlan:
+    """
+    Plan an AND query, evaluating the predicates from the most selective to the least.
+    A query costs about as much as the number of nodes matching its most selective predicate.
+    The number of candidates left after every step is estimated taking the predicates to be
+    independent, so a predicate can be intersected early on and only filter later ones.
+    :param index: AttributeIndex of the nodes, which also holds the cardinality statistics
+    :param predicates: List of predicates that must all hold
+    :return: The QueryPlan
+    """
+    estimated = sorted(((predicate.estimate(index), i, predicate) for i, predicate in enumerate(predicates)),
+                       key=lambda entry: entry[:2])
+    steps = []
+    num_candidates = None
+    for estimate, _, predicate in estimated:
+        if num_candidates is None:
+            access = INDEX_LOOKUP
+            num_candidates = estimate
+        else:
+            access = INDEX_INTERSECT if estimate <= num_candidates else FILTER_CANDIDATES
+            num_candidates = num_candidates * estimate / len(index) if len(index) else 0
+        steps.append((predicate, estimate, access))
+    return QueryPlan(steps)
@@ -0,0 +1,92 @@
+import unittest
+from venv.Graph import Actor
+from venv.AttributeIndex import AttributeIndex
+from venv.QueryPlanner import EqualsPredicate, RangePredicate, plan_query, INDEX_LOOKUP, \
+    INDEX_INTERSECT, FILTER_CANDIDATES
+
+
+class TestQueryPlanner(unittest.TestCase):
+    """
+    Unit Tests for the planning of AND queries on the API.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Indexes 100 actors, half of them aged 50 and one of them named 'Actor 7'.
+        :return: self
+        """
+        self.actors = {'Actor {}'.format(i): Actor('Actor {}'.format(i), 50 if i % 2 else 40, i) for i in range(100)}
+        self.index = AttributeIndex(['name', 'age', 'gross_value'], ['age', 'gross_value']).build(self.actors)
+
+    def test_most_selective_first(self):
+        """
+        Tests that the predicate with the fewest matches is looked up and the others only filter its matches.
+        :return: self
+        """
+        plan = plan_query(self.index, [EqualsPredicate('age', 50), EqualsPredicate('name', 'Actor 7')])
+        self.assertEqual([(predicate.attr, estimate, access) for predicate, estimate, access in plan.steps],
+                         [('name', 1, INDEX_LOOKUP), ('age', 50, FILTER_CANDIDATES)])
+        self.assertEqual(plan.execute(self.index), ['Actor 7'])
+        self.assertEqual([step['rows'] for step in plan.explain()], [1, 1])
+
+    def test_results_match_scan(self):
+        """
+        Tests that planned queries return the same nodes, in the same order, as a scan.
+        :return: self
+        """
+        queries = [[('age', '50')], [('age', '40'), ('gross_value', '8')], [('age', '40'), ('gross_value', '7')],
+                   [('age', '50'), ('age', '50')], [('age', 'x')], []]
+        for query in queries:
+            expected = [name for name, node in self.actors.items()
+                        if all(str(node.__dict__[attr]) == attr_value for attr, attr_value in query)]
+            plan = plan_query(self.index, [EqualsPredicate(attr, attr_value) for attr, attr_value in query])
+            self.assertEqual(plan.execute(self.index), expected)
+
+    def test_explain_skips_after_empty(self):
+        """
+        Tests that steps after the candidates run out are reported as skipped.
+        :return: self
+        """
+        plan = plan_query(self.index, [EqualsPredicate('age', 40), EqualsPredicate('name', 'Nobody')])
+        self.assertEqual(plan.execute(self.index), [])
+        explanation = plan.explain()
+        self.assertEqual(explanation[0]['predicate'], "name = 'Nobody'")
+        self.assertEqual(explanation[0]['rows'], 0)
+        self.assertTrue(explanation[1]['skipped'])
+
+    def test_estimate_narrows(self):
+        """
+        Tests that the candidates left after every step are estimated, so a predicate matching as
+        many nodes as the first is intersected, but then only filters after the second narrowed them.
+        :return: self
+        """
+        predicates = [EqualsPredicate('age', 50), RangePredicate('gross_value', high=50, include_high=False),
+                      RangePredicate('gross_value', 25, 74)]
+        plan = plan_query(self.index, predicates)
+        self.assertEqual([(predicate, estimate, access) for predicate, estimate, access in plan.steps],
+                         [(predicates[0], 50, INDEX_LOOKUP), (predicates[1], 50, INDEX_INTERSECT),
+                          (predicates[2], 50, FILTER_CANDIDATES)])
+        self.assertEqual(plan.execute(self.index), ['Actor {}'.format(i) for i in range(25, 50, 2)])
+        self.assertEqual([step['rows'] for step in plan.explain()], [50, 25, 13])
+
+    def test_range_predicates(self):
+        """
+        Tests that range predicates are estimated exactly and mix with exact matches.
+        :return: self
+        """
+        gross_range = RangePredicate('gross_value', 10, 20, include_high=False)
+        self.assertEqual(gross_range.estimate(self.index), 10)
+        plan = plan_query(self.index, [EqualsPredicate('age', 50), gross_range])
+        self.assertEqual(plan.steps[0][0], gross_range)
+        self.assertEqual(plan.execute(self.index), ['Actor {}'.format(i) for i in range(11, 20, 2)])
+        self.assertEqual(gross_range.describe(), '10 <= gross_value < 20')
+        self.assertTrue(gross_range.matches_value(19.5))
+        self.assertFalse(gross_range.matches_value('15'))
+        plan = plan_query(self.index, [RangePredicate('gross_value', low=97, include_low=False),
+                                       RangePredicate('age', high=40)])
+        self.assertEqual(plan.execute(self.index), ['Actor 98'])
+
+
+if __name__ == '__main__':
+    unittest.main()
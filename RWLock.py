@@ -0,0 +1,64 @@
+import threading
+from contextlib import contextmanager
+
+"""
+Reference:
+https://en.wikipedia.org/wiki/Readers%E2%80%93writer_lock
+"""
+
+
+class RWLock:
+    """
+    Reader-writer lock: any number of readers can hold it at once, a writer holds it alone.
+    Writers are preferred, so once a writer is waiting new readers wait too and a steady
+    stream of reads can't starve the writes. The lock isn't reentrant.
+    @author sahil1105
+    """
+
+    def __init__(self):
+        """
+        Constructor for an unlocked RWLock.
+        """
+        self._condition = threading.Condition(threading.Lock())
+        self._num_readers = 0
+        self._num_waiting_writers = 0
+        self._writing = False
+
+    @contextmanager
+    def read(self):
+        """
+        Context manager holding the lock for reading.
+        :return: Nothing.
+        """
+        with self._condition:
+            while self._writing or self._num_waiting_writers:
+                self._condition.wait()
+            self._num_readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._num_readers -= 1
+                if self._num_readers == 0:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        """
+        Context manager holding the lock for writing.
+        :return: Nothing.
+        """
+        with self._condition:
+            self._num_waiting_writers += 1
+            try:
+                while self._writing or self._num_readers:
+                    self._condition.wait()
+            finally:
+                self._num_waiting_writers -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
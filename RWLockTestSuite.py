@@ -0,0 +1,95 @@
+import threading
+import time
+import unittest
+from venv.RWLock import RWLock
+
+
+class TestRWLock(unittest.TestCase):
+    """
+    Unit Tests for the reader-writer lock.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Creates a lock.
+        :return: self
+        """
+        self.lock = RWLock()
+
+    def test_readers_share(self):
+        """
+        Tests that readers hold the lock at the same time.
+        :return: self
+        """
+        inside = threading.Barrier(3, timeout=5)
+
+        def read():
+            with self.lock.read():
+                inside.wait()  # Only passes if all three readers are in at once
+
+        threads = [threading.Thread(target=read) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertFalse(inside.broken)
+
+    def test_writers_exclude(self):
+        """
+        Tests that a writer never overlaps with readers or other writers.
+        :return: self
+        """
+        state = {'readers': 0, 'writers': 0, 'violations': 0}
+        state_lock = threading.Lock()
+
+        def enter(kind, lock_context):
+            for _ in range(200):
+                with lock_context():
+                    with state_lock:
+                        state[kind] += 1
+                        if state['writers'] > 1 or (state['writers'] and state['readers']):
+                            state['violations'] += 1
+                    time.sleep(0)
+                    with state_lock:
+                        state[kind] -= 1
+
+        threads = [threading.Thread(target=enter, args=('readers', self.lock.read)) for _ in range(4)]
+        threads += [threading.Thread(target=enter, args=('writers', self.lock.write)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(state['violations'], 0)
+
+    def test_waiting_writer_goes_first(self):
+        """
+        Tests that a waiting writer gets the lock before readers that came after it.
+        :return: self
+        """
+        order = []
+
+        def write():
+            with self.lock.write():
+                order.append('writer')
+
+        def read():
+            with self.lock.read():
+                order.append('reader')
+
+        with self.lock.read():
+            writer = threading.Thread(target=write)
+            writer.start()
+            while not self.lock._num_waiting_writers:
+                time.sleep(0.001)
+            reader = threading.Thread(target=read)
+            reader.start()
+            time.sleep(0.05)
+            self.assertEqual(order, [])  # The new reader waits behind the writer
+        writer.join()
+        reader.join()
+        self.assertEqual(order, ['writer', 'reader'])
+
+
+if __name__ == '__main__':
+    unittest.main()
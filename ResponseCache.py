@@ -0,0 +1,173 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from flask import Response
+from venv.Compression import negotiate_encoding, compress
+
+"""
+Reference:
+https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/ETag
+https://werkzeug.palletsprojects.com/en/latest/wrappers/#werkzeug.wrappers.Response.make_conditional
+"""
+
+
+class CachedResponse:
+    """
+    Serialized response kept by a ResponseCache, with the collection versions it was built from.
+    @author sahil1105
+    """
+
+    def __init__(self, body: bytes, status: int, mimetype: str, versions: tuple, headers: list = None):
+        """
+        Constructor for a CachedResponse. Responses are tagged with a strong ETag (a hash of the body).
+        :param body: The response body
+        :param status: The status code
+        :param mimetype: The mimetype of the body
+        :param versions: Versions of the collections the response depends on, when it was built
+        :param headers: List of (header, value) to send along, e.g. X-Total-Count
+        """
+        self.body = body
+        self.status = status
+        self.mimetype = mimetype
+        self.versions = versions
+        self.headers = headers or []
+        self.etag = hashlib.sha1(body).hexdigest()
+        self._compressed = {}  # Content coding --> compressed body, made when first asked for
+
+    def compressed_body(self, encoding: str) -> bytes:
+        """
+        Get the body compressed with a content coding, compressing it only the first time.
+        :param encoding: 'gzip' or 'deflate'
+        :return: The compressed body
+        """
+        body = self._compressed.get(encoding)
+        if body is None:
+            body = self._compressed[encoding] = compress(self.body, encoding)
+        return body
+
+    def to_response(self, request, min_compress_size: int = None) -> Response:
+        """
+        Build the response to a request, which is 304 Not Modified if the client already has the body.
+        Bodies of at least min_compress_size bytes are compressed if the client accepts it; every
+        coding is a different representation, with an ETag of its own (suffixed with the coding).
+        :param request: The flask request
+        :param min_compress_size: Smallest body, in bytes, to compress, None to never compress
+        :return: The flask Response
+        """
+        body, etag, encoding = self.body, self.etag, None
+        compressible = min_compress_size is not None and len(self.body) >= min_compress_size
+        if compressible:
+            encoding = negotiate_encoding(request)
+            if encoding is not None:
+                body, etag = self.compressed_body(encoding), self.etag + '-' + encoding
+        response = Response(body, status=self.status, mimetype=self.mimetype, headers=self.headers)
+        if compressible:
+            response.vary.add('Accept-Encoding')
+        if encoding is not None:
+            response.headers['Content-Encoding'] = encoding
+        if self.status == 200:
+            response.set_etag(etag)
+            response.make_conditional(request)
+        return response
+
+
+class ResponseCache:
+    """
+    LRU cache of GET responses, keyed by route and query. Every collection (e.g. 'actors')
+    has a version which writes to it bump, and a cached response is only served while the
+    collections it depends on are still at the versions it was built from.
+    @author sahil1105
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Constructor for an empty ResponseCache.
+        :param max_entries: Max number of responses to keep; the least recently used ones are evicted first
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(path: str, args) -> tuple:
+        """
+        Utility function to normalize a request into a cache key, so the order of the query arguments doesn't matter.
+        :param path: Path of the request
+        :param args: The query arguments (a werkzeug MultiDict)
+        :return: The cache key
+        """
+        return path, tuple(sorted(args.items(multi=True)))
+
+    def versions(self, collections) -> tuple:
+        """
+        Get the current versions of some collections, which clear then knows to bump.
+        :param collections: Names of the collections
+        :return: Tuple of versions, in the same order
+        """
+        with self._lock:
+            return tuple(self._versions.setdefault(collection, 0) for collection in collections)
+
+    def bump(self, collection: str):
+        """
+        Record a write to a collection, so responses built from it are no longer served.
+        :param collection: Name of the collection
+        :return: Nothing.
+        """
+        with self._lock:
+            self._versions[collection] = self._versions.get(collection, 0) + 1
+
+    def get(self, key: tuple, collections):
+        """
+        Look up a response that is still valid.
+        :param key: The cache key (see make_key)
+        :param collections: Names of the collections the response depends on
+        :return: The CachedResponse, or None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.versions == tuple(self._versions.get(c, 0) for c in collections):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            if entry is not None:
+                del self._entries[key]  # Stale
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, body: bytes, status: int, mimetype: str, versions: tuple,
+            headers: list = None) -> CachedResponse:
+        """
+        Add a response to the cache, evicting the least recently used one if the cache is full.
+        :param key: The cache key (see make_key)
+        :param body: The response body
+        :param status: The status code
+        :param mimetype: The mimetype of the body
+        :param versions: Versions of the collections the response was built from, read before building it
+        :param headers: List of (header, value) to send along
+        :return: The CachedResponse
+        """
+        entry = CachedResponse(body, status, mimetype, versions, headers)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        """
+        Drop all the cached responses, e.g. after the whole database was replaced. The versions of
+        the collections are bumped too, so responses still being built from the old database
+        aren't put back.
+        :return: Nothing.
+        """
+        with self._lock:
+            self._entries.clear()
+            for collection in self._versions:
+                self._versions[collection] += 1
@@ -0,0 +1,102 @@
+import gzip
+import unittest
+import zlib
+from flask import Flask, request
+from werkzeug.datastructures import MultiDict
+from venv.ResponseCache import ResponseCache
+
+
+class TestResponseCache(unittest.TestCase):
+    """
+    Unit Tests for the GET response cache of the API.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Creates a small cache.
+        :return: self
+        """
+        self.cache = ResponseCache(max_entries=2)
+
+    def test_key_normalization(self):
+        """
+        Tests that the order of the query arguments doesn't change the key.
+        :return: self
+        """
+        self.assertEqual(ResponseCache.make_key('/actors/', MultiDict([('age', '61'), ('name', 'A')])),
+                         ResponseCache.make_key('/actors/', MultiDict([('name', 'A'), ('age', '61')])))
+        self.assertNotEqual(ResponseCache.make_key('/actors/', MultiDict([('age', '61')])),
+                            ResponseCache.make_key('/movies/', MultiDict([('age', '61')])))
+
+    def test_invalidation_and_eviction(self):
+        """
+        Tests that writes to a collection invalidate its responses only, and that the least recently used go first.
+        :return: self
+        """
+        self.cache.put('a', b'[1]', 200, 'application/json', self.cache.versions(['actors']))
+        self.cache.put('m', b'[2]', 200, 'application/json', self.cache.versions(['movies']))
+        self.assertEqual(self.cache.get('a', ['actors']).body, b'[1]')
+        self.cache.bump('movies')
+        self.assertIsNone(self.cache.get('m', ['movies']))
+        self.assertIsNotNone(self.cache.get('a', ['actors']))
+        self.cache.put('m', b'[3]', 200, 'application/json', self.cache.versions(['movies']))
+        self.cache.put('x', b'[4]', 200, 'application/json', self.cache.versions(['actors']))
+        self.assertIsNone(self.cache.get('a', ['actors']))
+        self.assertEqual(len(self.cache), 2)
+        self.assertEqual((self.cache.hits, self.cache.misses), (2, 2))
+
+    def test_clear(self):
+        """
+        Tests that a response built from the database before the cache was cleared isn't served.
+        :return: self
+        """
+        versions = self.cache.versions(['actors', 'movies'])
+        self.cache.clear()
+        self.cache.put('a', b'[1]', 200, 'application/json', versions)
+        self.assertIsNone(self.cache.get('a', ['actors', 'movies']))
+        self.cache.put('a', b'[2]', 200, 'application/json', self.cache.versions(['actors', 'movies']))
+        self.assertEqual(self.cache.get('a', ['actors', 'movies']).body, b'[2]')
+
+    def test_conditional_response(self):
+        """
+        Tests that the ETag is strong and a matching If-None-Match gets a 304.
+        :return: self
+        """
+        entry = self.cache.put('a', b'[1]', 200, 'application/json', ())
+        app = Flask(__name__)
+        with app.test_request_context('/actors/'):
+            response = entry.to_response(request)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_etag(), (entry.etag, False))
+        with app.test_request_context('/actors/', headers={'If-None-Match': '"{}"'.format(entry.etag)}):
+            response = entry.to_response(request)
+            self.assertEqual(response.status_code, 304)
+
+
+    def test_compressed_response(self):
+        """
+        Tests that large bodies are compressed as the client accepts, with an ETag per coding.
+        :return: self
+        """
+        body = b'[' + b','.join([b'{"name":"Bruce Willis"}'] * 100) + b']'
+        entry = self.cache.put('a', body, 200, 'application/json', ())
+        app = Flask(__name__)
+        with app.test_request_context('/actors/', headers={'Accept-Encoding': 'gzip, deflate'}):
+            response = entry.to_response(request, min_compress_size=1024)
+            self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+            self.assertIn('Accept-Encoding', response.vary)
+            self.assertEqual(gzip.decompress(response.get_data()), body)
+            self.assertEqual(response.get_etag(), (entry.etag + '-gzip', False))
+            self.assertIs(entry.compressed_body('gzip'), entry.compressed_body('gzip'))  # Compressed once
+        with app.test_request_context('/actors/', headers={'Accept-Encoding': 'gzip;q=0, deflate'}):
+            response = entry.to_response(request, min_compress_size=1024)
+            self.assertEqual(zlib.decompress(response.get_data()), body)
+        with app.test_request_context('/actors/', headers={'Accept-Encoding': 'gzip'}):
+            response = entry.to_response(request, min_compress_size=len(body) + 1)  # Too small to bother
+            self.assertNotIn('Content-Encoding', response.headers)
+            self.assertEqual(response.get_data(), body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import argparse
+import http.client
+import multiprocessing
+import os
+import signal
+import time
+
+"""
+Benchmark of the throughput of the API served from a growing number of worker processes
+(see WebAPI.serve). Run it from the directory with data.json:
+python ServingBenchmark.py --workers 1 2 4 8 --clients 16 --requests 500
+"""
+
+
+def _client(host: str, port: int, paths: list, num_requests: int) -> int:
+    """
+    Utility function making requests to the server, cycling through the paths.
+    :param host: Host of the server
+    :param port: Port of the server
+    :param paths: Paths to request
+    :param num_requests: Number of requests to make
+    :return: Number of successful (status < 500) requests
+    """
+    successes = 0
+    for i in range(num_requests):
+        connection = http.client.HTTPConnection(host, port, timeout=30)
+        try:
+            connection.request('GET', paths[i % len(paths)])
+            response = connection.getresponse()
+            response.read()
+            successes += response.status < 500
+        finally:
+            connection.close()
+    return successes
+
+
+def _serve(serve, num_workers: int, host: str, port_queue):
+    """
+    Utility function running the server in a child process, reporting its port once it is up.
+    :param serve: Function serving the API, like WebAPI.serve
+    :return: Nothing.
+    """
+    serve(num_workers, host, 0, on_ready=port_queue.put)
+
+
+def measure_throughput(serve, num_workers: int, paths: list, num_clients: int = 8, num_requests: int = 200,
+                       host: str = '127.0.0.1') -> float:
+    """
+    Measure how many requests per second the API serves with a given number of worker processes.
+    :param serve: Function serving the API, like WebAPI.serve
+    :param num_workers: Number of worker processes of the server
+    :param paths: Paths to request, e.g. ['/actors/Bruce_Willis', '/movies/?year=1994']
+    :param num_clients: Number of client processes making requests at the same time
+    :param num_requests: Number of requests made by every client
+    :param host: Host to serve on
+    :return: Successful requests per second
+    """
+    context = multiprocessing.get_context('fork')
+    port_queue = context.Queue()
+    server = context.Process(target=_serve, args=(serve, num_workers, host, port_queue))
+    server.start()
+    try:
+        port = port_queue.get(timeout=60)
+        _client(host, port, paths, len(paths))  # Make sure the server is accepting connections
+        with context.Pool(num_clients) as pool:
+            start = time.perf_counter()
+            successes = sum(pool.starmap(_client, [(host, port, paths, num_requests)] * num_clients))
+            elapsed = time.perf_counter() - start
+    finally:
+        os.kill(server.pid, signal.SIGTERM)
+        server.join()
+    return successes / elapsed
+
+
+def run_benchmark(serve, worker_counts: list, paths: list, num_clients: int = 8, num_requests: int = 200) -> dict:
+    """
+    Measure the throughput of the API for every number of worker processes, printing a table as it goes.
+    :param serve: Function serving the API, like WebAPI.serve
+    :param worker_counts: Numbers of worker processes to try
+    :param paths: Paths to request
+    :param num_clients: Number of client processes making requests at the same time
+    :param num_requests: Number of requests made by every client
+    :return: Dict (number of workers --> requests per second)
+    """
+    results = {}
+    print("{:>8} {:>14} {:>8}".format("workers", "requests/s", "speedup"))
+    for num_workers in worker_counts:
+        results[num_workers] = measure_throughput(serve, num_workers, paths, num_clients, num_requests)
+        speedup = results[num_workers] / results[worker_counts[0]]
+        print("{:>8} {:>14.1f} {:>7.2f}x".format(num_workers, results[num_workers], speedup))
+    return results
+
+
+def __main__():
+    parser = argparse.ArgumentParser(description="Benchmark the API served from several processes.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument('--clients', type=int, default=2 * (os.cpu_count() or 1))
+    parser.add_argument('--requests', type=int, default=200, help="Requests per client")
+    parser.add_argument('--paths', nargs='+', default=['/actors/', '/movies/?year__gte=1990', '/actors/Bruce_Willis'])
+    parser.add_argument('--data', default='data.json', help="JSON file or binary snapshot (.snap) to serve")
+    args = parser.parse_args()
+    from venv.WebAPI import create_app, serve
+    create_app(args.data)
+    run_benchmark(serve, sorted(set(args.workers)), args.paths, args.clients, args.requests)
+
+
+if __name__ == '__main__':
+    __main__()
@@ -0,0 +1,331 @@
+import sqlite3
+import threading
+from collections import Counter
+from collections.abc import MutableMapping, ValuesView
+from contextlib import contextmanager
+from venv.Graph import Actor, Movie
+
+"""
+Reference:
+https://www.sqlite.org/lang_upsert.html
+https://www.sqlite.org/wal.html
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS actors (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    age,
+    gross_value
+);
+CREATE TABLE IF NOT EXISTS movies (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    year_released,
+    gross_value
+);
+CREATE TABLE IF NOT EXISTS cast_edges (
+    actor_name TEXT NOT NULL,
+    movie_name TEXT NOT NULL,
+    occurrence INTEGER NOT NULL DEFAULT 0,
+    filmography_pos INTEGER,
+    cast_pos INTEGER,
+    PRIMARY KEY (actor_name, movie_name, occurrence)
+);
+CREATE INDEX IF NOT EXISTS actors_age ON actors (age);
+CREATE INDEX IF NOT EXISTS actors_gross_value ON actors (gross_value);
+CREATE INDEX IF NOT EXISTS movies_year_released ON movies (year_released);
+CREATE INDEX IF NOT EXISTS movies_gross_value ON movies (gross_value);
+CREATE INDEX IF NOT EXISTS cast_edges_movie_name ON cast_edges (movie_name);
+"""
+
+# Databases made before cast edges had an occurrence (so a name could only be listed once)
+MIGRATE_CAST_EDGES = """
+ALTER TABLE cast_edges RENAME TO cast_edges_old;
+CREATE TABLE cast_edges (
+    actor_name TEXT NOT NULL,
+    movie_name TEXT NOT NULL,
+    occurrence INTEGER NOT NULL DEFAULT 0,
+    filmography_pos INTEGER,
+    cast_pos INTEGER,
+    PRIMARY KEY (actor_name, movie_name, occurrence)
+);
+INSERT INTO cast_edges (actor_name, movie_name, filmography_pos, cast_pos)
+    SELECT actor_name, movie_name, filmography_pos, cast_pos FROM cast_edges_old;
+DROP TABLE cast_edges_old;
+"""
+
+# Largest and smallest integers SQLite can store
+INTEGER_RANGE = (-2 ** 63, 2 ** 63 - 1)
+
+
+def check_column_value(value):
+    """
+    Utility function to check that an attribute value can be stored in a column and read back as it was.
+    :param value: The value
+    :return: Nothing.
+    :raises ValueError: If the value isn't None, a string, a float or an integer SQLite can hold
+    """
+    if value is None or isinstance(value, (str, float)):
+        return
+    if isinstance(value, int) and not isinstance(value, bool) and INTEGER_RANGE[0] <= value <= INTEGER_RANGE[1]:
+        return
+    raise ValueError("Can't store {!r} in the database.".format(value))
+
+
+class HollywoodDatabase:
+    """
+    SQLite database holding the ACTORS and MOVIES. Actors and movies each get a table,
+    and the movies_starred_in/actors lists are kept in a single cast edge table which
+    remembers the position of every entry in both lists. The 'actors' and 'movies'
+    attributes are dictionary-like views (name --> GraphNode) of the two tables.
+    @author sahil1105
+    """
+
+    def __init__(self, filename: str = 'hollywood.db'):
+        """
+        Constructor for a HollywoodDatabase. Creates the tables and indexes if needed.
+        :param filename: The SQLite database file, ':memory:' for a throwaway database
+        """
+        self.filename = filename
+        self.connection = sqlite3.connect(filename, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(cast_edges)")]
+        if columns and 'occurrence' not in columns:
+            self.connection.executescript("BEGIN;" + MIGRATE_CAST_EDGES + "COMMIT;")
+        self.connection.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._transaction_depth = 0
+        self.actors = SqliteNodeStore(self, 'actor')
+        self.movies = SqliteNodeStore(self, 'movie')
+
+    @contextmanager
+    def transaction(self):
+        """
+        Context manager running everything in it as one transaction, which is rolled back if
+        an exception is raised. Transactions can be nested, only the outermost one commits.
+        :return: The sqlite3 connection
+        """
+        with self._lock:
+            if self._transaction_depth == 0:
+                self.connection.execute("BEGIN")
+            self._transaction_depth += 1
+            try:
+                yield self.connection
+            except BaseException:
+                self._transaction_depth -= 1
+                if self._transaction_depth == 0:
+                    self.connection.execute("ROLLBACK")
+                raise
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self.connection.execute("COMMIT")
+
+    def load(self, actors: dict, movies: dict):
+        """
+        Store the given ACTORS and MOVIES in the database in one transaction.
+        :param actors: Dictionary (Actor name --> Actor Node)
+        :param movies: Dictionary (Movie name --> Movie Node)
+        :return: Nothing.
+        """
+        with self.transaction():
+            for name, node in actors.items():
+                self.actors[name] = node
+            for name, node in movies.items():
+                self.movies[name] = node
+
+    def close(self):
+        """
+        Closes the connection to the database.
+        :return: Nothing.
+        """
+        self.connection.close()
+
+
+class SqliteNodeStore(MutableMapping):
+    """
+    Dictionary (name --> GraphNode) view of the actors or movies table of a HollywoodDatabase.
+    Nodes are built from the database on every access, so a node changed in place must be
+    assigned back to the store to be saved. Iteration order is insertion order, like a dict.
+    The name of a node is the name it is stored under.
+    @author sahil1105
+    """
+
+    def __init__(self, database: HollywoodDatabase, list_type: str):
+        """
+        Constructor for a SqliteNodeStore.
+        :param database: The HollywoodDatabase the table is in
+        :param list_type: "actor" or "movie"
+        """
+        self.database = database
+        self.list_type = list_type
+        if list_type == "actor":
+            self.table, self.number_column = 'actors', 'age'
+            self.list_attr, self.name_column, self.other_column = 'movies_starred_in', 'actor_name', 'movie_name'
+            self.pos_column = 'filmography_pos'
+        else:
+            self.table, self.number_column = 'movies', 'year_released'
+            self.list_attr, self.name_column, self.other_column = 'actors', 'movie_name', 'actor_name'
+            self.pos_column = 'cast_pos'
+        self.columns = ['name', self.number_column, 'gross_value']
+
+    def _make_node(self, row, names_list):
+        """
+        Utility function to build a node out of its row and list of movies/actors.
+        :param row: (name, age or year_released, gross_value)
+        :param names_list: movies_starred_in of an actor or actors of a movie
+        :return: Actor or Movie node
+        """
+        node = Actor(*row) if self.list_type == "actor" else Movie(*row)
+        setattr(node, self.list_attr, names_list)
+        return node
+
+    def _get_names_list(self, name):
+        """
+        Utility function to read the movies_starred_in/actors list of a node.
+        :param name: Name of the node
+        :return: List of names, in order
+        """
+        rows = self.database.connection.execute(
+            "SELECT {} FROM cast_edges WHERE {} = ? AND {} IS NOT NULL ORDER BY {}".format(
+                self.other_column, self.name_column, self.pos_column, self.pos_column), (name,))
+        return [other_name for other_name, in rows]
+
+    def __getitem__(self, name):
+        with self.database.transaction() as connection:
+            row = connection.execute("SELECT name, {}, gross_value FROM {} WHERE name = ?".format(
+                self.number_column, self.table), (name,)).fetchone()
+            if row is None:
+                raise KeyError(name)
+            return self._make_node(row, self._get_names_list(name))
+
+    def __setitem__(self, name, node):
+        names_list = getattr(node, self.list_attr)
+        check_column_value(getattr(node, self.number_column))
+        check_column_value(node.gross_value)
+        if not isinstance(names_list, (list, tuple)) or not all(isinstance(other, str) for other in names_list):
+            raise ValueError("{} must be a list of names.".format(self.list_attr))
+        occurrences = Counter()
+        entries = []
+        for pos, other_name in enumerate(names_list):
+            entries.append((name, other_name, occurrences[other_name], pos))
+            occurrences[other_name] += 1  # The k-th listing on one side pairs with the k-th on the other
+        with self.database.transaction() as connection:
+            connection.execute(
+                "INSERT INTO {0} (name, {1}, gross_value) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET {1} = excluded.{1}, gross_value = excluded.gross_value".format(
+                    self.table, self.number_column),
+                (name, getattr(node, self.number_column), node.gross_value))
+            self._clear_names_list(connection, name)
+            connection.executemany(
+                "INSERT INTO cast_edges ({0}, {1}, occurrence, {2}) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(actor_name, movie_name, occurrence) DO UPDATE SET {2} = excluded.{2}".format(
+                    self.name_column, self.other_column, self.pos_column), entries)
+
+    def _clear_names_list(self, connection, name):
+        """
+        Utility function to remove the movies_starred_in/actors list of a node from the cast edge table.
+        Entries still listed by the node on the other side are kept.
+        :param connection: Connection in a transaction
+        :param name: Name of the node
+        :return: Nothing.
+        """
+        connection.execute("UPDATE cast_edges SET {} = NULL WHERE {} = ?".format(self.pos_column, self.name_column),
+                           (name,))
+        connection.execute("DELETE FROM cast_edges WHERE {} = ? AND filmography_pos IS NULL AND cast_pos IS NULL"
+                           .format(self.name_column), (name,))
+
+    def __delitem__(self, name):
+        with self.database.transaction() as connection:
+            if connection.execute("DELETE FROM {} WHERE name = ?".format(self.table), (name,)).rowcount == 0:
+                raise KeyError(name)
+            self._clear_names_list(connection, name)
+
+    def __contains__(self, name):
+        with self.database.transaction() as connection:
+            return connection.execute("SELECT 1 FROM {} WHERE name = ?".format(self.table),
+                                      (name,)).fetchone() is not None
+
+    def __iter__(self):
+        with self.database.transaction() as connection:
+            names = [name for name, in connection.execute("SELECT name FROM {} ORDER BY seq".format(self.table))]
+        return iter(names)
+
+    def __len__(self):
+        with self.database.transaction() as connection:
+            return connection.execute("SELECT COUNT(*) FROM {}".format(self.table)).fetchone()[0]
+
+    def values(self):
+        return _SqliteValuesView(self)
+
+    def _select_nodes(self, where: str = '', params: tuple = ()) -> list:
+        """
+        Utility function to build all the nodes matching the given WHERE clause with two queries.
+        :param where: SQL condition on the columns of the table, empty for all the nodes
+        :param params: Parameters of the condition
+        :return: List of nodes, in insertion order
+        """
+        where = "WHERE {}".format(where) if where else ''
+        with self.database.transaction() as connection:
+            rows = connection.execute("SELECT name, {}, gross_value FROM {} {} ORDER BY seq".format(
+                self.number_column, self.table, where), params).fetchall()
+            names_lists = {row[0]: [] for row in rows}
+            edges = connection.execute(
+                "SELECT {0}, {1} FROM cast_edges WHERE {2} IS NOT NULL AND {0} IN (SELECT name FROM {3} {4}) "
+                "ORDER BY {0}, {2}".format(self.name_column, self.other_column, self.pos_column, self.table, where),
+                params)
+            for name, other_name in edges:
+                names_lists[name].append(other_name)
+        return [self._make_node(row, names_lists[row[0]]) for row in rows]
+
+    def find_matching(self, conditions: list, match_all: bool = True) -> list:
+        """
+        Find the nodes whose attributes match the given values when both are converted to
+        strings, like WebAPI.filter_list does. Conditions on the name, age/year and gross
+        value are pushed down into SQL and use the indexes; the string comparison is then
+        checked on the rows SQL returned.
+        :param conditions: List of (node attribute name, value) pairs
+        :param match_all: True if all the conditions must hold, False if any of them must
+        :return: List of the __dict__ of the matching nodes, in insertion order
+        """
+        clauses, params = [], []
+        for attr, attr_value in conditions:
+            if attr not in self.columns:
+                # Lists can't be pushed down, the WHERE clause only narrows the AND case then
+                if not match_all:
+                    clauses, params = [], []
+                    break
+                continue
+            candidates = _sql_candidates(attr_value)
+            clauses.append("{} IN ({})".format(attr, ', '.join('?' * len(candidates))))
+            params.extend(candidates)
+        nodes = self._select_nodes((' AND ' if match_all else ' OR ').join(clauses), tuple(params))
+        check = all if match_all else any
+        return [node.__dict__ for node in nodes
+                if check(str(node.__dict__[attr]) == str(attr_value) for attr, attr_value in conditions)]
+
+
+class _SqliteValuesView(ValuesView):
+    """
+    Values view of a SqliteNodeStore that reads all the nodes with two queries instead of one per node.
+    """
+
+    def __iter__(self):
+        return iter(self._mapping._select_nodes())
+
+
+def _sql_candidates(attr_value) -> list:
+    """
+    Utility function to get the values a column can hold for its string form to equal the given value.
+    :param attr_value: The value to look for
+    :return: List of candidate values to look up in the index
+    """
+    attr_value = str(attr_value)
+    candidates = [attr_value]
+    for number_type in (int, float):
+        try:
+            candidates.append(number_type(attr_value))
+        except ValueError:
+            pass
+    return candidates
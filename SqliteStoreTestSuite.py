@@ -0,0 +1,149 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from venv.Graph import Actor, Movie
+from venv.SqliteStore import HollywoodDatabase
+
+
+class TestSqliteStore(unittest.TestCase):
+    """
+    Unit Tests for the SQLite backed storage of ACTORS and MOVIES.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Creates a database with a few actors and movies.
+        :return: self
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'hollywood.db')
+        self.database = HollywoodDatabase(self.filename)
+        willis = Actor('Bruce Willis', 61, 562709189)
+        willis.movies_starred_in = ['The Jackal', 'Die Hard']
+        warden = Actor('Jack Warden', 85, 1234.5)
+        warden.movies_starred_in = ['The Verdict']
+        verdict = Movie('The Verdict', 1982, 54000000)
+        verdict.actors = ['Paul Newman', 'Jack Warden']
+        self.database.load({'Bruce Willis': willis, 'Jack Warden': warden}, {'The Verdict': verdict})
+
+    def tearDown(self):
+        """
+        Closes and removes the database.
+        :return: self
+        """
+        self.database.close()
+        self.directory.cleanup()
+
+    def test_round_trip(self):
+        """
+        Tests that nodes come back with the same attributes and lists, in insertion order.
+        :return: self
+        """
+        actors, movies = self.database.actors, self.database.movies
+        self.assertEqual(list(actors), ['Bruce Willis', 'Jack Warden'])
+        self.assertEqual(len(movies), 1)
+        self.assertIn('The Verdict', movies)
+        self.assertNotIn('Die Hard', movies)
+        self.assertEqual(actors['Bruce Willis'].__dict__,
+                         dict(name='Bruce Willis', age=61, gross_value=562709189,
+                              movies_starred_in=['The Jackal', 'Die Hard'], edges=[], edge_weights=[]))
+        self.assertEqual(movies['The Verdict'].actors, ['Paul Newman', 'Jack Warden'])
+        self.assertEqual([node.name for node in actors.values()], ['Bruce Willis', 'Jack Warden'])
+        self.assertEqual(type(movies['The Verdict']), Movie)
+
+    def test_writes_are_durable(self):
+        """
+        Tests that updates and deletes survive reopening the database, and that removing one
+        side of the cast edge keeps the other.
+        :return: self
+        """
+        warden = self.database.actors['Jack Warden']
+        warden.age = 86
+        warden.movies_starred_in = []
+        self.database.actors['Jack Warden'] = warden
+        del self.database.actors['Bruce Willis']
+        self.assertRaises(KeyError, self.database.actors.__delitem__, 'Bruce Willis')
+        self.database.close()
+        self.database = HollywoodDatabase(self.filename)
+        self.assertEqual(list(self.database.actors), ['Jack Warden'])
+        self.assertEqual(self.database.actors['Jack Warden'].age, 86)
+        self.assertEqual(self.database.actors['Jack Warden'].movies_starred_in, [])
+        self.assertEqual(self.database.movies['The Verdict'].actors, ['Paul Newman', 'Jack Warden'])
+
+    def test_transaction_rollback(self):
+        """
+        Tests that a failed transaction leaves the database untouched.
+        :return: self
+        """
+        try:
+            with self.database.transaction():
+                self.database.actors['Mila Kunis'] = Actor('Mila Kunis', 31)
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+        self.assertNotIn('Mila Kunis', self.database.actors)
+
+    def test_find_matching(self):
+        """
+        Tests that pushed down filters compare like WebAPI.filter_list does.
+        :return: self
+        """
+        actors = self.database.actors
+        self.assertEqual([item['name'] for item in actors.find_matching([('age', '61')])], ['Bruce Willis'])
+        self.assertEqual([item['name'] for item in actors.find_matching([('gross_value', '1234.5')])],
+                         ['Jack Warden'])
+        self.assertEqual(actors.find_matching([('age', '61'), ('name', 'Jack Warden')]), [])
+        self.assertEqual([item['name'] for item in actors.find_matching([('age', '61'), ('name', 'Jack Warden')],
+                                                                        match_all=False)],
+                         ['Bruce Willis', 'Jack Warden'])
+        self.assertEqual([item['name'] for item in actors.find_matching([('movies_starred_in', "['The Verdict']")])],
+                         ['Jack Warden'])
+        self.assertEqual(actors.find_matching([('age', '61.0')]), [])
+
+    def test_lists_and_values(self):
+        """
+        Tests that lists listing a name twice come back as they were, and that values a column
+        can't hold are turned down.
+        :return: self
+        """
+        willis = self.database.actors['Bruce Willis']
+        willis.movies_starred_in = ['The Verdict', 'Die Hard', 'The Verdict']
+        self.database.actors['Bruce Willis'] = willis
+        verdict = self.database.movies['The Verdict']
+        verdict.actors = ['Bruce Willis', 'Bruce Willis', 'Jack Warden']
+        self.database.movies['The Verdict'] = verdict
+        self.assertEqual(self.database.actors['Bruce Willis'].movies_starred_in,
+                         ['The Verdict', 'Die Hard', 'The Verdict'])
+        self.assertEqual(self.database.movies['The Verdict'].actors, ['Bruce Willis', 'Bruce Willis', 'Jack Warden'])
+        willis.age = [1]
+        self.assertRaises(ValueError, self.database.actors.__setitem__, 'Bruce Willis', willis)
+        willis.age, willis.movies_starred_in = 61, 'Die Hard'
+        self.assertRaises(ValueError, self.database.actors.__setitem__, 'Bruce Willis', willis)
+        self.assertEqual(self.database.actors['Bruce Willis'].age, 61)
+
+    def test_migrate_cast_edges(self):
+        """
+        Tests that a database made before cast edges had an occurrence is brought up to date.
+        :return: self
+        """
+        self.database.close()
+        filename = os.path.join(self.directory.name, 'old.db')
+        connection = sqlite3.connect(filename)
+        connection.executescript("CREATE TABLE cast_edges (actor_name TEXT NOT NULL, movie_name TEXT NOT NULL, "
+                                 "filmography_pos INTEGER, cast_pos INTEGER, PRIMARY KEY (actor_name, movie_name));"
+                                 "INSERT INTO cast_edges VALUES ('Jack Warden', 'The Verdict', 0, 1);")
+        connection.close()
+        self.database = HollywoodDatabase(filename)
+        self.database.actors['Jack Warden'] = Actor('Jack Warden', 85)
+        self.assertEqual(self.database.movies.find_matching([]), [])
+        self.assertEqual(self.database.actors['Jack Warden'].movies_starred_in, [])
+        verdict = Movie('The Verdict', 1982, 1)
+        verdict.actors = ['Paul Newman', 'Jack Warden', 'Jack Warden']
+        self.database.movies['The Verdict'] = verdict
+        self.assertEqual(self.database.movies['The Verdict'].actors, ['Paul Newman', 'Jack Warden', 'Jack Warden'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,208 @@
+import copy
+import threading
+from contextlib import contextmanager
+from types import MappingProxyType
+
+
+def _copy_node(node):
+    """
+    Utility function to make a copy of a GraphNode that can be changed without affecting the original.
+    The lists of the node are copied, the nodes on its edges are shared.
+    :param node: The Actor or Movie node
+    :return: The copy
+    """
+    new_node = copy.copy(node)
+    for attr, value in node.__dict__.items():
+        if isinstance(value, list):
+            setattr(new_node, attr, list(value))
+    return new_node
+
+
+class GraphVersion:
+    """
+    Immutable version of the ACTORS and MOVIES dictionaries. The nodes of a version must
+    not be changed in place; a GraphWriter hands out copies for that. Since nodes are copied
+    on write, the edges of a node may point at nodes of an older version, so neighbours
+    should be looked up by name in the version (see neighbors).
+    @author sahil1105
+    """
+
+    def __init__(self, number: int, actors: dict, movies: dict):
+        """
+        Constructor for a GraphVersion.
+        :param number: Version number, increasing with every commit
+        :param actors: Dictionary (Actor name --> Actor Node), owned by the version from now on
+        :param movies: Dictionary (Movie name --> Movie Node), owned by the version from now on
+        """
+        self.number = number
+        self._actors = actors
+        self._movies = movies
+        self.actors = MappingProxyType(actors)
+        self.movies = MappingProxyType(movies)
+
+    def neighbors(self, name: str, is_actor: bool = True) -> list:
+        """
+        Get the nodes of this version on the other side of the edges of a node.
+        :param name: Name of the node
+        :param is_actor: True if the node is an actor, False if it is a movie
+        :return: List of the neighbouring nodes that exist in this version
+        """
+        nodes, other_nodes = (self.actors, self.movies) if is_actor else (self.movies, self.actors)
+        if name not in nodes:
+            return []
+        return [other_nodes[edge.name] for edge in nodes[name].edges if edge.name in other_nodes]
+
+
+class GraphWriter:
+    """
+    Builds the next version of a VersionedGraph. The dictionaries of the base version are
+    copied the first time they are written to, and nodes are copied the first time they are
+    edited, so everything that isn't changed is shared with the base version.
+    @author sahil1105
+    """
+
+    def __init__(self, base: GraphVersion):
+        """
+        Constructor for a GraphWriter.
+        :param base: The version the changes are applied on top of
+        """
+        self.base = base
+        self._dicts = {True: base._actors, False: base._movies}
+        self._copied_dicts = set()
+        self._copied_nodes = {True: set(), False: set()}
+
+    def _writable_dict(self, is_actor: bool) -> dict:
+        """
+        Utility function to get the dictionary of the new version, copying the base one if needed.
+        :param is_actor: True for the actors, False for the movies
+        :return: Dictionary (name --> node) that can be changed
+        """
+        if is_actor not in self._copied_dicts:
+            self._dicts[is_actor] = dict(self._dicts[is_actor])
+            self._copied_dicts.add(is_actor)
+        return self._dicts[is_actor]
+
+    def get(self, name: str, is_actor: bool = True):
+        """
+        Get a node as it currently is in the new version. The node must not be changed, use edit for that.
+        :param name: Name of the node
+        :param is_actor: True for an actor, False for a movie
+        :return: The node, or None if there is no such node
+        """
+        return self._dicts[is_actor].get(name)
+
+    def edit(self, name: str, is_actor: bool = True):
+        """
+        Get a node of the new version that can be changed in place.
+        :param name: Name of the node
+        :param is_actor: True for an actor, False for a movie
+        :return: The node, copied from the base version on the first edit
+        :raises KeyError: If there is no such node in the new version
+        """
+        if name not in self._dicts[is_actor]:
+            raise KeyError("Can't edit {}: no {} of that name in the version, add it with put.".format(
+                name, 'actor' if is_actor else 'movie'))
+        nodes = self._writable_dict(is_actor)
+        if name not in self._copied_nodes[is_actor]:
+            nodes[name] = _copy_node(nodes[name])
+            self._copied_nodes[is_actor].add(name)
+        return nodes[name]
+
+    def put(self, name: str, node, is_actor: bool = True):
+        """
+        Add or replace a node in the new version. The node belongs to the new version from now on.
+        :param name: Name of the node
+        :param node: The Actor or Movie node
+        :param is_actor: True for an actor, False for a movie
+        :return: self
+        """
+        self._writable_dict(is_actor)[name] = node
+        self._copied_nodes[is_actor].add(name)
+        return self
+
+    def delete(self, name: str, is_actor: bool = True):
+        """
+        Remove a node from the new version, if it is there.
+        :param name: Name of the node
+        :param is_actor: True for an actor, False for a movie
+        :return: self
+        """
+        if name in self._dicts[is_actor]:
+            del self._writable_dict(is_actor)[name]
+        return self
+
+    def has_changes(self) -> bool:
+        """
+        Check whether anything was written.
+        :return: True if any of the dictionaries was changed
+        """
+        return bool(self._copied_dicts)
+
+
+class VersionedGraph:
+    """
+    Copy-on-write store of the ACTORS and MOVIES dictionaries. Readers pin the current
+    version and keep seeing it, untouched, for as long as they hold it, while a writer
+    builds the next version out of the unchanged parts of the current one. Versions that
+    are neither current nor pinned are dropped, so they are reclaimed once readers let go.
+    This is a library for programs that read a graph while ingesting into it: the scraper
+    and WebAPI don't use it (WebAPI guards its database with an RWLock instead).
+    @author sahil1105
+    """
+
+    def __init__(self, actors: dict = None, movies: dict = None):
+        """
+        Constructor for a VersionedGraph.
+        :param actors: Dictionary (Actor name --> Actor Node), owned by the store from now on
+        :param movies: Dictionary (Movie name --> Movie Node), owned by the store from now on
+        """
+        self._current = GraphVersion(0, actors if actors is not None else {}, movies if movies is not None else {})
+        self._pins = {}  # version number --> [version, number of readers holding it]
+        self._pin_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    @property
+    def current(self) -> GraphVersion:
+        """
+        Get the latest committed version, without pinning it.
+        :return: The current GraphVersion
+        """
+        return self._current
+
+    @contextmanager
+    def pin(self):
+        """
+        Context manager pinning the current version for reading.
+        :return: The pinned GraphVersion
+        """
+        with self._pin_lock:
+            version = self._current
+            self._pins.setdefault(version.number, [version, 0])[1] += 1
+        try:
+            yield version
+        finally:
+            with self._pin_lock:
+                self._pins[version.number][1] -= 1
+                if self._pins[version.number][1] == 0:
+                    del self._pins[version.number]
+
+    @contextmanager
+    def write(self):
+        """
+        Context manager for building and publishing the next version. Writers take turns, and
+        the new version is only published if the block finishes without an exception.
+        :return: GraphWriter to apply the changes with
+        """
+        with self._write_lock:
+            writer = GraphWriter(self._current)
+            yield writer
+            if writer.has_changes():
+                self._current = GraphVersion(writer.base.number + 1, writer._dicts[True], writer._dicts[False])
+
+    def live_versions(self) -> list:
+        """
+        Get the numbers of the versions still held by the store, i.e. the current one and the pinned ones.
+        :return: Sorted list of version numbers
+        """
+        with self._pin_lock:
+            return sorted(set(self._pins) | {self._current.number})
@@ -0,0 +1,94 @@
+import threading
+import unittest
+from venv.Graph import Actor, Movie, make_graph
+from venv.VersionedGraph import VersionedGraph
+
+
+class TestVersionedGraph(unittest.TestCase):
+    """
+    Unit Tests for the copy-on-write graph versions.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Sets up a store holding a small graph.
+        :return: self
+        """
+        verdict = Movie('The Verdict', 1982, 54000000)
+        verdict.actors = ['Paul Newman', 'Jack Warden']
+        actors = {'Paul Newman': Actor('Paul Newman', 83), 'Jack Warden': Actor('Jack Warden', 85)}
+        self.actors, self.movies = make_graph(actors, {'The Verdict': verdict})
+        self.graph = VersionedGraph(self.actors, self.movies)
+
+    def test_pinned_readers_are_isolated(self):
+        """
+        Tests that a pinned version doesn't see later writes, and that unchanged nodes are shared.
+        :return: self
+        """
+        with self.graph.pin() as version:
+            with self.graph.write() as writer:
+                writer.edit('Paul Newman').age = 84
+                writer.put('Mila Kunis', Actor('Mila Kunis', 31))
+                writer.delete('The Verdict', is_actor=False)
+            self.assertEqual(version.number, 0)
+            self.assertEqual(version.actors['Paul Newman'].age, 83)
+            self.assertNotIn('Mila Kunis', version.actors)
+            self.assertEqual([node.name for node in version.neighbors('Paul Newman')], ['The Verdict'])
+            self.assertEqual(self.graph.live_versions(), [0, 1])
+        current = self.graph.current
+        self.assertEqual(current.number, 1)
+        self.assertEqual(current.actors['Paul Newman'].age, 84)
+        self.assertIs(current.actors['Jack Warden'], self.actors['Jack Warden'])
+        self.assertIsNot(current.actors['Paul Newman'].edges, self.actors['Paul Newman'].edges)
+        self.assertEqual(current.neighbors('Paul Newman'), [])
+        self.assertEqual(self.graph.live_versions(), [1])
+        with self.assertRaises(TypeError):
+            current.actors['Jason Statham'] = Actor('Jason Statham', 50)
+
+    def test_failed_writes_are_discarded(self):
+        """
+        Tests that a writer raising an exception doesn't publish anything.
+        :return: self
+        """
+        try:
+            with self.graph.write() as writer:
+                writer.edit('Paul Newman').age = 20
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+        self.assertEqual(self.graph.current.number, 0)
+        self.assertEqual(self.graph.current.actors['Paul Newman'].age, 83)
+        with self.graph.write() as writer:
+            with self.assertRaisesRegex(KeyError, 'no actor of that name'):
+                writer.edit('Nobody')
+        self.assertEqual(self.graph.current.number, 0)
+
+    def test_concurrent_readers(self):
+        """
+        Tests that readers never see a half-applied write while a writer keeps committing.
+        :return: self
+        """
+        torn_reads = []
+
+        def read():
+            for _ in range(2000):
+                with self.graph.pin() as version:
+                    if version.actors['Paul Newman'].age != version.actors['Jack Warden'].age - 2:
+                        torn_reads.append(version.number)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        for reader in readers:
+            reader.start()
+        for _ in range(500):
+            with self.graph.write() as writer:
+                writer.edit('Paul Newman').age += 1
+                writer.edit('Jack Warden').age += 1
+        for reader in readers:
+            reader.join()
+        self.assertEqual(torn_reads, [])
+        self.assertEqual(self.graph.current.actors['Paul Newman'].age, 583)
+
+
+if __name__ == '__main__':
+    unittest.main()
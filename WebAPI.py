@@ -1,6 +1,35 @@
-from flask import Flask, jsonify, request,abort, make_response
+import argparse
+import copy
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from contextlib import nullcontext
+from itertools import count, islice
+from functools import wraps
+from math import isnan
+from flask import Flask, jsonify, request,abort, make_response, Response, g
 from venv.DataAnalysis import extract_from_json
 from venv.Graph import make_graph, Actor, Movie
+from venv.SqliteStore import HollywoodDatabase, SqliteNodeStore, check_column_value
+from venv.GraphSnapshot import load_snapshot, save_snapshot
+from venv.LazyGraph import extract_lazily_from_json, LazyNodeStore
+from venv.AttributeIndex import AttributeIndex, as_number
+from venv.Aggregates import GroupedAggregate, year_group, age_group, gross_value_per_movie, exact_number
+from venv.CastGraph import CastGraph
+from venv.NameSearch import NameIndex
+from venv.QueryPlanner import EqualsPredicate, RangePredicate, plan_query
+from venv.ResponseCache import ResponseCache
+from venv.JsonFragments import FragmentCache, join_fragments, dumps
+from venv.Compression import compress_response
+from venv.PreforkServer import serve_prefork
+from venv.Metrics import Metrics, SIZE_BUCKETS
+from venv.RWLock import RWLock
+from venv.WriteAheadLog import WriteAheadLog
 
 """
 Reference:
@@ -8,8 +37,20 @@ https://blog.miguelgrinberg.com/post/designing-a-restful-api-with-python-and-fla
 https://stackoverflow.com/questions/405489/python-update-object-from-dictionary
 """
 
-# Actors and Movies Dicts that serve as the database for the API
-ACTORS, MOVIES = extract_from_json('data.json', 50, 50)
+# SQLite database backing ACTORS and MOVIES, if use_sqlite_storage has been called
+DATABASE = None
+
+# Actors and Movies Dicts that serve as the database for the API, filled by load_dataset (see create_app)
+ACTORS, MOVIES = {}, {}
+
+# Log of the changes made through the API, so they survive restarts, if the database was loaded with one
+WRITE_LOG = None
+
+# Progress of loading the database: state is 'empty', 'loading', 'ready' or 'failed'
+LOAD_STATUS = {'state': 'empty', 'source': None, 'seconds': None, 'error': None}
+# Endpoints that can be served before the database is ready
+ALWAYS_AVAILABLE_ENDPOINTS = {'handle_ready_request', 'index', 'handle_options_request', 'handle_metrics_request',
+                              'handle_profile_request'}
 
 # Dictionaries to help convert JSON attribute values to GraphNode variable names
 ACTOR_JSON_TO_NODE_DICT = {'name': 'name',
@@ -21,6 +62,95 @@ MOVIE_JSON_TO_NODE_DICT = {'name': 'name',
                             'year': 'year_released',
                             'actors': 'actors'}
 
+# Numeric GraphNode variables that can be queried by range, e.g. /actors/?age__gte=40
+ACTOR_SORTED_ATTRS = ['age', 'gross_value']
+MOVIE_SORTED_ATTRS = ['year_released', 'gross_value']
+RANGE_OPERATORS = {'gt', 'gte', 'lt', 'lte', 'between'}
+
+# Indexes of the attribute values of the ACTORS and MOVIES, to answer filters without scanning
+ACTOR_INDEX = AttributeIndex(ACTOR_JSON_TO_NODE_DICT.values(), ACTOR_SORTED_ATTRS)
+MOVIE_INDEX = AttributeIndex(MOVIE_JSON_TO_NODE_DICT.values(), MOVIE_SORTED_ATTRS)
+
+# Graph of which actors starred in which movies, by name, for the traversal endpoints
+CAST_GRAPH = CastGraph()
+# Limits on traversals: hops of a neighborhood, nodes it visits, and movies on a path between actors
+MAX_GRAPH_DEPTH = 4
+MAX_GRAPH_NODES = 10000
+MAX_PATH_LENGTH = 6
+
+# Indexes of the names of the ACTORS and MOVIES, for search and autocomplete
+ACTOR_NAMES = NameIndex()
+MOVIE_NAMES = NameIndex()
+# Ways to rank search results, see get_search_score
+SEARCH_RANKS = {'gross', 'degree', 'name'}
+
+# Width of the age buckets actors are grouped by, in years
+AGE_BUCKET_SIZE = 10
+# Aggregates of the ACTORS and MOVIES, by collection, group and aggregated value, kept up to date on
+# every write so the aggregate endpoints never scan a collection
+AGGREGATES = {
+    ('movies', 'year', 'gross_value'): GroupedAggregate(year_group, lambda movie: exact_number(
+        getattr(movie, 'gross_value', None))),
+    ('actors', 'age', 'gross_value'): GroupedAggregate(lambda actor: age_group(actor, AGE_BUCKET_SIZE),
+                                                       lambda actor: exact_number(getattr(actor, 'gross_value', None))),
+    ('actors', 'age', 'gross_per_movie'): GroupedAggregate(lambda actor: age_group(actor, AGE_BUCKET_SIZE),
+                                                           gross_value_per_movie),
+}
+
+# Lock taken for reading by every request that reads the database, and for writing by every request
+# that changes it, so a write (of a single node or a whole batch) is never seen half-applied
+DATABASE_LOCK = RWLock()
+
+# Cache of GET responses, invalidated by writes to the collection ('actors' or 'movies') they read
+RESPONSE_CACHE = ResponseCache(max_entries=1024)
+
+# Serialized JSON of the nodes, to assemble responses without encoding every node again
+FRAGMENTS = FragmentCache()
+
+# Query arguments that control a request instead of filtering on an attribute
+RESERVED_QUERY_ARGS = {'explain', 'limit', 'cursor', 'stream', 'fields'}
+
+# True while the database is shared read-only between worker processes, see serve
+READ_ONLY = False
+# Endpoints that take a POST request but don't write
+READ_ONLY_ENDPOINTS = {'handle_actor_batch_get_request', 'handle_movie_batch_get_request'}
+
+# Max number of objects in one request to the batch endpoints
+MAX_BATCH_SIZE = 10000
+
+# Max number of objects in a page of a paginated response (?limit=...)
+MAX_PAGE_SIZE = 1000
+
+# Smallest response body, in bytes, sent compressed to clients that accept it
+MIN_COMPRESS_SIZE = 1024
+
+# Measurements of the requests, served by /metrics. Every worker process (see serve) keeps its own.
+METRICS = Metrics()
+METRICS.describe('webapi_request_seconds', 'histogram', "Time to handle a request, by route and method.")
+METRICS.describe('webapi_requests_total', 'counter', "Requests handled, by route, method and status.")
+METRICS.describe('webapi_result_size', 'histogram', "Objects matching list queries, by route.", SIZE_BUCKETS)
+METRICS.describe('webapi_phase_seconds', 'histogram', "Time spent filtering and serializing, by phase.")
+METRICS.describe('webapi_lock_wait_seconds', 'histogram', "Time waiting for DATABASE_LOCK, by mode.")
+METRICS.describe('webapi_query_access_total', 'counter', "Queries by collection and how they were answered.")
+METRICS.describe('webapi_plan_steps_total', 'counter', "Steps of the index query plans run, by access method.")
+METRICS.describe('webapi_response_cache_hits_total', 'counter', "GET responses served from RESPONSE_CACHE.")
+METRICS.describe('webapi_response_cache_misses_total', 'counter', "GET responses that had to be built.")
+METRICS.describe('webapi_response_cache_entries', 'gauge', "Responses held in RESPONSE_CACHE.")
+METRICS.describe('webapi_fragment_cache_entries', 'gauge', "Serialized nodes held in FRAGMENTS.")
+METRICS.add_collector(lambda: [('webapi_response_cache_hits_total', {}, RESPONSE_CACHE.hits),
+                               ('webapi_response_cache_misses_total', {}, RESPONSE_CACHE.misses),
+                               ('webapi_response_cache_entries', {}, len(RESPONSE_CACHE)),
+                               ('webapi_fragment_cache_entries', {}, len(FRAGMENTS))])
+
+# Requests sent with this header are profiled with cProfile, if ALLOW_PROFILING is set
+PROFILE_HEADER = 'X-Profile'
+ALLOW_PROFILING = False
+# Profiles of the last requests profiled, see /profiles/<id>
+PROFILES = OrderedDict()
+PROFILES_LOCK = threading.Lock()
+PROFILE_IDS = count(1)
+MAX_PROFILES = 32
+
 app = Flask(__name__)  # The flask API object
 app.config.from_object(__name__)  # Load the dicts above into the API environment
 
@@ -30,7 +160,7 @@ def filter_list(list_to_filter, attr, attr_value, list_type):
     Utility function to filter a given list based on the whether it has the given
     values for the given attributes. Keeps the objects where all the objects have the
     given attr_vals for the corresponding attrs.
-    :param list_to_filter: The list of objects to filter.
+    :param list_to_filter: The list of objects to filter, or a SqliteNodeStore to push the filter down into.
     :param attr: The attribute to filter on.
     :param attr_value: The value to filter for,
     :param list_type: "actor" or "movie"
@@ -41,6 +171,8 @@ def filter_list(list_to_filter, attr, attr_value, list_type):
     elif list_type == "movie" and attr not in MOVIE_JSON_TO_NODE_DICT:
         return []
     dict_to_use = ACTOR_JSON_TO_NODE_DICT if list_type == "actor" else MOVIE_JSON_TO_NODE_DICT
+    if isinstance(list_to_filter, SqliteNodeStore):
+        return list_to_filter.find_matching([(dict_to_use[attr], attr_value)])
     filtered_list = []
     for i, item in enumerate(list_to_filter):
         item = item.__dict__ if type(item) != dict else item
@@ -54,7 +186,7 @@ def filter_list_or(list_to_filter, attrs, attr_vals, list_type):
     Utility function to filter a list based on whether the object has any of the attribute values
     for the given attributes. Keeps the objects in which atleast one attr_vals matches the
     given ones for the given attrs.
-    :param list_to_filter: The list of objects to filter
+    :param list_to_filter: The list of objects to filter, or a SqliteNodeStore to push the filter down into.
     :param attrs: The attributes to filter on
     :param attr_vals: The values to filter for
     :param list_type: "actor" or "movie"
@@ -65,6 +197,9 @@ def filter_list_or(list_to_filter, attrs, attr_vals, list_type):
     if list_type == "movie" and False in [(attr in MOVIE_JSON_TO_NODE_DICT) for attr in attrs]:
         return []
     dict_to_use = ACTOR_JSON_TO_NODE_DICT if list_type == "actor" else MOVIE_JSON_TO_NODE_DICT
+    if isinstance(list_to_filter, SqliteNodeStore):
+        return list_to_filter.find_matching([(dict_to_use[attr], attr_val) for attr, attr_val in zip(attrs, attr_vals)],
+                                            match_all=False)
     filtered_list = []
     for i, item in enumerate(list_to_filter):
         item = item.__dict__ if type(item) != dict else item
@@ -73,6 +208,114 @@ def filter_list_or(list_to_filter, attrs, attr_vals, list_type):
     return filtered_list
 
 
+def get_index(orig_dict):
+    """
+    Utility function to get the AttributeIndex kept for a dictionary of the API.
+    :param orig_dict: Dictionary (name --> GraphNode)
+    :return: The AttributeIndex, or None if the dictionary isn't indexed (e.g. it is a SqliteNodeStore)
+    """
+    if orig_dict is ACTORS and not isinstance(orig_dict, SqliteNodeStore):
+        return ACTOR_INDEX
+    if orig_dict is MOVIES and not isinstance(orig_dict, SqliteNodeStore):
+        return MOVIE_INDEX
+    return None
+
+
+def get_collection(orig_dict) -> str:
+    """
+    Utility function to get the name of the collection a dictionary of the API holds.
+    :param orig_dict: ACTORS or MOVIES
+    :return: 'actors' or 'movies'
+    """
+    return 'actors' if orig_dict is ACTORS else 'movies'
+
+
+def get_aggregates(collection: str) -> list:
+    """
+    Utility function to get the aggregates kept for a collection.
+    :param collection: 'actors' or 'movies'
+    :return: List of GroupedAggregate
+    """
+    return [aggregate for (aggregated, _, _), aggregate in AGGREGATES.items() if aggregated == collection]
+
+
+def build_aggregates(actors, movies):
+    """
+    Utility function to compute every aggregate of AGGREGATES from scratch.
+    :param actors: Dictionary (Actor name --> Actor Node)
+    :param movies: Dictionary (Movie name --> Movie Node)
+    :return: Nothing.
+    """
+    for (collection, _, _), aggregate in AGGREGATES.items():
+        aggregate.build(actors if collection == 'actors' else movies)
+
+
+def apply_batch(orig_dict, written: dict, deleted_names: list):
+    """
+    Utility function to write a set of nodes to the API database. They are logged in WRITE_LOG
+    first (as one record, so they are recovered all or nothing): if that fails, the error is
+    raised and nothing is changed. Then they are stored and everything derived from them is
+    brought up to date.
+    :param orig_dict: Dictionary (name --> GraphNode) to write to
+    :param written: Dict (name --> GraphNode) of the nodes to add or replace
+    :param deleted_names: Names of the nodes to delete, which must be in orig_dict
+    :return: Nothing.
+    """
+    collection = get_collection(orig_dict)
+    logged = WRITE_LOG is not None and not isinstance(orig_dict, SqliteNodeStore)  # SQLite keeps its own
+    if logged:
+        WRITE_LOG.append(collection, {name: node.__dict__ for name, node in written.items()}, list(deleted_names))
+    with write_transaction(orig_dict):
+        for name, node in written.items():
+            orig_dict[name] = node
+        for name in deleted_names:
+            del orig_dict[name]
+    record_batch(orig_dict, list(written), deleted_names)
+    if logged and WRITE_LOG.needs_snapshot():
+        # Only copied with the lock held, the snapshot is written while requests go on
+        WRITE_LOG.start_snapshot(get_node_dicts(copy_lists=True))
+
+
+def record_batch(orig_dict, written_names, deleted_names):
+    """
+    Utility function to be called after a set of nodes of the API database were written,
+    to bring everything derived from them up to date. Cached responses are invalidated once
+    for the whole set.
+    :param orig_dict: Dictionary (name --> GraphNode) the nodes are in
+    :param written_names: Names of the nodes added or changed
+    :param deleted_names: Names of the nodes deleted
+    :return: Nothing.
+    """
+    collection = get_collection(orig_dict)
+    index = get_index(orig_dict)
+    name_index = ACTOR_NAMES if collection == 'actors' else MOVIE_NAMES
+    aggregates = get_aggregates(collection)
+    for name in written_names:
+        node = orig_dict[name]
+        if index is not None:
+            index.add(name, node)
+        if collection == 'actors':
+            CAST_GRAPH.set_actor(name, getattr(node, 'movies_starred_in', []))
+        else:
+            CAST_GRAPH.set_movie(name, getattr(node, 'actors', []))
+        name_index.add(name)
+        for aggregate in aggregates:
+            aggregate.update(name, node)
+        FRAGMENTS.invalidate(collection, name)
+    for name in deleted_names:
+        if index is not None:
+            index.remove(name)
+        if collection == 'actors':
+            CAST_GRAPH.remove_actor(name)
+        else:
+            CAST_GRAPH.remove_movie(name)
+        name_index.remove(name)
+        for aggregate in aggregates:
+            aggregate.remove(name)
+        FRAGMENTS.invalidate(collection, name)
+    RESPONSE_CACHE.bump(collection)
+
+
 def or_get_request_helper(attr1, attr_val1, attr2, attr_val2, orig_dict, list_type: str):
     """
     Helper function to handle an OR GET request on the API.
@@ -86,28 +329,696 @@ def or_get_request_helper(attr1, attr_val1, attr2, attr_val2, orig_dict, list_ty
     :param list_type: "actor" or "movie"
     :return: list of objects that match the query
     """
-    items_matching_request = orig_dict.values()
+    return [item for _, item in or_get_request_matches(attr1, attr_val1, attr2, attr_val2, orig_dict, list_type)]
+
+
+def or_get_request_matches(attr1, attr_val1, attr2, attr_val2, orig_dict, list_type: str) -> list:
+    """
+    Utility function to find the objects matching an OR GET request, along with their names.
+    Takes the same parameters as or_get_request_helper.
+    :return: list of (name or None if unknown, object) pairs that match the query
+    """
     attr_val1 = attr_val1.replace("_", " ")
     attr_val2 = attr_val2.replace("_", " ")
+    index = get_index(orig_dict)
+    METRICS.inc('webapi_query_access_total', collection=list_type + 's', access='index' if index is not None else
+                'sqlite' if isinstance(orig_dict, SqliteNodeStore) else 'scan')
+    if index is not None:
+        dict_to_use = ACTOR_JSON_TO_NODE_DICT if list_type == "actor" else MOVIE_JSON_TO_NODE_DICT
+        if attr1 not in dict_to_use or attr2 not in dict_to_use:
+            return []
+        names = index.find_any([(dict_to_use[attr1], attr_val1), (dict_to_use[attr2], attr_val2)])
+        return [(name, orig_dict[name].__dict__) for name in names]
+    items_matching_request = orig_dict if isinstance(orig_dict, SqliteNodeStore) else orig_dict.values()
     items_matching_request = filter_list_or(items_matching_request, [attr1, attr2], [attr_val1, attr_val2], list_type)
-    return items_matching_request
+    return [(get_stored_name(orig_dict, item), item) for item in items_matching_request]
+
+
+def get_stored_name(orig_dict, item):
+    """
+    Utility function to get the key of a node found by a filter, where it is known.
+    :param orig_dict: The dictionary (name --> GraphNode) the node is in
+    :param item: The __dict__ of the node
+    :return: The key, or None
+    """
+    # Nodes read from a SqliteNodeStore are always named after their key
+    return item['name'] if isinstance(orig_dict, SqliteNodeStore) else None
 
 
 def and_get_request_helper(attr_dict, orig_dict, type: str):
     """
     Helper function to handle GET queries.
     Returns list of objects which satisfy all the given attribute requirements.
-    :param attr_dict: Dictionary of attributes to attribute values
+    :param attr_dict: Dictionary of attributes (optionally with a range operator) to attribute values
     :param orig_dict: The dictionary (name --> GraphNode) to search in
     :param type: "actor" or "movie"
     :return: list of objects satisfying all the attribute conditions
     """
-    items_matching_request = orig_dict.values()
+    return [item for _, item in and_get_request_matches(attr_dict, orig_dict, type)]
+
+
+def and_get_request_matches(attr_dict, orig_dict, type: str) -> list:
+    """
+    Utility function to find the objects matching a GET query, along with their names.
+    Takes the same parameters as and_get_request_helper.
+    :return: list of (name, object) pairs satisfying all the attribute conditions
+    """
+    predicates = make_predicates(attr_dict, type)
+    if predicates is None:
+        return []
+    index = get_index(orig_dict)
+    if index is not None:
+        plan = plan_query(index, predicates)
+        names = plan.execute(index)
+        METRICS.inc('webapi_query_access_total', collection=type + 's', access='index')
+        for _, _, access in plan.steps[:len(plan.actual_rows)]:
+            METRICS.inc('webapi_plan_steps_total', access=access)
+        return [(name, orig_dict[name].__dict__) for name in names]
+    METRICS.inc('webapi_query_access_total', collection=type + 's',
+                access='sqlite' if isinstance(orig_dict, SqliteNodeStore) else 'scan')
+    if isinstance(orig_dict, SqliteNodeStore):
+        # Push the exact matches down into SQL at once, ranges are checked on the rows it returns
+        matches = [(item['name'], item) for item in orig_dict.find_matching(
+            [(predicate.attr, predicate.value) for predicate in predicates if isinstance(predicate, EqualsPredicate)])]
+    else:
+        matches = [(name, node.__dict__) for name, node in orig_dict.items()]
+    return [(name, item) for name, item in matches
+            if all(predicate.matches_value(item.get(predicate.attr)) for predicate in predicates)]
+
+
+def make_predicates(attr_dict, type: str):
+    """
+    Utility function to turn the conditions of a GET query into predicates. An attribute
+    can be followed by a range operator: age__gt=40, age__gte=40, age__lt=50, age__lte=50,
+    or age__between=40,50 (both ends included).
+    :param attr_dict: Dictionary of attributes to attribute values
+    :param type: "actor" or "movie"
+    :return: List of predicates, or None if the query has an unknown attribute or operator, or a bad bound
+    """
+    dict_to_use = ACTOR_JSON_TO_NODE_DICT if type == "actor" else MOVIE_JSON_TO_NODE_DICT
+    sorted_attrs = ACTOR_SORTED_ATTRS if type == "actor" else MOVIE_SORTED_ATTRS
+    predicates = []
     for attr, attr_val in attr_dict.items():
-        attr_val = attr_val.replace('_', " ")
-        # print(attr, attr_val)
-        items_matching_request = filter_list(items_matching_request, attr, attr_val, type)
-    return items_matching_request
+        attr, _, operator = attr.partition('__')
+        if attr not in dict_to_use:
+            return None
+        node_attr = dict_to_use[attr]
+        if not operator:
+            predicates.append(EqualsPredicate(node_attr, attr_val.replace('_', " ")))
+            continue
+        if operator not in RANGE_OPERATORS or node_attr not in sorted_attrs:
+            return None
+        try:
+            bounds = [float(bound) for bound in attr_val.split(',')]
+        except ValueError:
+            return None
+        if len(bounds) != (2 if operator == 'between' else 1) or True in [isnan(bound) for bound in bounds]:
+            return None
+        if operator == 'between':
+            predicates.append(RangePredicate(node_attr, bounds[0], bounds[1]))
+        elif operator in ('gt', 'gte'):
+            predicates.append(RangePredicate(node_attr, low=bounds[0], include_low=operator == 'gte'))
+        else:
+            predicates.append(RangePredicate(node_attr, high=bounds[0], include_high=operator == 'lte'))
+    return predicates
+
+
+def explain_and_request(attr_dict, orig_dict, type: str) -> dict:
+    """
+    Helper function to handle GET queries with ?explain=1. Runs the query and describes how it was answered.
+    :param attr_dict: Dictionary of attributes to attribute values
+    :param orig_dict: The dictionary (name --> GraphNode) to search in
+    :param type: "actor" or "movie"
+    :return: Dictionary describing the plan
+    """
+    index = get_index(orig_dict)
+    if index is None:
+        access = 'sql push-down' if isinstance(orig_dict, SqliteNodeStore) else 'scan'
+        return {'collection': type + 's', 'access': access,
+                'rows': len(and_get_request_helper(attr_dict, orig_dict, type))}
+    predicates = make_predicates(attr_dict, type)
+    if predicates is None:
+        return {'collection': type + 's', 'access': 'none', 'error': 'Invalid query', 'rows': 0}
+    plan = plan_query(index, predicates)
+    rows = len(plan.execute(index))
+    return {'collection': type + 's', 'access': 'index', 'total': len(index), 'plan': plan.explain(), 'rows': rows}
+
+
+def get_query_args():
+    """
+    Utility function to split the query arguments of the current request into attribute filters and options.
+    :return: Dict (attribute --> value), Dict (option --> value)
+    """
+    attr_dict = request.args.to_dict()
+    options = {arg: attr_dict.pop(arg) for arg in RESERVED_QUERY_ARGS if arg in attr_dict}
+    return attr_dict, options
+
+
+def close_replaced_stores(actors, movies):
+    """
+    Utility function to close the files of the LazyNodeStores of the API database when it is replaced.
+    :param actors: The new ACTORS
+    :param movies: The new MOVIES
+    :return: Nothing.
+    """
+    for old_store, new_store in ((ACTORS, actors), (MOVIES, movies)):
+        if isinstance(old_store, LazyNodeStore) and old_store is not new_store:
+            old_store.close()
+
+
+def use_sqlite_storage(filename: str = 'hollywood.db'):
+    """
+    Switch the API database over to SQLite, so changes survive restarts and filters use
+    the indexes of the database. If the database is empty, it is filled with the current
+    ACTORS and MOVIES first.
+    :param filename: The SQLite database file
+    :return: The HollywoodDatabase now serving the API
+    """
+    global DATABASE, ACTORS, MOVIES
+    with DATABASE_LOCK.write():
+        database = HollywoodDatabase(filename)
+        if len(database.actors) == 0 and len(database.movies) == 0:
+            database.load(ACTORS, MOVIES)
+        DATABASE = database
+        close_replaced_stores(database.actors, database.movies)
+        ACTORS, MOVIES = database.actors, database.movies
+        CAST_GRAPH.build(ACTORS, MOVIES)
+        ACTOR_NAMES.build(ACTORS)
+        MOVIE_NAMES.build(MOVIES)
+        build_aggregates(ACTORS, MOVIES)
+        RESPONSE_CACHE.clear()
+        FRAGMENTS.clear()
+    LOAD_STATUS.update(state='ready', source=filename, error=None)
+    return database
+
+
+def read_dataset(source: str = 'data.json', max_num_actors: int = 50, max_num_movies: int = 50,
+                 source_format: str = None) -> (dict, dict):
+    """
+    Utility function to read the ACTORS and MOVIES from a file.
+    :param source: The file to read
+    :param max_num_actors: Max number of actors to read
+    :param max_num_movies: Max number of movies to read
+    :param source_format: 'json' to parse a scraped JSON file, 'lazy' to index it and read nodes as
+    they are needed (see LazyGraph), 'snapshot' for a binary snapshot (see GraphSnapshot), which is
+    by far the fastest to load. By default, files ending in .snap are snapshots and others are JSON.
+    :return: Dict (Actor name --> Actor Node), Dict (Movie name --> Movie Node)
+    """
+    source_format = source_format or ('snapshot' if source.endswith('.snap') else 'json')
+    if source_format == 'json':
+        return extract_from_json(source, max_num_actors, max_num_movies)
+    if source_format == 'lazy':
+        return extract_lazily_from_json(source, max_num_actors, max_num_movies)
+    if source_format == 'snapshot':
+        actors, movies = load_snapshot(source, with_edges=False)  # The API only serves the names lists
+        return dict(islice(actors.items(), max_num_actors)), dict(islice(movies.items(), max_num_movies))
+    raise ValueError("Unknown source format: {}".format(source_format))
+
+
+def get_node_dicts(copy_lists: bool = False) -> dict:
+    """
+    Utility function to get the whole database as plain dictionaries, e.g. for a snapshot.
+    :param copy_lists: True to copy the dictionaries and their lists, so they can be read after
+    DATABASE_LOCK is let go of
+    :return: Dict ('actors'/'movies' --> Dict (name --> node __dict__))
+    """
+    if not copy_lists:
+        return {'actors': {name: node.__dict__ for name, node in ACTORS.items()},
+                'movies': {name: node.__dict__ for name, node in MOVIES.items()}}
+    return {collection: {name: {attr: list(value) if isinstance(value, list) else value
+                                for attr, value in node.__dict__.items()} for name, node in orig_dict.items()}
+            for collection, orig_dict in [('actors', ACTORS), ('movies', MOVIES)]}
+
+
+def nodes_from_dicts(node_dicts: dict, class_type) -> dict:
+    """
+    Utility function to rebuild nodes out of their __dict__s, e.g. from a snapshot or log record.
+    :param node_dicts: Dict (name --> node __dict__)
+    :param class_type: Actor or Movie
+    :return: Dict (name --> node)
+    """
+    nodes = {}
+    for name, node_dict in node_dicts.items():
+        node = class_type("", "", "")
+        node.__dict__.update(node_dict)
+        nodes[name] = node
+    return nodes
+
+
+def apply_log_record(record: dict, actors: dict, movies: dict):
+    """
+    Utility function to redo the changes of a WriteAheadLog record.
+    :param record: The record, see WriteAheadLog.append
+    :param actors: Dictionary (Actor name --> Actor Node) to apply it to
+    :param movies: Dictionary (Movie name --> Movie Node) to apply it to
+    :return: Nothing.
+    """
+    if record['collection'] == 'actors':
+        orig_dict, class_type = actors, Actor
+    else:
+        orig_dict, class_type = movies, Movie
+    orig_dict.update(nodes_from_dicts(record['put'], class_type))
+    for name in record['delete']:
+        orig_dict.pop(name, None)
+
+
+def read_logged_dataset(log: WriteAheadLog, source: str = 'data.json', max_num_actors: int = 50,
+                        max_num_movies: int = 50, source_format: str = None) -> (dict, dict):
+    """
+    Utility function to recover the ACTORS and MOVIES as they were last changed through the API:
+    the last snapshot of the log (or the file, if there is none yet) with the logged changes redone.
+    Takes the same parameters as read_dataset, and:
+    :param log: The WriteAheadLog
+    :return: Dict (Actor name --> Actor Node), Dict (Movie name --> Movie Node)
+    """
+    snapshot, records = log.recover()
+    if snapshot is None:
+        actors, movies = read_dataset(source, max_num_actors, max_num_movies, source_format)
+    else:
+        actors, movies = nodes_from_dicts(snapshot['actors'], Actor), nodes_from_dicts(snapshot['movies'], Movie)
+    for record in records:
+        apply_log_record(record, actors, movies)
+    logging.info("Recovered {} logged changes from {}.".format(len(records), log.directory))
+    return actors, movies
+
+
+def set_dataset(actors, movies, log: WriteAheadLog = None):
+    """
+    Replace the database of the API, indexing the new ACTORS and MOVIES and dropping everything cached.
+    :param actors: Dictionary (Actor name --> Actor Node)
+    :param movies: Dictionary (Movie name --> Movie Node)
+    :param log: WriteAheadLog to log the changes to from now on, already recovered, or None
+    :return: Nothing.
+    """
+    global DATABASE, ACTORS, MOVIES, WRITE_LOG
+    with DATABASE_LOCK.write():
+        if DATABASE is not None:
+            DATABASE.close()
+            DATABASE = None
+        if WRITE_LOG is not None and WRITE_LOG is not log:
+            WRITE_LOG.close()
+        WRITE_LOG = log
+        ACTOR_INDEX.build(actors)
+        MOVIE_INDEX.build(movies)
+        CAST_GRAPH.build(actors, movies)
+        ACTOR_NAMES.build(actors)
+        MOVIE_NAMES.build(movies)
+        build_aggregates(actors, movies)
+        close_replaced_stores(actors, movies)
+        ACTORS, MOVIES = actors, movies
+        RESPONSE_CACHE.clear()
+        FRAGMENTS.clear()
+
+
+def load_dataset(source: str = 'data.json', max_num_actors: int = 50, max_num_movies: int = 50,
+                 source_format: str = None, log: WriteAheadLog = None, sqlite: str = None):
+    """
+    Load the database of the API from a file, keeping LOAD_STATUS up to date.
+    Takes the same parameters as read_dataset, and:
+    :param log: WriteAheadLog to recover the changes made through the API from, and log new ones to
+    :param sqlite: SQLite database file to serve from (see use_sqlite_storage), filled from the file
+    if it is empty, or None to serve from memory
+    :return: Nothing.
+    """
+    LOAD_STATUS.update(state='loading', source=source, seconds=None, error=None)
+    start = time.perf_counter()
+    try:
+        if log is None:
+            set_dataset(*read_dataset(source, max_num_actors, max_num_movies, source_format))
+        else:
+            set_dataset(*read_logged_dataset(log, source, max_num_actors, max_num_movies, source_format), log)
+        if sqlite is not None:
+            use_sqlite_storage(sqlite)
+    except Exception as e:
+        LOAD_STATUS.update(state='failed', error=str(e))
+        raise
+    LOAD_STATUS.update(state='ready', seconds=time.perf_counter() - start)
+    logging.info("Loaded {} actors and {} movies from {} in {:.3f}s.".format(
+        len(ACTORS), len(MOVIES), source, LOAD_STATUS['seconds']))
+
+
+def _load_dataset_in_background(*args):
+    """
+    Utility function loading the database in a background thread, where errors can only be logged.
+    :return: Nothing.
+    """
+    try:
+        load_dataset(*args)
+    except Exception:
+        logging.exception("Loading the database failed.")
+
+
+def create_app(source: str = 'data.json', max_num_actors: int = 50, max_num_movies: int = 50,
+               source_format: str = None, background: bool = False, log: WriteAheadLog = None,
+               sqlite: str = None) -> Flask:
+    """
+    Set up the API with its database loaded from a file.
+    Takes the same parameters as read_dataset, and:
+    :param background: True to return right away and load in a background thread; requests
+    other than /ready are turned down with 503 until loading is done
+    :param log: WriteAheadLog making the changes made through the API durable, e.g.
+    WriteAheadLog('wal', sync_every=32). The database is recovered from it first.
+    :param sqlite: SQLite database file making the changes made through the API durable instead
+    :return: The flask app
+    """
+    if background:
+        LOAD_STATUS.update(state='loading', source=source, seconds=None, error=None)
+        threading.Thread(target=_load_dataset_in_background, daemon=True,
+                         args=(source, max_num_actors, max_num_movies, source_format, log, sqlite)).start()
+    else:
+        load_dataset(source, max_num_actors, max_num_movies, source_format, log, sqlite)
+    return app
+
+
+def get_page_options(options: dict) -> (int, str):
+    """
+    Utility function to read the pagination options of a request.
+    :param options: Dict (option --> value), see get_query_args
+    :return: The limit (None if not paginated) and the cursor (None for the first page)
+    :raises ValueError: If the limit isn't a number between 1 and MAX_PAGE_SIZE
+    """
+    cursor = options.get('cursor')
+    if 'limit' not in options:
+        return (MAX_PAGE_SIZE if cursor is not None else None), cursor
+    limit = int(options['limit'])
+    if not 0 < limit <= MAX_PAGE_SIZE:
+        raise ValueError("limit out of range")
+    return limit, cursor
+
+
+def get_int_arg(arg: str, default: int, max_value: int) -> int:
+    """
+    Utility function to read a positive integer query argument of the current request.
+    :param arg: Name of the argument
+    :param default: Value if the argument isn't given
+    :param max_value: Largest value allowed
+    :return: The value
+    :raises ValueError: If the value isn't a number between 1 and max_value
+    """
+    if arg not in request.args:
+        return default
+    value = int(request.args[arg])
+    if not 0 < value <= max_value:
+        raise ValueError("{} out of range".format(arg))
+    return value
+
+
+def get_fields(collection: str) -> tuple:
+    """
+    Utility function to read the attributes the current request asks for (?fields=name,age), by their
+    names in the responses or in the requests (e.g. gross_value or total_gross).
+    :param collection: 'actors' or 'movies'
+    :return: Sorted tuple of attribute names, or None for all of them
+    :raises ValueError: If an attribute is unknown
+    """
+    if 'fields' not in request.args:
+        return None
+    conversion_dict = ACTOR_JSON_TO_NODE_DICT if collection == 'actors' else MOVIE_JSON_TO_NODE_DICT
+    fields = set()
+    for field in request.args['fields'].split(','):
+        if field in conversion_dict:
+            fields.add(conversion_dict[field])
+        elif field in conversion_dict.values():
+            fields.add(field)
+        else:
+            raise ValueError("Unknown field: {}".format(field))
+    return tuple(sorted(fields))
+
+
+def paginate(matches: list, limit: int, cursor: str) -> (list, str):
+    """
+    Utility function to cut a page out of the matches of a query. Pages are in alphabetical
+    order of the names, which stays stable as objects are added and removed.
+    :param matches: list of (name, object) pairs
+    :param limit: Max number of objects in the page, None for no pagination
+    :param cursor: Name of the last object of the previous page, None for the first page
+    :return: list of (name, object) pairs in the page, name of its last object if there are more pages (else None)
+    """
+    if limit is None:
+        return matches, None
+    matches = sorted(matches, key=lambda match: match[0] if match[0] is not None else match[1]['name'])
+    start = 0
+    if cursor is not None:
+        names = [name if name is not None else item['name'] for name, item in matches]
+        start = bisect_right(names, cursor)
+    page = matches[start:start + limit]
+    next_cursor = (page[-1][0] or page[-1][1]['name']) if start + limit < len(matches) else None
+    return page, next_cursor
+
+
+def make_list_response(collection: str, matches: list, total: int = None, next_cursor: str = None,
+                       stream: bool = False, fields: tuple = None) -> Response:
+    """
+    Utility function to build the JSON response to a list query out of the serialized nodes.
+    :param collection: 'actors' or 'movies'
+    :param matches: list of (name, object) pairs
+    :param total: Number of objects matching the query over all the pages, len(matches) by default
+    :param next_cursor: Cursor of the next page, if there is one
+    :param stream: True to send the objects as they are serialized, for large exports
+    :param fields: Attributes of the objects to send (see get_fields), None for all of them
+    :return: 200 response with the objects if there are any, else 400
+    """
+    total = len(matches) if total is None else total
+    headers = [('X-Total-Count', str(total))]
+    if next_cursor is not None:
+        headers.append(('X-Next-Cursor', next_cursor))
+    status = 200 if total > 0 else 400
+    if stream:
+        return Response(stream_fragments(collection, matches, FRAGMENTS.generation, fields), status=status,
+                        mimetype='application/json', headers=headers)
+    with METRICS.timer('webapi_phase_seconds', phase='serialize'):
+        body = join_fragments([FRAGMENTS.get(collection, name, item, fields=fields) for name, item in matches])
+    return Response(body, status=status, mimetype='application/json', headers=headers)
+
+
+def stream_fragments(collection: str, matches: list, generation: int, fields: tuple = None):
+    """
+    Generator yielding a JSON array of nodes piece by piece, so the response starts right away
+    and doesn't have to be held in memory as a whole. It runs after the request handler has
+    returned and let go of DATABASE_LOCK, so the nodes may have been written to in the meantime.
+    :param collection: 'actors' or 'movies'
+    :param matches: list of (name, object) pairs
+    :param generation: FRAGMENTS.generation when the matches were read, so newer writes aren't cached over
+    :param fields: Attributes of the objects to send, None for all of them
+    :return: Generator of bytes
+    """
+    yield b'['
+    for i, (name, item) in enumerate(matches):
+        yield (b',' if i else b'') + FRAGMENTS.get(collection, name, item, generation, fields)
+    yield b']\n'
+
+
+def make_query_response(attr_dict: dict, options: dict, orig_dict, type: str) -> Response:
+    """
+    Helper function to answer a GET query on the actors or movies API, a page at a time if asked to.
+    A page of the whole collection is read straight off the name index.
+    :param attr_dict: Dictionary of attributes to attribute values
+    :param options: Dict (option --> value), see get_query_args
+    :param orig_dict: The dictionary (name --> GraphNode) to search in
+    :param type: "actor" or "movie"
+    :return: The response
+    """
+    try:
+        limit, cursor = get_page_options(options)
+        fields = get_fields(type + 's')
+    except ValueError:
+        return make_response(jsonify("Invalid Request"), 400)
+    index = get_index(orig_dict)
+    if not attr_dict and limit is not None and index is not None:
+        names = index.names_after(cursor, limit + 1)
+        matches = [(name, orig_dict[name].__dict__) for name in names[:limit]]
+        total, next_cursor = len(index), (names[limit - 1] if len(names) > limit else None)
+    else:
+        with METRICS.timer('webapi_phase_seconds', phase='filter'):
+            matches = and_get_request_matches(attr_dict, orig_dict, type)
+        total = len(matches)
+        matches, next_cursor = paginate(matches, limit, cursor)
+    return make_list_response(type + 's', matches, total, next_cursor, options.get('stream') == '1', fields)
+
+
+def make_or_response(attr1, attr_val1, attr2, attr_val2, orig_dict, type: str) -> Response:
+    """
+    Helper function to answer an OR GET query on the actors or movies API, a page at a time if asked to.
+    Takes the same parameters as or_get_request_helper.
+    :return: The response
+    """
+    _, options = get_query_args()
+    try:
+        limit, cursor = get_page_options(options)
+        fields = get_fields(type + 's')
+    except ValueError:
+        return make_response(jsonify("Invalid Request"), 400)
+    with METRICS.timer('webapi_phase_seconds', phase='filter'):
+        matches = or_get_request_matches(attr1, attr_val1, attr2, attr_val2, orig_dict, type)
+    total = len(matches)
+    matches, next_cursor = paginate(matches, limit, cursor)
+    return make_list_response(type + 's', matches, total, next_cursor, options.get('stream') == '1', fields)
+
+
+def make_node_response(collection: str, name: str, node) -> Response:
+    """
+    Utility function to build the JSON response for a single node out of its serialized form,
+    with the attributes asked for (?fields=...).
+    :param collection: 'actors' or 'movies'
+    :param name: Key of the node
+    :param node: The GraphNode
+    :return: The 200 response, or 400 if an unknown attribute was asked for
+    """
+    try:
+        fields = get_fields(collection)
+    except ValueError:
+        return make_response(jsonify("Invalid Request"), 400)
+    return Response(FRAGMENTS.get(collection, name, node.__dict__, fields=fields) + b'\n', status=200,
+                    mimetype='application/json')
+
+
+def reads_database(handler):
+    """
+    Decorator running a request handler with DATABASE_LOCK held for reading.
+    :param handler: The handler
+    :return: The decorated handler
+    """
+    @wraps(handler)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        with DATABASE_LOCK.read():
+            METRICS.observe('webapi_lock_wait_seconds', time.perf_counter() - start, mode='read')
+            return handler(*args, **kwargs)
+    return wrapper
+
+
+def writes_database(handler):
+    """
+    Decorator running a request handler with DATABASE_LOCK held for writing, so its changes
+    (and the indexes and caches brought up to date after them) are seen all at once.
+    :param handler: The handler
+    :return: The decorated handler
+    """
+    @wraps(handler)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        with DATABASE_LOCK.write():
+            METRICS.observe('webapi_lock_wait_seconds', time.perf_counter() - start, mode='write')
+            return handler(*args, **kwargs)
+    return wrapper
+
+
+def cached_get(*collections):
+    """
+    Decorator caching the responses of a GET handler in RESPONSE_CACHE until a collection
+    it reads is written to. Successful responses get an ETag, and clients sending it back
+    in If-None-Match get a 304 Not Modified. The handler runs with DATABASE_LOCK held for reading.
+    :param collections: 'actors' and/or 'movies'
+    :return: The decorator
+    """
+    def decorator(handler):
+        handler = reads_database(handler)
+
+        @wraps(handler)
+        def wrapper(*args, **kwargs):
+            if request.args.get('stream') == '1':
+                return handler(*args, **kwargs)  # Streamed responses aren't held in memory
+            key = RESPONSE_CACHE.make_key(request.path, request.args)
+            entry = RESPONSE_CACHE.get(key, collections)
+            if entry is None:
+                versions = RESPONSE_CACHE.versions(collections)  # Read first, so a write while building shows
+                response = handler(*args, **kwargs)
+                headers = [(header, value) for header, value in response.headers.items()
+                           if header not in ('Content-Type', 'Content-Length')]
+                entry = RESPONSE_CACHE.put(key, response.get_data(), response.status_code, response.mimetype,
+                                           versions, headers)
+            return entry.to_response(request, MIN_COMPRESS_SIZE)
+        return wrapper
+    return decorator
+
+
+@app.before_request
+def start_measuring_request():
+    """
+    Starts timing the request, and profiling it if it was asked for with PROFILE_HEADER.
+    Registered first, so it runs even for requests turned down by the checks below.
+    :return: None to handle the request.
+    """
+    g.request_start = time.perf_counter()
+    if ALLOW_PROFILING and request.headers.get(PROFILE_HEADER):
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+    return None
+
+
+@app.after_request
+def record_request_metrics(response):
+    """
+    Records the latency, status and result size of the request in METRICS, and keeps its
+    profile if it was profiled, telling the client where to get it (X-Profile-Id).
+    Streamed bodies are sent after this, so their time isn't counted.
+    :param response: The response
+    :return: The response
+    """
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        profile_id = keep_profile(profiler)
+        response.headers['X-Profile-Id'] = str(profile_id)
+    start = g.pop('request_start', None)
+    if start is None:
+        return response
+    route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+    METRICS.observe('webapi_request_seconds', time.perf_counter() - start, route=route, method=request.method)
+    METRICS.inc('webapi_requests_total', route=route, method=request.method, status=response.status_code)
+    if 'X-Total-Count' in response.headers:
+        METRICS.observe('webapi_result_size', int(response.headers['X-Total-Count']), route=route)
+    return response
+
+
+def keep_profile(profiler) -> int:
+    """
+    Utility function to keep the statistics of a profiled request, dropping the oldest kept beyond MAX_PROFILES.
+    :param profiler: The cProfile.Profile of the request
+    :return: The id of the profile
+    """
+    output = io.StringIO()
+    stats = pstats.Stats(profiler, stream=output)
+    stats.sort_stats('cumulative').print_stats(50)
+    profile_id = next(PROFILE_IDS)
+    with PROFILES_LOCK:
+        PROFILES[profile_id] = "{} {}\n{}".format(request.method, request.full_path, output.getvalue())
+        while len(PROFILES) > MAX_PROFILES:
+            PROFILES.popitem(last=False)
+    return profile_id
+
+
+@app.after_request
+def compress_large_response(response):
+    """
+    Compresses responses that weren't cached (cached ones are compressed once, see cached_get),
+    if they are at least MIN_COMPRESS_SIZE bytes and the client accepts gzip or deflate.
+    :param response: The response
+    :return: The response
+    """
+    return compress_response(response, request, MIN_COMPRESS_SIZE)
+
+
+@app.before_request
+def reject_requests_until_ready():
+    """
+    Turns down requests that need the database while it isn't loaded.
+    :return: 503 response if the database isn't ready and the endpoint needs it, else None to handle the request.
+    """
+    if LOAD_STATUS['state'] != 'ready' and request.endpoint not in ALWAYS_AVAILABLE_ENDPOINTS:
+        return make_response(jsonify("The database is not ready yet."), 503)
+    return None
+
+
+@app.before_request
+def reject_writes_when_read_only():
+    """
+    Turns down requests that would write to the database while it is read-only.
+    :return: 405 response for writes if the database is read-only, else None to handle the request.
+    """
+    if READ_ONLY and request.method in ('PUT', 'POST', 'DELETE') and request.endpoint not in READ_ONLY_ENDPOINTS:
+        return make_response(jsonify("The database is read-only."), 405)
+    return None
 
 
 # OPTIONS Requests:
@@ -132,9 +1043,46 @@ def index():
     return make_response(jsonify("Welcome to the Hollywood Database."), 200)
 
 
+@app.route('/metrics', methods=['GET'])
+def handle_metrics_request():
+    """
+    Handler for the metrics of the API, in the Prometheus text format.
+    :return: The metrics as plain text
+    """
+    return Response(METRICS.render(), status=200, mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/profiles/<int:profile_id>', methods=['GET'])
+def handle_profile_request(profile_id):
+    """
+    Handler for the profile of a request sent with PROFILE_HEADER (see X-Profile-Id).
+    :param profile_id: Id of the profile
+    :return: The profile statistics as plain text, or 400 if the profile isn't kept (anymore).
+    """
+    with PROFILES_LOCK:
+        profile = PROFILES.get(profile_id)
+    if profile is None:
+        return make_response(jsonify("Couldn't find the profile."), 400)
+    return Response(profile, status=200, mimetype='text/plain')
+
+
+@app.route('/ready', methods=['GET'])
+def handle_ready_request():
+    """
+    Handler for readiness checks, e.g. by a load balancer during deploys.
+    :return: 200 response with the size of the database and its load time once it is loaded, else 503.
+    """
+    ready = LOAD_STATUS['state'] == 'ready'
+    status = dict(LOAD_STATUS, ready=ready)
+    if ready:
+        status.update(actors=len(ACTORS), movies=len(MOVIES))
+    return make_response(jsonify(status), 200 if ready else 503)
+
+
 # GET Requests:
 
 @app.route('/actors/<string:attr1>=<string:attr_val1>|<string:attr2>=<attr_val2>', methods=['GET'])
+@cached_get('actors')
 def handle_actor_or_get_request(attr1, attr_val1, attr2, attr_val2):
     """
     Handler for OR GET requests on the actors API
@@ -144,12 +1092,11 @@ def handle_actor_or_get_request(attr1, attr_val1, attr2, attr_val2):
     :param attr_val2: value of second attribute to filter on
     :return: JSON representation of actor nodes satisfying the query if valid request.
     """
-    actors_matching_query = or_get_request_helper(attr1, attr_val1, attr2, attr_val2, ACTORS, "actor")
-    return make_response(jsonify(actors_matching_query),
-                         200 if len(actors_matching_query) > 0 else 400)
+    return make_or_response(attr1, attr_val1, attr2, attr_val2, ACTORS, "actor")
 
 
 @app.route('/movies/<string:attr1>=<string:attr_val1>|<string:attr2>=<attr_val2>', methods=['GET'])
+@cached_get('movies')
 def handle_movies_or_get_request(attr1, attr_val1, attr2, attr_val2):
     """
     Handler for OR GET requests on the movies API
@@ -159,12 +1106,11 @@ def handle_movies_or_get_request(attr1, attr_val1, attr2, attr_val2):
     :param attr_val2: value of second attribute to filter on
     :return: JSON representation of movie nodes satisfying the query if valid request.
     """
-    movies_matching_query = or_get_request_helper(attr1, attr_val1, attr2, attr_val2, MOVIES, "movie")
-    return make_response(jsonify(movies_matching_query),
-                         200 if len(movies_matching_query) > 0 else 400)
+    return make_or_response(attr1, attr_val1, attr2, attr_val2, MOVIES, "movie")
 
 
 @app.route('/actors/<string:name>', methods=['GET'])
+@cached_get('actors')
 def handle_get_actor_request(name):
     """
     Handler for GET query on the actors API.
@@ -174,11 +1120,12 @@ def handle_get_actor_request(name):
     name = name.replace("_", " ")
     # print(name)
     if name in ACTORS:
-        return make_response(jsonify(ACTORS[name].__dict__), 200)
+        return make_node_response('actors', name, ACTORS[name])
     return make_response(jsonify("Couldn't find the actor in our database."), 400)
 
 
 @app.route('/movies/<string:name>', methods=['GET'])
+@cached_get('movies')
 def handle_get_movie_request(name):
     """
     Handler for GET query on the movies API.
@@ -188,40 +1135,297 @@ def handle_get_movie_request(name):
     name = name.replace("_", " ")
     # print(name)
     if name in MOVIES:
-        return make_response(jsonify(MOVIES[name].__dict__), 200)
+        return make_node_response('movies', name, MOVIES[name])
     return make_response(jsonify("Couldn't find the movie in our database."), 400)
 
 
 @app.route('/actors/', methods=['GET'])
+@cached_get('actors')
 def handle_actor_and_get_request():
     """
     Handler for GET requests on the actors API
     :return: JSON representation of actor nodes satisfying the query if valid request.
     """
-
-    attr_dict = request.args.to_dict()
-    # print(attr_dict)
-    actors_matching_query = and_get_request_helper(attr_dict, ACTORS, "actor")
-    return make_response(jsonify(actors_matching_query),
-                         200 if len(actors_matching_query) > 0 else 400)
+    attr_dict, options = get_query_args()
+    if options.get('explain') == '1':
+        return make_response(jsonify(explain_and_request(attr_dict, ACTORS, "actor")), 200)
+    return make_query_response(attr_dict, options, ACTORS, "actor")
 
 
 @app.route('/movies/', methods=['GET'])
+@cached_get('movies')
 def handle_movie_and_get_request():
     """
     Handler for GET requests on the movies API
     :return: JSON representation of movie nodes satisfying the query if valid request.
     """
-    attr_dict = request.args.to_dict()
-    # print(attr_dict)
-    movies_matching_query = and_get_request_helper(attr_dict, MOVIES, "movie")
-    return make_response(jsonify(movies_matching_query),
-                         200 if len(movies_matching_query) > 0 else 400)
+    attr_dict, options = get_query_args()
+    if options.get('explain') == '1':
+        return make_response(jsonify(explain_and_request(attr_dict, MOVIES, "movie")), 200)
+    return make_query_response(attr_dict, options, MOVIES, "movie")
+
+
+# Graph Requests:
+
+
+def in_cast_graph(name: str, is_actor: bool = True) -> bool:
+    """
+    Utility function to check whether a name can be looked up in CAST_GRAPH: it is in the
+    database, or listed by something that is.
+    :param name: Name of the actor or movie
+    :param is_actor: True for an actor, False for a movie
+    :return: True if the name is known, False otherwise
+    """
+    return name in (ACTORS if is_actor else MOVIES) or CAST_GRAPH.degree(name, is_actor) > 0
+
+
+@app.route('/actors/<string:name>/costars', methods=['GET'])
+@cached_get('actors', 'movies')
+def handle_actor_costars_request(name):
+    """
+    Handler for GET requests for the co-stars of an actor, the most frequent first (?limit=... to get fewer).
+    :param name: Name of the actor
+    :return: JSON with the co-stars and the number of movies shared with each, or 400 bad request.
+    """
+    name = name.replace("_", " ")
+    try:
+        limit = get_int_arg('limit', MAX_PAGE_SIZE, MAX_PAGE_SIZE)
+    except ValueError:
+        return make_response(jsonify("Invalid Request"), 400)
+    if not in_cast_graph(name):
+        return make_response(jsonify("Couldn't find the actor in our database."), 400)
+    co_stars = [{'name': co_star, 'shared_movies': count} for co_star, count in CAST_GRAPH.co_stars(name, limit)]
+    return make_response(jsonify({'name': name, 'co_stars': co_stars}), 200)
+
+
+def neighborhood_helper(name: str, is_actor: bool) -> Response:
+    """
+    Helper function for neighborhood requests: the actors and movies within ?depth=... hops
+    (2 by default) of a node, visiting at most ?limit=... nodes.
+    :param name: Name of the node, with underscores for spaces
+    :param is_actor: True for an actor, False for a movie
+    :return: JSON with the names of the nodes and their number of hops, or 400 bad request.
+    """
+    name = name.replace("_", " ")
+    try:
+        depth = get_int_arg('depth', 2, MAX_GRAPH_DEPTH)
+        max_nodes = get_int_arg('limit', MAX_GRAPH_NODES, MAX_GRAPH_NODES)
+    except ValueError:
+        return make_response(jsonify("Invalid Request"), 400)
+    if not in_cast_graph(name, is_actor):
+        return make_response(jsonify("Couldn't find the {} in our database.".format(
+            'actor' if is_actor else 'movie')), 400)
+    nodes, truncated = CAST_GRAPH.neighborhood(name, is_actor, depth, max_nodes)
+    return make_response(jsonify(dict(nodes, name=name, depth=depth, truncated=truncated)), 200)
+
+
+@app.route('/actors/<string:name>/neighborhood', methods=['GET'])
+@cached_get('actors', 'movies')
+def handle_actor_neighborhood_request(name):
+    """
+    Handler for GET requests for the movies and actors around an actor.
+    :param name: Name of the actor
+    :return: JSON with the nodes within ?depth=... hops, or 400 bad request.
+    """
+    return neighborhood_helper(name, True)
+
+
+@app.route('/movies/<string:name>/neighborhood', methods=['GET'])
+@cached_get('actors', 'movies')
+def handle_movie_neighborhood_request(name):
+    """
+    Handler for GET requests for the actors and movies around a movie.
+    :param name: Name of the movie
+    :return: JSON with the nodes within ?depth=... hops, or 400 bad request.
+    """
+    return neighborhood_helper(name, False)
+
+
+@app.route('/actors/<string:name1>/path/<string:name2>', methods=['GET'])
+@cached_get('actors', 'movies')
+def handle_actor_path_request(name1, name2):
+    """
+    Handler for GET requests for the shortest connection between two actors through the movies
+    they starred in, of at most ?max_length=... movies.
+    :param name1: Name of the first actor
+    :param name2: Name of the second actor
+    :return: JSON with the path, alternating actors and movies, or 400 if there is none.
+    """
+    name1, name2 = name1.replace("_", " "), name2.replace("_", " ")
+    try:
+        max_length = get_int_arg('max_length', MAX_PATH_LENGTH, MAX_PATH_LENGTH)
+    except ValueError:
+        return make_response(jsonify("Invalid Request"), 400)
+    if not in_cast_graph(name1) or not in_cast_graph(name2):
+        return make_response(jsonify("Couldn't find the actor in our database."), 400)
+    path = CAST_GRAPH.shortest_path(name1, name2, max_length)
+    if path is None:
+        return make_response(jsonify("No connection between the actors."), 400)
+    return make_response(jsonify({'path': path, 'length': len(path) // 2}), 200)
+
+
+# Search Requests:
+
+
+def get_gross_value(orig_dict, name: str):
+    """
+    Utility function to get the gross value of a node as a number, from the index if there is one.
+    :param orig_dict: ACTORS or MOVIES
+    :param name: Name of the node
+    :return: The gross value, or None if it isn't a number
+    """
+    index = get_index(orig_dict)
+    if index is not None:
+        return index.number_of(name, 'gross_value')
+    node = orig_dict.get(name)
+    return as_number(getattr(node, 'gross_value', None))
+
+
+def get_search_score(orig_dict, is_actor: bool, rank: str):
+    """
+    Utility function to get the function ranking search results.
+    :param orig_dict: ACTORS or MOVIES
+    :param is_actor: True for actors, False for movies
+    :param rank: 'gross' for the highest gross value first, 'degree' for the most movies (or actors)
+    first, 'name' for alphabetical order
+    :return: Function (name --> number), or None for alphabetical order
+    """
+    if rank == 'gross':
+        def score(name):
+            gross_value = get_gross_value(orig_dict, name)
+            return float('-inf') if gross_value is None else gross_value
+        return score
+    if rank == 'degree':
+        return lambda name: CAST_GRAPH.degree(name, is_actor)
+    return None
+
+
+def search_helper(orig_dict, name_index: NameIndex, is_actor: bool) -> Response:
+    """
+    Helper function for search requests: ?q=<beginning of a name>, with ?limit=... (10 by default)
+    and ?rank=gross|degree|name. Names with a word starting with the query come first; if there
+    are none, or with ?fuzzy=1, names similar to the query are returned, so typos are forgiven.
+    :param orig_dict: ACTORS or MOVIES
+    :param name_index: ACTOR_NAMES or MOVIE_NAMES
+    :param is_actor: True for actors, False for movies
+    :return: JSON list of the names found, with their gross values and degrees, or 400 if there are none.
+    """
+    query = request.args.get('q', '')
+    rank = request.args.get('rank', 'gross')
+    try:
+        limit = get_int_arg('limit', 10, MAX_PAGE_SIZE)
+    except ValueError:
+        return make_response(jsonify("Invalid Request"), 400)
+    if rank not in SEARCH_RANKS:
+        return make_response(jsonify("Invalid Request"), 400)
+    score = get_search_score(orig_dict, is_actor, rank)
+    names = [] if request.args.get('fuzzy') == '1' else name_index.prefix_search(query, limit, score)
+    if not names:
+        names = name_index.fuzzy_search(query, limit, score)
+    results = [{'name': name, 'gross_value': get_gross_value(orig_dict, name),
+                'degree': CAST_GRAPH.degree(name, is_actor)} for name in names]
+    return make_response(jsonify(results), 200 if results else 400)
+
+
+@app.route('/search/actors', methods=['GET'])
+@cached_get('actors', 'movies')
+def handle_actor_search_request():
+    """
+    Handler for name search requests on the actors API, e.g. /search/actors?q=bruce_w.
+    :return: JSON list of the actors found, best first.
+    """
+    return search_helper(ACTORS, ACTOR_NAMES, True)
+
+
+@app.route('/search/movies', methods=['GET'])
+@cached_get('actors', 'movies')
+def handle_movie_search_request():
+    """
+    Handler for name search requests on the movies API, e.g. /search/movies?q=pulp.
+    :return: JSON list of the movies found, best first.
+    """
+    return search_helper(MOVIES, MOVIE_NAMES, False)
+
+
+# Aggregate Requests:
+
+
+def aggregate_helper(collection: str, group_by: str) -> Response:
+    """
+    Helper function for aggregate requests: the count of nodes of every group, and the sum, average,
+    min and max of ?value=... (gross_value by default) over them, for the groups between ?from=...
+    and ?to=... if given. Answered from AGGREGATES, so it takes time in the number of groups only.
+    :param collection: 'actors' or 'movies'
+    :param group_by: 'year' or 'age'
+    :return: JSON with a row per group and the total of the rows, or 400 bad request.
+    """
+    value = request.args.get('value', 'gross_value')
+    aggregate = AGGREGATES.get((collection, group_by, value))
+    try:
+        low = int(request.args['from']) if 'from' in request.args else None
+        high = int(request.args['to']) if 'to' in request.args else None
+    except ValueError:
+        return make_response(jsonify("Invalid Request"), 400)
+    if aggregate is None:
+        return make_response(jsonify("Invalid Request"), 400)
+    groups = []
+    for row in aggregate.rows(low, high):
+        row[group_by] = row.pop('group')
+        groups.append(row)
+    result = {'group_by': group_by, 'value': value, 'groups': groups,
+              'total': aggregate.total(low, high)}
+    if group_by == 'age':
+        result['bucket_size'] = AGE_BUCKET_SIZE
+    return make_response(jsonify(result), 200)
+
+
+@app.route('/aggregates/movies/year', methods=['GET'])
+@cached_get('movies')
+def handle_movie_year_aggregate_request():
+    """
+    Handler for GET requests for the number of movies released every year and their gross values.
+    :return: JSON with a row per year.
+    """
+    return aggregate_helper('movies', 'year')
+
+
+@app.route('/aggregates/actors/age', methods=['GET'])
+@cached_get('actors')
+def handle_actor_age_aggregate_request():
+    """
+    Handler for GET requests for the number of actors of every age bucket and their gross values
+    (or, with ?value=gross_per_movie, their gross values per movie).
+    :return: JSON with a row per age bucket.
+    """
+    return aggregate_helper('actors', 'age')
 
 
 # PUT Requests:
 
 
+def valid_attrs(r_json, conversion_dict) -> bool:
+    """
+    Utility function to check the attribute values of a PUT or POST request: every attribute must
+    be known, lists of movies/actors must be lists of names, and other values single values (a
+    string, a number or null) that every storage can hold.
+    :param r_json: Dict (Attribute --> value)
+    :param conversion_dict: Dictionary to help translate between API attribute list and object variable names
+    :return: True if the values can be written, False otherwise
+    """
+    for attr, attr_val in r_json.items():
+        if attr not in conversion_dict:
+            return False
+        if conversion_dict[attr] in ('movies_starred_in', 'actors'):
+            if not isinstance(attr_val, list) or not all(isinstance(other, str) for other in attr_val):
+                return False
+            continue
+        try:
+            check_column_value(attr_val)
+        except ValueError:
+            return False
+    return True
+
+
 def update_list(orig_dict, name, r_json, conversion_dict):
     """
     Helper function for PUT requests. Updates objects based on a dictionary with updated
@@ -233,16 +1437,30 @@ def update_list(orig_dict, name, r_json, conversion_dict):
     and object variable names.
     :return: 201 response if update was successful, else 400 bad request.
     """
-    if False in [(attr in conversion_dict) for attr in r_json]:
+    if not valid_attrs(r_json, conversion_dict):
         return make_response(jsonify("Invalid Request"), 400)
-    item_orig = orig_dict[name].__dict__
+    apply_batch(orig_dict, {name: update_node(orig_dict, name, r_json, conversion_dict)}, [])
+    return make_response(jsonify("Updated Successfully"), 201)
+
+
+def update_node(orig_dict, name, r_json, conversion_dict):
+    """
+    Utility function to apply checked updated values to a copy of an object, without writing it.
+    The object is to be replaced by the copy rather than changed in place, so responses still
+    being streamed from the old one don't mix old and new values.
+    Takes the same parameters as update_list.
+    :return: The updated copy
+    """
+    node = copy.copy(orig_dict[name])
+    item_orig = node.__dict__
     for attr, attr_val in r_json.items():
         item_orig[conversion_dict[attr]] = attr_val
-    orig_dict[name].update(item_orig)
-    return make_response(jsonify("Updated Successfully"), 201)
+    node.update(item_orig)
+    return node
 
 
 @app.route('/actors/<string:name>', methods=["PUT"])
+@writes_database
 def handle_actor_put_request(name):
     """
     Handler for PUT requests on the Actors API.
@@ -256,6 +1474,7 @@ def handle_actor_put_request(name):
 
 
 @app.route('/movies/<string:name>', methods=['PUT'])
+@writes_database
 def handle_movie_put_request(name):
     """
     Handler for PUT requests on the Movies API.
@@ -281,18 +1500,29 @@ def add_to_list(orig_dict, name, r_json, conversion_dict, class_type):
     :param class_type: The type of object to create.
     :return: 201 successful update response (if valid request), else 400 bad request.
     """
-    if False in [(attr in conversion_dict) for attr in r_json]:
+    if not valid_attrs(r_json, conversion_dict):
         return make_response(jsonify("Invalid Request"), 400)
-    new_obj = class_type("", "", "")
+    apply_batch(orig_dict, {name: make_node(name, r_json, conversion_dict, class_type)}, [])
+    return make_response(jsonify("Added successfully."), 201)
+
+
+def make_node(name, r_json, conversion_dict, class_type):
+    """
+    Utility function to create an object out of checked attribute values. Its name is the
+    name it is added under, unless the values give another one.
+    Takes the same parameters as add_to_list.
+    :return: The new object
+    """
+    new_obj = class_type(name, "", "")
     new_obj_dict = new_obj.__dict__
     for attr, attr_val in r_json.items():
         new_obj_dict[conversion_dict[attr]] = attr_val
     new_obj.update(new_obj_dict)
-    orig_dict[name] = new_obj
-    return make_response(jsonify("Added successfully."), 201)
+    return new_obj
 
 
 @app.route('/actors/<string:name>', methods=['POST'])
+@writes_database
 def handle_actor_post_request(name):
     """
     Handler for POST requests on the Actors API.
@@ -309,6 +1539,7 @@ def handle_actor_post_request(name):
 
 
 @app.route('/movies/<string:name>', methods=['POST'])
+@writes_database
 def handle_movie_post_request(name):
     """
     Handler for POST requests on the Movies API.
@@ -328,6 +1559,7 @@ def handle_movie_post_request(name):
 
 
 @app.route('/actors/<string:name>', methods=['DELETE'])
+@writes_database
 def handle_actor_delete_request(name):
     """
     Handler for DELETE requests on the actors API.
@@ -336,13 +1568,14 @@ def handle_actor_delete_request(name):
     """
     name = name.replace("_", " ")
     if name in ACTORS:
-        del ACTORS[name]
+        apply_batch(ACTORS, {}, [name])
         return make_response(jsonify("Deleted Successfully"), 201)
     else:
         return make_response(jsonify("Actor not in database."), 400)
 
 
 @app.route('/movies/<string:name>', methods=['DELETE'])
+@writes_database
 def handle_movie_delete_request(name):
     """
     Handler for DELETE requests on the movies API.
@@ -351,17 +1584,256 @@ def handle_movie_delete_request(name):
     """
     name = name.replace("_", " ")
     if name in MOVIES:
-        del MOVIES[name]
+        apply_batch(MOVIES, {}, [name])
         return make_response(jsonify("Deleted Successfully"), 201)
     else:
         return make_response(jsonify("Movie not in database."), 400)
 
 
+# Batch Requests:
+
+
+def write_transaction(orig_dict):
+    """
+    Utility function to get a context manager grouping the writes to a dictionary of the API
+    into one transaction, where the storage supports them.
+    :param orig_dict: ACTORS or MOVIES
+    :return: The context manager
+    """
+    if isinstance(orig_dict, SqliteNodeStore):
+        return orig_dict.database.transaction()
+    return nullcontext()
+
+
+def get_batch_names(r_json):
+    """
+    Utility function to read the names of a batch GET or DELETE request: {"names": [...]}.
+    :param r_json: The JSON body of the request
+    :return: The list of names, or None if the body is invalid
+    """
+    if not isinstance(r_json, dict) or not isinstance(r_json.get('names'), list):
+        return None
+    names = r_json['names']
+    if not 0 < len(names) <= MAX_BATCH_SIZE or False in [isinstance(name, str) for name in names]:
+        return None
+    return names
+
+
+def batch_get_helper(r_json, orig_dict, collection: str) -> Response:
+    """
+    Helper function to handle batch GET requests. Looks up every name of the request, sending
+    the attributes asked for (?fields=...).
+    :param r_json: The JSON body of the request: {"names": [...]}
+    :param orig_dict: The dictionary (name --> GraphNode) to look in
+    :param collection: 'actors' or 'movies'
+    :return: 200 response with a result ({"name", "status", "data"}) per name, in order, or 400 bad request.
+    """
+    names = get_batch_names(r_json)
+    try:
+        fields = get_fields(collection)
+    except ValueError:
+        names = None
+    if names is None:
+        return make_response(jsonify("Bad Request"), 400)
+    results = []
+    for name in names:
+        node = orig_dict.get(name)
+        if node is None:
+            results.append(b'{"name":' + dumps(name) + b',"status":404}')
+        else:
+            results.append(b'{"name":' + dumps(name) + b',"status":200,"data":' +
+                           FRAGMENTS.get(collection, name, node.__dict__, fields=fields) + b'}')
+    return Response(b'{"results":' + join_fragments(results).rstrip() + b'}\n', status=200,
+                    mimetype='application/json')
+
+
+def batch_upsert_helper(r_json, orig_dict, conversion_dict, class_type) -> Response:
+    """
+    Helper function to handle batch POST requests. Adds or updates every object of the request,
+    all at once: if any of them is invalid, none are written.
+    :param r_json: The JSON body of the request. Dict (Name --> Dict (Attribute --> value))
+    :param orig_dict: The dictionary (name --> GraphNode) to write to
+    :param conversion_dict: Dictionary to convert JSON attributes to class variable names
+    :param class_type: The type of object to create for new names
+    :return: 201 response if everything was written, else 400; with a result ({"name", "status", "message"})
+    per object and whether the batch was applied.
+    """
+    if not isinstance(r_json, dict) or not 0 < len(r_json) <= MAX_BATCH_SIZE:
+        return make_response(jsonify("Bad Request"), 400)
+    results = []
+    for name, attrs in r_json.items():
+        if not isinstance(attrs, dict) or not attrs or not valid_attrs(attrs, conversion_dict):
+            results.append({'name': name, 'status': 400, 'message': "Invalid Request"})
+        else:
+            results.append({'name': name, 'status': 201,
+                            'message': "Updated Successfully" if name in orig_dict else "Added successfully."})
+    if False in [(result['status'] == 201) for result in results]:
+        return make_response(jsonify({'applied': False, 'results': results}), 400)
+    apply_batch(orig_dict, {name: update_node(orig_dict, name, attrs, conversion_dict) if name in orig_dict
+                            else make_node(name, attrs, conversion_dict, class_type)
+                            for name, attrs in r_json.items()}, [])
+    return make_response(jsonify({'applied': True, 'results': results}), 201)
+
+
+def batch_delete_helper(r_json, orig_dict) -> Response:
+    """
+    Helper function to handle batch DELETE requests. Deletes every name of the request,
+    all at once: if any of them isn't in the database, none are deleted.
+    :param r_json: The JSON body of the request: {"names": [...]}
+    :param orig_dict: The dictionary (name --> GraphNode) to delete from
+    :return: 201 response if everything was deleted, else 400; with a result ({"name", "status", "message"})
+    per name and whether the batch was applied.
+    """
+    names = get_batch_names(r_json)
+    if names is None:
+        return make_response(jsonify("Bad Request"), 400)
+    names = list(dict.fromkeys(names))  # Drop repeated names
+    results = [{'name': name, 'status': 201, 'message': "Deleted Successfully"} if name in orig_dict
+               else {'name': name, 'status': 404, 'message': "Not in database."} for name in names]
+    if False in [(result['status'] == 201) for result in results]:
+        return make_response(jsonify({'applied': False, 'results': results}), 400)
+    apply_batch(orig_dict, {}, names)
+    return make_response(jsonify({'applied': True, 'results': results}), 201)
+
+
+@app.route('/batch/actors/get', methods=['POST'])
+@reads_database
+def handle_actor_batch_get_request():
+    """
+    Handler for batch GET requests on the actors API: {"names": [...]}.
+    :return: JSON results for every name, in order.
+    """
+    return batch_get_helper(request.get_json(silent=True), ACTORS, 'actors')
+
+
+@app.route('/batch/movies/get', methods=['POST'])
+@reads_database
+def handle_movie_batch_get_request():
+    """
+    Handler for batch GET requests on the movies API: {"names": [...]}.
+    :return: JSON results for every name, in order.
+    """
+    return batch_get_helper(request.get_json(silent=True), MOVIES, 'movies')
+
+
+@app.route('/batch/actors', methods=['POST'])
+@writes_database
+def handle_actor_batch_post_request():
+    """
+    Handler for batch POST requests on the actors API: {"<name>": {"<attribute>": <value>, ...}, ...}.
+    :return: 201 if all the actors were added or updated, else 400 with the results per actor.
+    """
+    return batch_upsert_helper(request.get_json(silent=True), ACTORS, ACTOR_JSON_TO_NODE_DICT, Actor)
+
+
+@app.route('/batch/movies', methods=['POST'])
+@writes_database
+def handle_movie_batch_post_request():
+    """
+    Handler for batch POST requests on the movies API: {"<name>": {"<attribute>": <value>, ...}, ...}.
+    :return: 201 if all the movies were added or updated, else 400 with the results per movie.
+    """
+    return batch_upsert_helper(request.get_json(silent=True), MOVIES, MOVIE_JSON_TO_NODE_DICT, Movie)
+
+
+@app.route('/batch/actors', methods=['DELETE'])
+@writes_database
+def handle_actor_batch_delete_request():
+    """
+    Handler for batch DELETE requests on the actors API: {"names": [...]}.
+    :return: 201 if all the actors were deleted, else 400 with the results per actor.
+    """
+    return batch_delete_helper(request.get_json(silent=True), ACTORS)
+
+
+@app.route('/batch/movies', methods=['DELETE'])
+@writes_database
+def handle_movie_batch_delete_request():
+    """
+    Handler for batch DELETE requests on the movies API: {"names": [...]}.
+    :return: 201 if all the movies were deleted, else 400 with the results per movie.
+    """
+    return batch_delete_helper(request.get_json(silent=True), MOVIES)
+
+
+def warm_fragments():
+    """
+    Serialize every node of the database ahead of time, e.g. so worker processes share the fragments.
+    :return: Number of nodes serialized
+    """
+    for collection, orig_dict in (('actors', ACTORS), ('movies', MOVIES)):
+        for name, node in orig_dict.items():
+            FRAGMENTS.get(collection, name, node.__dict__)
+    return len(FRAGMENTS)
+
+
+def serve(num_workers: int = None, host: str = '127.0.0.1', port: int = 5000, on_ready=None):
+    """
+    Serve the API from several worker processes. The ACTORS and MOVIES loaded in this process,
+    with their indexes and serialized forms, are shared read-only with the workers (copy-on-write
+    after fork), so memory doesn't grow with the number of workers. Writes are turned down, since
+    they would only reach the worker that happened to get them.
+    :param num_workers: Number of worker processes, the number of CPUs by default
+    :param host: Host to listen on
+    :param port: Port to listen on
+    :param on_ready: Function called with the port once the workers are started
+    :return: Nothing, returns when the server is stopped (SIGINT or SIGTERM).
+    """
+    global READ_ONLY
+    READ_ONLY = True
+    warm_fragments()
+    try:
+        serve_prefork(app, host, port, num_workers, on_ready=on_ready)
+    finally:
+        READ_ONLY = False
+
+
 def __main__():
-    app.run(debug=True)
+    parser = argparse.ArgumentParser(description="Serve the Hollywood Database API.")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Serve read-only from this many processes (0 for the debug server)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--data', default='data.json', help="JSON file or binary snapshot (.snap) to load")
+    parser.add_argument('--format', choices=['json', 'lazy', 'snapshot'], help="Format of the data file")
+    parser.add_argument('--max-actors', type=int, default=50)
+    parser.add_argument('--max-movies', type=int, default=50)
+    parser.add_argument('--save-snapshot', metavar='FILE',
+                        help="Save the loaded data as a snapshot for fast starts, and exit")
+    parser.add_argument('--profiling', action='store_true',
+                        help="Profile the requests sent with an X-Profile header, see /profiles/<id>")
+    parser.add_argument('--log-dir', help="Directory of the write-ahead log keeping the changes made through the API")
+    parser.add_argument('--sync-every', type=int, default=1, help="Number of logged changes to group into one fsync")
+    parser.add_argument('--sync-interval', type=float, help="Max seconds a logged change can wait for its fsync")
+    parser.add_argument('--snapshot-every', type=int, default=1000, help="Number of logged changes between snapshots")
+    parser.add_argument('--sqlite', metavar='FILE',
+                        help="Serve from this SQLite database, filled from the data file if it is empty")
+    args = parser.parse_args()
+    if args.sqlite and args.log_dir:
+        parser.error("--sqlite keeps the changes itself, it can't be used with --log-dir")
+    if args.sqlite and args.workers > 0:
+        parser.error("--sqlite can't be shared with worker processes")
+    global ALLOW_PROFILING
+    ALLOW_PROFILING = args.profiling
+    log = None
+    if args.log_dir:
+        log = WriteAheadLog(args.log_dir, args.sync_every, args.sync_interval, args.snapshot_every)
+    if args.save_snapshot:
+        load_dataset(args.data, args.max_actors, args.max_movies, args.format, log, args.sqlite)
+        save_snapshot(ACTORS, MOVIES, args.save_snapshot)
+    elif args.workers > 0:
+        # Workers are forked from the loaded data, so it has to be loaded first
+        create_app(args.data, args.max_actors, args.max_movies, args.format, log=log)
+        serve(args.workers, args.host, args.port)
+    else:
+        create_app(args.data, args.max_actors, args.max_movies, args.format, background=True, log=log,
+                   sqlite=args.sqlite)
+        try:
+            app.run(debug=True, host=args.host, port=args.port, use_reloader=False)
+        finally:
+            if WRITE_LOG is not None:
+                WRITE_LOG.close()
 
 
 if __name__ == '__main__':
     __main__()
-
-
@@ -2,17 +2,61 @@ from flask import Flask, jsonify, request,abort, make_response
 from venv.DataAnalysis import extract_from_json
 from venv.Graph import make_graph, Actor, Movie
 import json
+import os
+import tempfile
 from venv.WebAPI import *
 import unittest
 
+# Actors and movies laid out like data.json, loaded by the API for the tests
+TEST_DATA = [{'Bruce Willis': {'json_class': 'Actor', 'name': 'Bruce Willis', 'age': 61, 'total_gross': 562709189,
+                               'movies': ['The Jackal', 'Color of Night', 'Pulp Fiction']},
+              'Kathleen Quinlan': {'json_class': 'Actor', 'name': 'Kathleen Quinlan', 'age': 62, 'total_gross': 1000,
+                                   'movies': ['Apollo 13']},
+              'James Whitmore': {'json_class': 'Actor', 'name': 'James Whitmore', 'age': 87, 'total_gross': 2000,
+                                 'movies': ['The Shawshank Redemption']},
+              'David Dukes': {'json_class': 'Actor', 'name': 'David Dukes', 'age': 60, 'total_gross': 3000,
+                              'movies': ['Date with an Angel']},
+              'Paul Newman': {'json_class': 'Actor', 'name': 'Paul Newman', 'age': 83, 'total_gross': 5000,
+                              'movies': ['The Verdict']}},
+             {'The Verdict': {'json_class': 'Movie', 'name': 'The Verdict', 'year': 1982, 'box_office': 54000000,
+                              'actors': ['Paul Newman', 'James Mason']},
+              'Some Movie': {'json_class': 'Movie', 'name': 'Some Movie', 'year': 1990, 'box_office': 39,
+                             'actors': ['Someone']},
+              'Pulp Fiction': {'json_class': 'Movie', 'name': 'Pulp Fiction', 'year': 1994, 'box_office': 213900000,
+                               'actors': ['Bruce Willis', 'John Travolta']},
+              'The Shawshank Redemption': {'json_class': 'Movie', 'name': 'The Shawshank Redemption', 'year': 1994,
+                                           'box_office': 58300000, 'actors': ['Morgan Freeman', 'James Whitmore']},
+              'Color of Night': {'json_class': 'Movie', 'name': 'Color of Night', 'year': 1994,
+                                 'box_office': 19700000, 'actors': ['Bruce Willis']}}]
+
 
 class WebAPITests(unittest.TestCase):
     """
     Test Suite for the Movie-Actor Information API. Set (50,50) actors and movies to
-    parse from the JSON.
+    parse from the JSON written out of TEST_DATA.
     @author sahil1105
     """
 
+    @classmethod
+    def setUpClass(cls):
+        """
+        Write the test data and load the database of the API from it
+        :return: cls
+        """
+        cls.directory = tempfile.TemporaryDirectory()
+        cls.data_file = os.path.join(cls.directory.name, 'data.json')
+        with open(cls.data_file, 'w') as data_file:
+            json.dump(TEST_DATA, data_file)
+        create_app(cls.data_file, 50, 50)
+
+    @classmethod
+    def tearDownClass(cls):
+        """
+        Remove the test data
+        :return: cls
+        """
+        cls.directory.cleanup()
+
     def setUp(self):
         """
         Setup the context and activate the API
@@ -20,6 +64,24 @@ class WebAPITests(unittest.TestCase):
         """
         self.app = app.test_client()
 
+    def test_ready(self):
+        """
+        Test the readiness check, and that requests wait for the database to be loaded
+        :return: self
+        """
+        rv = self.app.get('/ready')
+        assert rv.status_code == 200
+        rv_json = rv.get_json()
+        assert rv_json['ready'] and rv_json['actors'] > 0 and rv_json['source'] == self.data_file
+        import venv.WebAPI as web_api
+        web_api.LOAD_STATUS['state'] = 'loading'
+        try:
+            assert self.app.get('/ready').status_code == 503
+            assert self.app.get('/actors/Bruce_Willis').status_code == 503
+            assert self.app.get('/').status_code == 200
+        finally:
+            web_api.LOAD_STATUS['state'] = 'ready'
+
     def test_options(self):
         """
         Test the OPTIONS functionality
@@ -47,7 +109,7 @@ class WebAPITests(unittest.TestCase):
         # Get Bruce Willis' and actors of age 62's information
         rv = self.app.get('/actors/name=Bruce_Willis|age=62')
         self.assertEqual(rv.status_code, 200)
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         # Ensure the data is correct
         assert b'"Bruce Willis"' in rv.data
         assert b'"Kathleen Quinlan"' in rv.data
@@ -66,7 +128,7 @@ class WebAPITests(unittest.TestCase):
         # Make a custom query
         rv = self.app.get('/movies/year=1982|box_office=39')
         self.assertEqual(rv.status_code, 200)
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         # print(json.dumps(rv_json, indent=4))
         # Ensure that the data holds up
         assert len(rv_json) == 2
@@ -81,7 +143,7 @@ class WebAPITests(unittest.TestCase):
         # Get Bruce Willis' information
         rv = self.app.get('/actors/Bruce_Willis')
         assert rv.status_code == 200  # Ensure the status code is correct
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         # print(json.dumps(rv_json, indent=4))
         assert rv_json['name'] == 'Bruce Willis'
         assert rv_json['age'] == 61
@@ -97,7 +159,7 @@ class WebAPITests(unittest.TestCase):
         # Get info for the movie The Verdict
         rv = self.app.get('/movies/The_Verdict')
         assert rv.status_code == 200
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         # print(json.dumps(rv_json, indent=4))
         # Ensure the information is correct
         assert rv_json['name'] == "The Verdict"
@@ -106,7 +168,7 @@ class WebAPITests(unittest.TestCase):
         # Try to get a movie not in the database
         rv = self.app.get('/movies/The_Hangover')
         assert rv.status_code == 400
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         assert "Couldn't find" in rv_json
 
     def test_actor_get_request_and(self):
@@ -117,7 +179,7 @@ class WebAPITests(unittest.TestCase):
         # Make A request
         rv = self.app.get('/actors/?name=James_Whitmore&age=87')
         assert rv.status_code == 200
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         # print(json.dumps(rv_json, indent=4))
         # Check that the response holds up
         assert rv_json[0]['name'] == "James Whitmore" and rv_json[0]['age'] == 87
@@ -134,7 +196,7 @@ class WebAPITests(unittest.TestCase):
         # Make a request
         rv = self.app.get('/movies/?year=1994')
         assert rv.status_code == 200
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         # Ensure the data holds up for each object
         for movie in rv_json:
             assert movie['year_released'] == 1994
@@ -142,9 +204,230 @@ class WebAPITests(unittest.TestCase):
         # Ensure mis-informed queries are flagged
         rv = self.app.get('/movies/?year=1994&name=Northh')
         assert rv.status_code == 400
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         assert rv_json == []
 
+    def test_range_request(self):
+        """
+        Test GET functionality with range operators
+        :return: self
+        """
+        rv = self.app.get('/actors/?age__gte=61&age__lt=88')
+        assert rv.status_code == 200
+        rv_json = rv.get_json()
+        assert 'James Whitmore' in [actor['name'] for actor in rv_json]
+        for actor in rv_json:
+            assert 61 <= actor['age'] < 88
+        rv = self.app.get('/movies/?year__between=1980,1989')
+        for movie in rv.get_json():
+            assert 1980 <= movie['year_released'] <= 1989
+        # Ensure unknown operators, non-numeric attributes and bad bounds are flagged
+        for query in ['age__around=50', 'name__gt=A', 'age__gte=old', 'year__between=1980']:
+            rv = self.app.get('/actors/?' + query)
+            assert rv.status_code == 400
+
+    def test_explain_request(self):
+        """
+        Test that ?explain=1 describes the plan of an AND query instead of returning the matches
+        :return: self
+        """
+        rv = self.app.get('/actors/?age=87&name=James_Whitmore&explain=1')
+        assert rv.status_code == 200
+        rv_json = rv.get_json()
+        assert rv_json['collection'] == 'actors'
+        if rv_json['access'] == 'index':
+            assert len(rv_json['plan']) == 2
+            assert rv_json['plan'][0]['estimated_rows'] <= rv_json['plan'][1]['estimated_rows']
+        assert rv_json['rows'] == 1
+
+    def test_conditional_get_request(self):
+        """
+        Test that GET responses carry an ETag, which stays valid until the data changes
+        :return: self
+        """
+        rv = self.app.get('/movies/The_Verdict')
+        etag = rv.headers['ETag']
+        rv = self.app.get('/movies/The_Verdict', headers={'If-None-Match': etag})
+        assert rv.status_code == 304 and rv.data == b''
+        # Ensure writes invalidate the cached response
+        headers = {'content-type': 'application/json'}
+        self.app.put('/movies/The_Verdict', data=json.dumps({'box_office': 54000001}), headers=headers)
+        rv = self.app.get('/movies/The_Verdict', headers={'If-None-Match': etag})
+        assert rv.status_code == 200
+        assert rv.headers['ETag'] != etag
+        assert rv.get_json()['gross_value'] == 54000001
+
+    def test_projected_and_compressed_request(self):
+        """
+        Test that only the fields asked for are sent, and that large responses are compressed on request
+        :return: self
+        """
+        import gzip
+        rv = self.app.get('/actors/Bruce_Willis?fields=name,age')
+        assert set(rv.get_json()) == {'name', 'age'}
+        rv = self.app.get('/movies/?year=1994&fields=name,box_office')
+        rv_json = rv.get_json()
+        assert rv_json and all(set(movie) == {'name', 'gross_value'} for movie in rv_json)
+        assert self.app.get('/actors/Bruce_Willis?fields=name,salary').status_code == 400
+        rv = self.app.post('/batch/actors/get?fields=age', data=json.dumps({'names': ['Bruce Willis']}),
+                           content_type='application/json')
+        assert set(rv.get_json()['results'][0]['data']) == {'age'}
+        # Compression, above a size threshold
+        plain = self.app.get('/actors/')
+        assert 'Content-Encoding' not in plain.headers
+        rv = self.app.get('/actors/', headers={'Accept-Encoding': 'gzip'})
+        if len(plain.data) >= MIN_COMPRESS_SIZE:
+            assert rv.headers['Content-Encoding'] == 'gzip' and 'Accept-Encoding' in rv.headers['Vary']
+            assert gzip.decompress(rv.data) == plain.data
+            assert rv.headers['ETag'] != plain.headers['ETag']
+            rv = self.app.get('/actors/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': rv.headers['ETag']})
+            assert rv.status_code == 304
+        rv = self.app.get('/actors/Bruce_Willis?fields=name', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in rv.headers  # Too small to bother
+
+    def test_paginated_request(self):
+        """
+        Test paging through a collection with limit and cursor, and filters with pages
+        :return: self
+        """
+        rv = self.app.get('/actors/')
+        all_names = sorted(actor['name'] for actor in rv.get_json())
+        assert rv.headers['X-Total-Count'] == str(len(all_names))
+        names, cursor = [], None
+        while True:
+            rv = self.app.get('/actors/', query_string=dict(limit=3, **({'cursor': cursor} if cursor else {})))
+            assert rv.status_code == 200
+            assert rv.headers['X-Total-Count'] == str(len(all_names))
+            page = [actor['name'] for actor in rv.get_json()]
+            assert len(page) <= 3
+            names += page
+            cursor = rv.headers.get('X-Next-Cursor')
+            if cursor is None:
+                break
+        assert names == all_names
+        # Filtered queries are paged the same way
+        rv = self.app.get('/movies/?year__gte=1900&limit=2')
+        rv_json = rv.get_json()
+        assert len(rv_json) <= 2 and rv_json == sorted(rv_json, key=lambda movie: movie['name'])
+        # Ensure bad limits are flagged
+        rv = self.app.get('/actors/?limit=0')
+        assert rv.status_code == 400
+        rv = self.app.get('/actors/?limit=ten')
+        assert rv.status_code == 400
+
+    def test_streamed_request(self):
+        """
+        Test that streamed responses hold the same objects as regular ones
+        :return: self
+        """
+        rv = self.app.get('/movies/')
+        streamed = self.app.get('/movies/?stream=1')
+        assert streamed.status_code == 200
+        assert streamed.get_json() == rv.get_json()
+        assert streamed.headers['X-Total-Count'] == rv.headers['X-Total-Count']
+
+    def test_graph_requests(self):
+        """
+        Test the co-stars, neighborhood and path requests, and that they follow writes
+        :return: self
+        """
+        self.app.post('/batch/actors', data=json.dumps({'Graph Test A': {'movies': ['Graph Movie 1']},
+                                                        'Graph Test B': {'movies': ['Graph Movie 1', 'Graph Movie 2']},
+                                                        'Graph Test C': {'movies': ['Graph Movie 2']}}),
+                      content_type='application/json')
+        rv = self.app.get('/actors/Graph_Test_B/costars')
+        assert rv.status_code == 200
+        rv_json = rv.get_json()
+        assert rv_json['co_stars'] == [{'name': 'Graph Test A', 'shared_movies': 1},
+                                       {'name': 'Graph Test C', 'shared_movies': 1}]
+        rv_json = self.app.get('/actors/Graph_Test_A/neighborhood?depth=2').get_json()
+        assert rv_json['movies'] == {'Graph Movie 1': 1}
+        assert rv_json['actors'] == {'Graph Test A': 0, 'Graph Test B': 2} and not rv_json['truncated']
+        rv_json = self.app.get('/movies/Graph_Movie_1/neighborhood?depth=1').get_json()
+        assert set(rv_json['actors']) == {'Graph Test A', 'Graph Test B'}
+        rv = self.app.get('/actors/Graph_Test_A/path/Graph_Test_C')
+        assert rv.status_code == 200
+        assert rv.get_json()['path'] == ['Graph Test A', 'Graph Movie 1', 'Graph Test B',
+                                         'Graph Movie 2', 'Graph Test C']
+        assert self.app.get('/actors/Graph_Test_A/path/Graph_Test_C?max_length=1').status_code == 400
+        # Limits are enforced
+        assert self.app.get('/actors/Graph_Test_A/neighborhood?depth=100').status_code == 400
+        assert self.app.get('/actors/Graph_Test_A/costars?limit=0').status_code == 400
+        assert self.app.get('/actors/Jason_Sttatham/costars').status_code == 400
+        # Writes show right away, though the responses above are cached
+        self.app.put('/actors/Graph_Test_C', data=json.dumps({'movies': []}), content_type='application/json')
+        assert self.app.get('/actors/Graph_Test_A/path/Graph_Test_C').status_code == 400
+        self.app.delete('/batch/actors', data=json.dumps({'names': ['Graph Test A', 'Graph Test B', 'Graph Test C']}),
+                        content_type='application/json')
+        assert self.app.get('/actors/Graph_Test_B/costars').status_code == 400
+
+    def test_search_requests(self):
+        """
+        Test name search by prefix and with typos, and that it follows writes
+        :return: self
+        """
+        rv = self.app.get('/search/actors?q=bruce_w')
+        assert rv.status_code == 200
+        assert 'Bruce Willis' in [result['name'] for result in rv.get_json()]
+        rv = self.app.get('/search/actors?q=wil')  # Any word of the name
+        assert 'Bruce Willis' in [result['name'] for result in rv.get_json()]
+        rv = self.app.get('/search/actors?q=bruse_wilis')  # Typos
+        assert rv.get_json()[0]['name'] == 'Bruce Willis'
+        rv = self.app.get('/search/movies?q=the_verd&rank=degree')
+        assert rv.get_json()[0]['name'] == 'The Verdict'
+        assert self.app.get('/search/actors?q=bru&rank=popularity').status_code == 400
+        assert self.app.get('/search/actors?q=xqzxqz').status_code == 400
+        # New actors can be found right away, ranked by gross value
+        self.app.post('/actors/Bruce_Search_Test', data=json.dumps({'total_gross': 10 ** 12}),
+                      content_type='application/json')
+        rv = self.app.get('/search/actors?q=bru&limit=1')
+        assert [result['name'] for result in rv.get_json()] == ['Bruce Search Test']
+        self.app.delete('/actors/Bruce_Search_Test')
+        rv = self.app.get('/search/actors?q=bru')
+        assert 'Bruce Search Test' not in [result['name'] for result in rv.get_json()]
+
+    def test_aggregate_requests(self):
+        """
+        Test the aggregates by year and by age, and that they follow writes
+        :return: self
+        """
+        rv = self.app.get('/aggregates/actors/age')
+        assert rv.status_code == 200
+        rv_json = rv.get_json()
+        assert rv_json['bucket_size'] == 10
+        assert rv_json['total']['count'] == sum(row['count'] for row in rv_json['groups'])
+        assert self.app.get('/aggregates/actors/age?value=gross_per_movie').status_code == 200
+        assert self.app.get('/aggregates/actors/age?value=height').status_code == 400
+        assert self.app.get('/aggregates/movies/year?from=later').status_code == 400
+        headers = {'content-type': 'application/json'}
+        self.app.post('/movies/Aggregate_Test_A', data=json.dumps({'year': 1888, 'box_office': 100}), headers=headers)
+        self.app.post('/movies/Aggregate_Test_B', data=json.dumps({'year': 1888, 'box_office': 300}), headers=headers)
+        rv = self.app.get('/aggregates/movies/year?from=1888&to=1888')
+        assert rv.get_json()['groups'] == [{'year': 1888, 'count': 2, 'sum': 400, 'avg': 200,
+                                            'min': 100, 'max': 300}]
+        self.app.put('/movies/Aggregate_Test_B', data=json.dumps({'box_office': 50}), headers=headers)
+        self.app.delete('/movies/Aggregate_Test_A')
+        rv = self.app.get('/aggregates/movies/year?from=1888&to=1888')
+        assert rv.get_json()['total'] == {'count': 1, 'sum': 50, 'avg': 50, 'min': 50, 'max': 50}
+        self.app.delete('/movies/Aggregate_Test_B')
+        rv = self.app.get('/aggregates/movies/year?from=1888&to=1888')
+        assert rv.get_json()['groups'] == []
+
+    def test_invalid_values_and_posted_names(self):
+        """
+        Test that values no storage can hold are turned down, and that nodes posted without a name get theirs
+        :return: self
+        """
+        headers = {'content-type': 'application/json'}
+        assert self.app.put('/actors/Bruce_Willis', data=json.dumps({'age': [1]}), headers=headers).status_code == 400
+        assert self.app.post('/movies/Value_Test', data=json.dumps({'actors': 'Bruce Willis'}),
+                             headers=headers).status_code == 400
+        assert self.app.post('/batch/actors', data=json.dumps({'Value Test': {'total_gross': {'a': 1}}}),
+                             headers=headers).status_code == 400
+        assert self.app.post('/actors/Value_Test', data=json.dumps({'age': 30}), headers=headers).status_code == 201
+        assert self.app.get('/actors/Value_Test').get_json()['name'] == 'Value Test'
+        self.app.delete('/actors/Value_Test')
+
     def test_actor_put_request(self):
         """
         Test PUT functionality of the Actors API
@@ -157,7 +440,7 @@ class WebAPITests(unittest.TestCase):
 
         # Ensure the changes were made
         rv = self.app.get('/actors/Bruce_Willis')
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         assert rv_json['age'] == 65
 
         # Ensure mis-formed queries are flagged.
@@ -177,7 +460,7 @@ class WebAPITests(unittest.TestCase):
 
         # Ensure the changes were made
         rv = self.app.get('/movies/Pulp_Fiction')
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         assert rv_json['gross_value'] == 234242 and rv_json['actors'] == ['Test']
 
         # Ensure that mis-formed requests are flagged
@@ -200,7 +483,7 @@ class WebAPITests(unittest.TestCase):
 
         # Ensure the actor was added with the correct information
         rv = self.app.get('/actors/Mila_Kunis')
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         # print(json.dumps(rv_json, indent=4))
         assert rv_json == dict(name="Mila Kunis", age=31, movies_starred_in=['Friends with Benefits'],
                                gross_value=23424, edge_weights=[], edges=[])
@@ -218,7 +501,7 @@ class WebAPITests(unittest.TestCase):
 
         # Ensure the movie was added with the correct information
         rv = self.app.get('/movies/Prometheus')
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         # print(json.dumps(rv_json, indent=4))
         assert rv_json == dict(name="Prometheus", year_released=2012, actors=['Michael Fassbender'],
                                gross_value=23424, edge_weights=[], edges=[])
@@ -228,6 +511,219 @@ class WebAPITests(unittest.TestCase):
         rv = self.app.post('/movies/Prometheus', data=json.dumps(temp_dict), headers=headers)
         assert rv.status_code == 400
 
+    def test_filters_follow_writes(self):
+        """
+        Test that attribute filters see the changes made through the API
+        :return: self
+        """
+        headers = {'content-type': 'application/json'}
+        rv = self.app.post('/actors/Nick_Offerman', data=json.dumps({'name': 'Nick Offerman', 'age': 46}),
+                           headers=headers)
+        assert rv.status_code == 201
+        rv = self.app.get('/actors/?age=46&name=Nick_Offerman')
+        assert rv.status_code == 200
+        assert len(rv.get_json()) == 1
+        rv = self.app.put('/actors/Nick_Offerman', data=json.dumps({'age': 47}), headers=headers)
+        assert rv.status_code == 201
+        rv = self.app.get('/actors/?age=46&name=Nick_Offerman')
+        assert rv.status_code == 400
+        rv = self.app.get('/actors/name=Nick_Offerman|age=1000')
+        assert rv.get_json()[0]['age'] == 47
+        rv = self.app.delete('/actors/Nick_Offerman')
+        assert rv.status_code == 201
+        rv = self.app.get('/actors/name=Nick_Offerman|age=47')
+        assert rv.status_code == 400
+
+    def test_batch_requests(self):
+        """
+        Test the batch GET, POST and DELETE functionality, and that invalid batches change nothing
+        :return: self
+        """
+        headers = {'content-type': 'application/json'}
+        batch = {'Jason Segel': {'name': 'Jason Segel', 'age': 37}, 'Alyson Hannigan': {'name': 'Alyson Hannigan'},
+                 'Cobie Smulders': {'name': 'Cobie Smulders', 'height': 180}}
+        rv = self.app.post('/batch/actors', data=json.dumps(batch), headers=headers)
+        assert rv.status_code == 400
+        rv_json = rv.get_json()
+        assert not rv_json['applied'] and [result['status'] for result in rv_json['results']] == [201, 201, 400]
+        rv = self.app.get('/actors/Jason_Segel')
+        assert rv.status_code == 400
+        # Apply a valid batch
+        del batch['Cobie Smulders']
+        rv = self.app.post('/batch/actors', data=json.dumps(batch), headers=headers)
+        assert rv.status_code == 201
+        rv = self.app.post('/batch/actors/get', data=json.dumps({'names': ['Jason Segel', 'Ted Mosby']}),
+                           headers=headers)
+        rv_json = rv.get_json()
+        assert rv_json['results'][0]['data']['age'] == 37 and rv_json['results'][1] == {'name': 'Ted Mosby',
+                                                                                         'status': 404}
+        rv = self.app.get('/actors/?age=37&name=Jason_Segel')
+        assert rv.status_code == 200
+        # Deletes are all or nothing too
+        rv = self.app.delete('/batch/actors', data=json.dumps({'names': ['Jason Segel', 'Ted Mosby']}),
+                             headers=headers)
+        assert rv.status_code == 400
+        rv = self.app.delete('/batch/actors', data=json.dumps({'names': ['Jason Segel', 'Alyson Hannigan']}),
+                             headers=headers)
+        assert rv.status_code == 201
+        rv = self.app.get('/actors/Alyson_Hannigan')
+        assert rv.status_code == 400
+        rv = self.app.delete('/batch/actors', data=json.dumps({'names': 'Jason Segel'}), headers=headers)
+        assert rv.status_code == 400
+
+    def test_metrics_request(self):
+        """
+        Test that requests show in the metrics, and that requests can be profiled
+        :return: self
+        """
+        import venv.WebAPI as web_api
+        self.app.get('/movies/?year=1994')
+        self.app.get('/movies/?year=1994')
+        rv = self.app.get('/metrics')
+        assert rv.status_code == 200 and rv.mimetype == 'text/plain'
+        metrics = rv.data.decode('utf-8')
+        assert 'webapi_request_seconds_count{method="GET",route="/movies/"}' in metrics
+        assert 'webapi_result_size_bucket{route="/movies/",le="+Inf"}' in metrics
+        assert 'webapi_query_access_total{access="index",collection="movies"}' in metrics
+        assert 'webapi_response_cache_hits_total ' in metrics
+        # Profiling is opt-in
+        rv = self.app.get('/actors/Bruce_Willis', headers={'X-Profile': '1'})
+        assert 'X-Profile-Id' not in rv.headers
+        web_api.ALLOW_PROFILING = True
+        try:
+            rv = self.app.get('/actors/?age__gte=40', headers={'X-Profile': '1'})
+        finally:
+            web_api.ALLOW_PROFILING = False
+        rv = self.app.get('/profiles/' + rv.headers['X-Profile-Id'])
+        assert rv.status_code == 200 and b'function calls' in rv.data
+        assert self.app.get('/profiles/0').status_code == 400
+
+    def test_read_only_mode(self):
+        """
+        Test that writes are turned down while the database is shared read-only between workers
+        :return: self
+        """
+        import venv.WebAPI as web_api
+        headers = {'content-type': 'application/json'}
+        web_api.READ_ONLY = True
+        try:
+            rv = self.app.put('/actors/Bruce_Willis', data=json.dumps({'age': 99}), headers=headers)
+            assert rv.status_code == 405
+            rv = self.app.post('/batch/actors/get', data=json.dumps({'names': ['Bruce Willis']}), headers=headers)
+            assert rv.status_code == 200
+        finally:
+            web_api.READ_ONLY = False
+        rv = self.app.get('/actors/Bruce_Willis')
+        assert rv.get_json()['age'] != 99
+
+    def test_concurrent_reads_and_writes(self):
+        """
+        Stress test with threads reading while others write, checking that no reader ever sees a
+        write half-applied, and reporting the throughput.
+        :return: self
+        """
+        import threading
+        import time
+        num_writes, num_readers, errors, num_reads = 100, 4, [], [0]
+        writing = threading.Event()
+        writing.set()
+
+        def write():
+            client = app.test_client()
+            for i in range(1, num_writes + 1):
+                # The two actors always have the same age, and the gross is always 1000 times the age
+                attrs = {'age': i, 'total_gross': 1000 * i}
+                client.post('/batch/actors', data=json.dumps({'Stress Test A': attrs, 'Stress Test B': attrs}),
+                            content_type='application/json')
+                client.put('/actors/Stress_Test_A', data=json.dumps(attrs), content_type='application/json')
+            writing.clear()
+
+        def read():
+            client = app.test_client()
+            while True:
+                done = not writing.is_set()
+                rv = client.post('/batch/actors/get', data=json.dumps({'names': ['Stress Test A', 'Stress Test B']}),
+                                 content_type='application/json')
+                batch_nodes = [result['data'] for result in rv.get_json()['results'] if result['status'] == 200]
+                rv = client.get('/actors/?stream=1')
+                stream_nodes = [node for node in rv.get_json() if node['name'].startswith('Stress Test')]
+                # Each response must be consistent in itself, a write may come in between the two
+                for nodes in [batch_nodes, stream_nodes]:
+                    if len({node['age'] for node in nodes}) > 1 or \
+                            False in [(node['gross_value'] == 1000 * node['age']) for node in nodes]:
+                        errors.append(nodes)
+                num_reads[0] += 2
+                if done:
+                    break
+
+        client = app.test_client()
+        client.post('/batch/actors', data=json.dumps({'Stress Test A': {'age': 0, 'total_gross': 0},
+                                                      'Stress Test B': {'age': 0, 'total_gross': 0}}),
+                    content_type='application/json')
+        threads = [threading.Thread(target=write)] + [threading.Thread(target=read) for _ in range(num_readers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        print("{} writes and {} reads in {:.2f}s: {:.0f} requests/s".format(
+            2 * num_writes, num_reads[0], elapsed, (2 * num_writes + num_reads[0]) / elapsed))
+        client.delete('/batch/actors', data=json.dumps({'names': ['Stress Test A', 'Stress Test B']}),
+                      content_type='application/json')
+        assert not errors
+        assert num_reads[0] > 0
+
+    def test_write_log_recovery(self):
+        """
+        Test that the changes made through the API are recovered from the write-ahead log after a restart
+        :return: self
+        """
+        import venv.WebAPI as web_api
+        from venv.WriteAheadLog import WriteAheadLog
+        actors, movies = web_api.ACTORS, web_api.MOVIES
+        with tempfile.TemporaryDirectory() as log_dir:
+            create_app(self.data_file, 50, 50, log=WriteAheadLog(log_dir, snapshot_every=3))
+            self.app.post('/actors/Log_Test', data=json.dumps({'age': 33}), content_type='application/json')
+            self.app.put('/actors/Bruce_Willis', data=json.dumps({'age': 70}), content_type='application/json')
+            self.app.delete('/movies/Color_of_Night')  # Third change: snapshot, and the log is emptied
+            self.app.post('/batch/movies', data=json.dumps({'Log Movie': {'year': 2001}}),
+                          content_type='application/json')
+            # Restart from the same file and log, once the old one is closed as on shutdown
+            web_api.WRITE_LOG.close()
+            create_app(self.data_file, 50, 50, log=WriteAheadLog(log_dir, snapshot_every=3))
+            assert self.app.get('/actors/Log_Test').get_json()['age'] == 33
+            assert self.app.get('/actors/Bruce_Willis').get_json()['age'] == 70
+            assert self.app.get('/movies/Color_of_Night').status_code == 400
+            assert self.app.get('/movies/Log_Movie').get_json()['year_released'] == 2001
+            set_dataset(actors, movies)  # Back to the database of the other tests, closing the log
+
+    def test_write_log_failure(self):
+        """
+        Test that a change that couldn't be written to the write-ahead log isn't made either
+        :return: self
+        """
+        import venv.WebAPI as web_api
+        from venv.WriteAheadLog import WriteAheadLog
+        actors, movies = web_api.ACTORS, web_api.MOVIES
+        age = self.app.get('/actors/Paul_Newman').get_json()['age']
+
+        def failing_encoder(obj):
+            raise OSError(28, "No space left on device")
+        with tempfile.TemporaryDirectory() as log_dir:
+            log = WriteAheadLog(log_dir)
+            log.recover()
+            set_dataset(actors, movies, log)
+            log.encoder = failing_encoder
+            rv = self.app.put('/actors/Paul_Newman', data=json.dumps({'age': 1}), content_type='application/json')
+            assert rv.status_code == 500
+            rv = self.app.delete('/movies/The_Verdict')
+            assert rv.status_code == 500
+            assert self.app.get('/actors/Paul_Newman').get_json()['age'] == age
+            assert self.app.get('/actors/?age=1').status_code == 400
+            assert self.app.get('/movies/The_Verdict').status_code == 200
+            set_dataset(actors, movies)
+
     def test_actor_delete_request(self):
         """
         Test DELETE functionality of the Actors API
@@ -242,12 +738,12 @@ class WebAPITests(unittest.TestCase):
         # Try to GET it to ensure it was deleted.
         rv = self.app.get('/actors/David_Dukes')
         assert rv.status_code == 400
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         assert "Couldn't find" in rv_json
         # Ensure that non-existent actors cannot be deleted.
         rv = self.app.delete('/actors/David_Dukes')
         assert rv.status_code == 400
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         assert "not in" in rv_json
 
     def test_movie_delete_request(self):
@@ -264,12 +760,12 @@ class WebAPITests(unittest.TestCase):
         # Try to GET it to ensure it was deleted.
         rv = self.app.get('/movies/Color_of_Night')
         assert rv.status_code == 400
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         assert "Couldn't find" in rv_json
         # Ensure that non-existent movies cannot be deleted.
         rv = self.app.delete('/movies/Color_of_Night')
         assert rv.status_code == 400
-        rv_json = json.loads(rv.data, encoding=bytes)
+        rv_json = rv.get_json()
         assert "not in" in rv_json
 
 
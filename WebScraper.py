@@ -386,6 +386,31 @@ def retrieve_graph_from_json(fname='graph.json'):
     return decoded_graph
 
 
+def dump_graph_as_snapshot(actors, movies, fname='graph.snap'):
+    """
+    Utility function to store the formed graph in the binary snapshot format.
+    Much faster to write and load than dump_graph_as_json, and the file can be memory-mapped.
+    :param actors: Dictionary (name of actor --> Actor Node)
+    :param movies: Dictionary (name of movie --> Movie Node)
+    :param fname: File to store it to.
+    :return: Name of the file the graph was stored in.
+    """
+    from venv.GraphSnapshot import save_snapshot
+    logging.info("dump_graph_as_snapshot called with filename: {}".format(fname))
+    return save_snapshot(actors, movies, fname)
+
+
+def retrieve_graph_from_snapshot(fname='graph.snap'):
+    """
+    Utility function to retrieve a graph stored with dump_graph_as_snapshot.
+    :param fname: Name of file to retrieve from.
+    :return: Dictionary (name of actor --> Actor Node), Dictionary (name of movie --> Movie Node)
+    """
+    from venv.GraphSnapshot import load_snapshot
+    logging.info("retrieve_graph_from_snapshot called with filename: {}".format(fname))
+    return load_snapshot(fname)
+
+
 def dump_into_json(object, filename):
     """
     Utility function to dump the given object into json file of the given name
@@ -0,0 +1,276 @@
+import json
+import logging
+import os
+import threading
+import time
+from venv.JsonFragments import dumps
+
+"""
+Reference:
+https://en.wikipedia.org/wiki/Write-ahead_logging
+https://www.postgresql.org/docs/current/wal-async-commit.html
+https://jsonlines.org/
+"""
+
+LOG_FILENAME = 'log.jsonl'
+SNAPSHOT_FILENAME = 'snapshot.json'
+
+
+def _fsync_directory(directory: str):
+    """
+    Utility function to make a rename or a new file in a directory durable.
+    :param directory: The directory
+    :return: Nothing.
+    """
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class WriteAheadLog:
+    """
+    Append-only log of the changes made to the ACTORS and MOVIES of the API, with periodic
+    snapshots so the log doesn't grow without bound. Every record holds the whole new state of
+    the nodes written (and the names of the nodes deleted) by one request or batch, as a line
+    of JSON, so replaying it is idempotent.
+
+    Records are written to the file as they are appended, so they survive the process dying.
+    They are only forced to disk (fsync) every sync_every records or sync_interval seconds,
+    whichever comes first: the fsync is shared by the whole group of records (group commit),
+    and a crash of the machine loses at most the records of the group not synced yet. A timer
+    thread syncs the records left waiting after the last append, so none waits longer than
+    sync_interval. Snapshots can be written by a thread of their own (see start_snapshot),
+    while appending goes on.
+    @author sahil1105
+    """
+
+    def __init__(self, directory: str, sync_every: int = 1, sync_interval: float = None,
+                 snapshot_every: int = 1000, encoder=dumps):
+        """
+        Constructor for a WriteAheadLog kept in a directory, which is created if needed.
+        :param directory: Directory of the log and the snapshot
+        :param sync_every: Number of records to group into one fsync, 1 to sync every record
+        :param sync_interval: Max number of seconds a record can wait for its fsync, None for no limit
+        :param snapshot_every: Number of records after which a snapshot is due, see needs_snapshot
+        :param encoder: Function serializing an object to JSON bytes
+        """
+        self.directory = directory
+        self.log_path = os.path.join(directory, LOG_FILENAME)
+        self.snapshot_path = os.path.join(directory, SNAPSHOT_FILENAME)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+        self.encoder = encoder
+        self.seq = 0  # Sequence number of the last record
+        self.num_unsynced = 0
+        self.num_since_snapshot = 0
+        self.last_sync = time.monotonic()
+        os.makedirs(directory, exist_ok=True)
+        self._file = None
+        self._lock = threading.Lock()  # Held to write to or sync the file, as the timer and snapshot threads do too
+        self._flusher = None  # threading.Timer syncing the records once they have waited sync_interval
+        self._snapshot_thread = None
+
+    def recover(self) -> (dict, list):
+        """
+        Read back the last snapshot and the records logged after it, dropping a record that was
+        only partly written when the process died. Must be called before appending.
+        :return: The snapshot ({'seq', 'actors', 'movies'}, where the collections map names to node
+        dicts) or None if there isn't one, and the list of records to replay on top of it, in order.
+        """
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'rb') as snapshot_file:
+                snapshot = json.loads(snapshot_file.read())
+            self.seq = snapshot['seq']
+        records = []
+        valid_length = 0
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'rb') as log_file:
+                for line in log_file:
+                    try:
+                        record = json.loads(line) if line.endswith(b'\n') else None
+                    except ValueError:
+                        record = None
+                    if record is None:
+                        break  # Torn write at the end of the log
+                    valid_length += len(line)
+                    if record['seq'] > self.seq:  # Older ones are already in the snapshot
+                        records.append(record)
+                        self.seq = record['seq']
+        self._file = open(self.log_path, 'ab')
+        self._file.truncate(valid_length)
+        self.num_since_snapshot = len(records)
+        return snapshot, records
+
+    def append(self, collection: str, written: dict, deleted: list) -> int:
+        """
+        Log the changes of one request or batch to a collection. If the record can't be written,
+        the error is raised and nothing is logged.
+        :param collection: 'actors' or 'movies'
+        :param written: Dict (name --> node dict) of the nodes added or changed
+        :param deleted: Names of the nodes deleted
+        :return: The sequence number of the record
+        """
+        with self._lock:
+            if self._file is None:
+                self.recover()
+            record = {'seq': self.seq + 1, 'collection': collection, 'put': written, 'delete': deleted}
+            try:
+                self._file.write(self.encoder(record) + b'\n')
+                self._file.flush()
+            except OSError:
+                # Whatever part of the record was written is cut off by recover before the next append
+                try:
+                    self._file.close()
+                except OSError:
+                    pass
+                self._file = None
+                raise
+            self.seq += 1
+            self.num_unsynced += 1
+            self.num_since_snapshot += 1
+            if self.num_unsynced >= self.sync_every or \
+                    (self.sync_interval is not None and time.monotonic() - self.last_sync >= self.sync_interval):
+                self._sync()
+            elif self.sync_interval is not None and self._flusher is None:
+                self._flusher = threading.Timer(self.last_sync + self.sync_interval - time.monotonic(),
+                                                self._sync_waiting)
+                self._flusher.daemon = True
+                self._flusher.start()
+            return self.seq
+
+    def _sync(self):
+        """
+        Utility function to force the records appended so far to disk, with the lock held.
+        :return: Nothing.
+        """
+        if self._file is not None and self.num_unsynced:
+            os.fsync(self._file.fileno())
+        self.num_unsynced = 0
+        self.last_sync = time.monotonic()
+        if self._flusher is not None:
+            self._flusher.cancel()
+            self._flusher = None
+
+    def _sync_waiting(self):
+        """
+        Utility function run by the timer thread once the records left waiting are due to be synced.
+        :return: Nothing.
+        """
+        with self._lock:
+            self._flusher = None
+            self._sync()
+
+    def sync(self):
+        """
+        Force the records appended so far to disk.
+        :return: Nothing.
+        """
+        with self._lock:
+            self._sync()
+
+    def needs_snapshot(self) -> bool:
+        """
+        Check whether enough records were logged since the last snapshot to take a new one, and
+        no snapshot is being written already.
+        :return: True if a snapshot is due, False otherwise
+        """
+        return self.num_since_snapshot >= self.snapshot_every and \
+            (self._snapshot_thread is None or not self._snapshot_thread.is_alive())
+
+    def _mark_snapshot(self) -> (int, int, int):
+        """
+        Utility function to note where the log is at, for a snapshot of the state as of the last record.
+        :return: Sequence number of the last record, size of the log and number of records since the
+        last snapshot
+        """
+        with self._lock:
+            if self._file is None:
+                self.recover()
+            mark = self.seq, self._file.tell(), self.num_since_snapshot
+            self.num_since_snapshot = 0
+            return mark
+
+    def _save_snapshot(self, collections: dict, mark: (int, int, int)):
+        """
+        Utility function to save a snapshot as of a mark and drop the records it holds from the log.
+        The records appended after the mark are kept.
+        :param collections: Dict ('actors'/'movies' --> Dict (name --> node dict)), as of the mark
+        :param mark: See _mark_snapshot
+        :return: Nothing.
+        """
+        seq, log_size, _ = mark
+        temp_path = self.snapshot_path + '.tmp'
+        with open(temp_path, 'wb') as snapshot_file:
+            snapshot_file.write(self.encoder(dict(collections, seq=seq)))
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+        _fsync_directory(self.directory)
+        # The records are all in the snapshot now; had we died before this, recover would skip them
+        with self._lock:
+            if self._file is None:
+                return
+            self._sync()
+            if self._file.tell() == log_size:
+                self._file.truncate(0)
+                os.fsync(self._file.fileno())
+                return
+            with open(self.log_path, 'rb') as log_file:  # Keep the records appended meanwhile
+                log_file.seek(log_size)
+                appended = log_file.read()
+            temp_path = self.log_path + '.tmp'
+            with open(temp_path, 'wb') as log_file:
+                log_file.write(appended)
+                log_file.flush()
+                os.fsync(log_file.fileno())
+            os.replace(temp_path, self.log_path)
+            _fsync_directory(self.directory)
+            self._file.close()
+            self._file = open(self.log_path, 'ab')
+
+    def write_snapshot(self, collections: dict):
+        """
+        Save the whole state of the database and empty the log. The snapshot is written to a
+        temporary file and renamed over the previous one, so there is always a complete snapshot.
+        :param collections: Dict ('actors'/'movies' --> Dict (name --> node dict)), as of the last record
+        :return: Nothing.
+        """
+        self._save_snapshot(collections, self._mark_snapshot())
+
+    def start_snapshot(self, collections: dict):
+        """
+        Save the whole state of the database like write_snapshot, on a thread of its own, so records
+        can be appended while it is written. If it can't be written, it is due again.
+        :param collections: Dict ('actors'/'movies' --> Dict (name --> node dict)) as of the last record,
+        which must not be changed anymore
+        :return: Nothing.
+        """
+        mark = self._mark_snapshot()
+
+        def save():
+            try:
+                self._save_snapshot(collections, mark)
+            except OSError:
+                logging.exception("Couldn't write a snapshot to {}.".format(self.snapshot_path))
+                with self._lock:
+                    self.num_since_snapshot += mark[2]
+        self._snapshot_thread = threading.Thread(target=save, daemon=True, name='WriteAheadLog snapshot')
+        self._snapshot_thread.start()
+
+    def close(self):
+        """
+        Wait for the snapshot being written, if any, then sync and close the log.
+        :return: Nothing.
+        """
+        if self._snapshot_thread is not None:
+            self._snapshot_thread.join()
+            self._snapshot_thread = None
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
@@ -0,0 +1,169 @@
+import os
+import tempfile
+import time
+import unittest
+from venv.WriteAheadLog import WriteAheadLog
+
+
+class TestWriteAheadLog(unittest.TestCase):
+    """
+    Unit Tests for the write-ahead log of the changes made through the API.
+    @author sahil1105
+    """
+
+    def setUp(self):
+        """
+        Creates a log in a temporary directory.
+        :return: self
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.log = WriteAheadLog(self.directory.name, snapshot_every=3)
+        self.assertEqual(self.log.recover(), (None, []))
+
+    def tearDown(self):
+        """
+        Closes the log and removes the directory.
+        :return: self
+        """
+        self.log.close()
+        self.directory.cleanup()
+
+    def reopen(self):
+        """
+        Utility function to close the log and recover it, like after a restart.
+        :return: The snapshot and the records recovered
+        """
+        self.log.close()
+        self.log = WriteAheadLog(self.directory.name, snapshot_every=3)
+        return self.log.recover()
+
+    def test_records_are_recovered(self):
+        """
+        Tests that appended records are read back in order.
+        :return: self
+        """
+        self.assertEqual(self.log.append('actors', {'Bruce Willis': {'age': 61}}, []), 1)
+        self.assertEqual(self.log.append('movies', {}, ['The Jackal']), 2)
+        snapshot, records = self.reopen()
+        self.assertIsNone(snapshot)
+        self.assertEqual(records, [{'seq': 1, 'collection': 'actors', 'put': {'Bruce Willis': {'age': 61}},
+                                    'delete': []},
+                                   {'seq': 2, 'collection': 'movies', 'put': {}, 'delete': ['The Jackal']}])
+        self.assertEqual(self.log.append('actors', {}, ['Bruce Willis']), 3)
+
+    def test_torn_record_is_dropped(self):
+        """
+        Tests that a record only partly written is dropped, and that appending goes on after the last whole one.
+        :return: self
+        """
+        self.log.append('actors', {'Bruce Willis': {'age': 61}}, [])
+        self.log.close()
+        with open(self.log.log_path, 'ab') as log_file:
+            log_file.write(b'{"seq": 2, "collection": "act')
+        snapshot, records = self.reopen()
+        self.assertEqual([record['seq'] for record in records], [1])
+        self.log.append('actors', {'Jack Warden': {'age': 85}}, [])
+        snapshot, records = self.reopen()
+        self.assertEqual([record['seq'] for record in records], [1, 2])
+
+    def test_snapshot_truncates_log(self):
+        """
+        Tests that a snapshot is due every snapshot_every records, empties the log and is recovered.
+        :return: self
+        """
+        for age in range(3):
+            self.log.append('actors', {'Bruce Willis': {'age': age}}, [])
+        self.assertTrue(self.log.needs_snapshot())
+        self.log.write_snapshot({'actors': {'Bruce Willis': {'age': 2}}, 'movies': {}})
+        self.assertFalse(self.log.needs_snapshot())
+        self.assertEqual(os.path.getsize(self.log.log_path), 0)
+        self.log.append('movies', {'Die Hard': {'year_released': 1988}}, [])
+        snapshot, records = self.reopen()
+        self.assertEqual(snapshot, {'seq': 3, 'actors': {'Bruce Willis': {'age': 2}}, 'movies': {}})
+        self.assertEqual([record['seq'] for record in records], [4])
+
+    def test_records_in_snapshot_are_skipped(self):
+        """
+        Tests that records already in the snapshot aren't replayed, e.g. after dying before the log was emptied.
+        :return: self
+        """
+        self.log.append('actors', {'Bruce Willis': {'age': 61}}, [])
+        with open(self.log.log_path, 'rb') as log_file:
+            logged = log_file.read()
+        self.log.write_snapshot({'actors': {'Bruce Willis': {'age': 61}}, 'movies': {}})
+        with open(self.log.log_path, 'ab') as log_file:
+            log_file.write(logged)
+        snapshot, records = self.reopen()
+        self.assertEqual(snapshot['seq'], 1)
+        self.assertEqual(records, [])
+
+    def test_group_commit(self):
+        """
+        Tests that records are synced in groups of sync_every.
+        :return: self
+        """
+        self.log.sync_every = 3
+        self.log.append('actors', {}, ['A'])
+        self.log.append('actors', {}, ['B'])
+        self.assertEqual(self.log.num_unsynced, 2)
+        self.log.append('actors', {}, ['C'])
+        self.assertEqual(self.log.num_unsynced, 0)
+        self.log.append('actors', {}, ['D'])
+        self.log.sync()
+        self.assertEqual(self.log.num_unsynced, 0)
+
+    def test_sync_interval(self):
+        """
+        Tests that a record left waiting after the last append is synced once sync_interval has passed.
+        :return: self
+        """
+        self.log.sync_every, self.log.sync_interval = 100, 0.2
+        self.log.sync()
+        start = time.monotonic()
+        self.log.append('actors', {}, ['A'])
+        self.assertEqual(self.log.num_unsynced, 1)
+        while self.log.num_unsynced and time.monotonic() - start < 5:
+            time.sleep(0.01)
+        self.assertEqual(self.log.num_unsynced, 0)
+        self.assertLess(time.monotonic() - start, 0.2 + 1)
+
+    def test_background_snapshot(self):
+        """
+        Tests that records appended while a snapshot is written on its own thread are kept.
+        :return: self
+        """
+        for age in range(3):
+            self.log.append('actors', {'Bruce Willis': {'age': age}}, [])
+        self.assertTrue(self.log.needs_snapshot())
+        self.log.start_snapshot({'actors': {'Bruce Willis': {'age': 2}}, 'movies': {}})
+        self.assertFalse(self.log.needs_snapshot())
+        self.log.append('movies', {'Die Hard': {'year_released': 1988}}, [])
+        self.log.append('movies', {}, ['Die Hard'])
+        snapshot, records = self.reopen()
+        self.assertEqual(snapshot, {'seq': 3, 'actors': {'Bruce Willis': {'age': 2}}, 'movies': {}})
+        self.assertEqual([record['seq'] for record in records], [4, 5])
+
+    def test_failed_append(self):
+        """
+        Tests that a record that couldn't be written is dropped whole, and the records appended after it are kept.
+        :return: self
+        """
+        self.log.append('actors', {'Bruce Willis': {'age': 61}}, [])
+        log_file = self.log._file
+
+        class FailingFile:
+            def write(self, data):
+                log_file.write(data[:10])
+                raise OSError(28, "No space left on device")
+
+            def close(self):
+                log_file.close()
+        self.log._file = FailingFile()
+        self.assertRaises(OSError, self.log.append, 'actors', {'Jack Warden': {'age': 85}}, [])
+        self.assertEqual(self.log.append('actors', {'Paul Newman': {'age': 83}}, []), 2)
+        snapshot, records = self.reopen()
+        self.assertEqual([list(record['put']) for record in records], [['Bruce Willis'], ['Paul Newman']])
+
+
+if __name__ == '__main__':
+    unittest.main()